@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""Hotkey input path: evdev decode cost per raw event and press -> callback latency."""
+import os
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.config.config_manager import ConfigManager
+from src.core.evdev_input import EVENT_FORMAT, EV_KEY, EV_SYN, READ_SIZE, EvdevListener
+from src.core.injection_filter import listener_token
+
+EV_MSC = 0x04
+MSC_SCAN = 0x04
+# Ordinary typing with a hotkey every tenth key: q w e r t y u i o n
+TYPING_CODES = [16, 17, 18, 19, 20, 21, 22, 23, 24, 49]
+
+
+def keystroke(code: int, timestamp: float, value: int) -> bytes:
+    sec, usec = int(timestamp), int(timestamp % 1 * 1e6)
+    # What a USB keyboard sends per key change: scancode, key, SYN_REPORT
+    return (struct.pack(EVENT_FORMAT, sec, usec, EV_MSC, MSC_SCAN, code)
+            + struct.pack(EVENT_FORMAT, sec, usec, EV_KEY, code, value)
+            + struct.pack(EVENT_FORMAT, sec, usec, EV_SYN, 0, 0))
+
+
+def typing_stream(keys: int) -> bytes:
+    chunks = []
+    for n in range(keys):
+        code = TYPING_CODES[n % len(TYPING_CODES)]
+        chunks.append(keystroke(code, 1000 + n * 0.01, 1))
+        chunks.append(keystroke(code, 1000 + n * 0.01 + 0.005, 0))
+    return b''.join(chunks)
+
+
+class PynputStyleKey:
+    # Roughly what pynput builds for every event before calling on_press
+    def __init__(self, vk, char, is_dead=False, combining=None):
+        self.vk = vk
+        self.char = char
+        self.is_dead = is_dead
+        self.combining = combining
+        self._symbol = None
+
+
+def measure_decode(snapshot, keys: int):
+    stream = typing_stream(keys)
+    actions = snapshot.key_actions()
+    handled = []
+
+    def on_press(key):
+        action = actions.get(listener_token(key))
+        if action is not None:
+            handled.append(action)
+
+    listener = EvdevListener(on_press, [], lambda: snapshot)
+    # One read's worth at a time, as the epoll loop hands it over
+    chunks = [stream[offset:offset + READ_SIZE] for offset in range(0, len(stream), READ_SIZE)]
+    start = time.perf_counter()
+    for chunk in chunks:
+        listener.feed(chunk)
+    elapsed = time.perf_counter() - start
+    return elapsed, listener.events, listener.delivered, len(handled)
+
+
+def measure_pynput_style(snapshot, keys: int) -> float:
+    actions = snapshot.key_actions()
+    chars = [chr(ord('a') + code % 26) for code in TYPING_CODES]
+    start = time.perf_counter()
+    for n in range(keys):
+        # pynput calls back for presses and releases alike
+        for _ in range(2):
+            key = PynputStyleKey(n, chars[n % len(chars)])
+            actions.get(listener_token(key))
+    return time.perf_counter() - start
+
+
+class PipeSource:
+    def __init__(self):
+        self.name = 'pipe'
+        self.read_fd, self.write_fd = os.pipe2(os.O_NONBLOCK | os.O_CLOEXEC)
+
+    def fileno(self):
+        return self.read_fd
+
+    def start(self):
+        pass
+
+    def close(self):
+        os.close(self.read_fd)
+        os.close(self.write_fd)
+
+
+def measure_latency(snapshot, presses: int):
+    source = PipeSource()
+    seen = threading.Event()
+    latencies = []
+    sent = [0]
+
+    def on_press(key):
+        latencies.append(time.perf_counter_ns() - sent[0])
+        seen.set()
+
+    listener = EvdevListener(on_press, [source], lambda: snapshot)
+    listener.start()
+    listener.wait()
+    press = keystroke(49, 1000, 1)
+    for _ in range(presses):
+        seen.clear()
+        sent[0] = time.perf_counter_ns()
+        os.write(source.write_fd, press)
+        seen.wait(1.0)
+        time.sleep(0.001)
+    listener.stop()
+    listener.join()
+    latencies.sort()
+    return latencies
+
+
+def main(keys: int = 50000):
+    snapshot = ConfigManager('config.json', create_missing=False).snapshot()
+
+    elapsed, events, delivered, handled = measure_decode(snapshot, keys)
+    pynput_elapsed = measure_pynput_style(snapshot, keys)
+    print(f"evdev decode:        {elapsed / events * 1e9:8.1f} ns/raw event "
+          f"({events} events, {delivered} delivered, {handled} hotkeys)")
+    print(f"                     {elapsed / keys * 1e9:8.1f} ns/keystroke")
+    print(f"pynput-style objects:{pynput_elapsed / keys * 1e9:8.1f} ns/keystroke "
+          f"(key object + token lookup per press and release, excluding pynput itself)")
+
+    latencies = measure_latency(snapshot, 500)
+    print(f"press -> callback:   p50 {latencies[len(latencies) // 2] / 1e3:.1f}us "
+          f"p99 {latencies[int(len(latencies) * 0.99)] / 1e3:.1f}us max {latencies[-1] / 1e3:.1f}us")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 50000))
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Per-character overhead of typing text: legacy per-call dicts vs KeyboardSimulator.type_text."""
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from recording_device import RecordingDevice, fake_keys
+from src.core.keyboard import (
+    KEY_MAP, INTERNATIONAL_MAP, INTERNATIONAL_FALLBACKS, SHIFTED_SYMBOLS, KeyboardSimulator, compile_keymap
+)
+
+SAMPLE = "NOVECENTOS E NOVENTA E NOVE. três mil e quarenta! one hundred twenty-two."
+
+
+def legacy_type_text(keys, text, emit):
+    # Mirrors the pre-compiled-keymap code path: every character rebuilds the
+    # mapping dicts and resolves key names through getattr on the module
+    def get_key_for_char(char):
+        key_map = dict(KEY_MAP)
+        international_map = dict(INTERNATIONAL_MAP)
+        if char in international_map:
+            base_key, _ = international_map[char]
+            if hasattr(keys, base_key):
+                return getattr(keys, base_key)
+        key_name = key_map.get(char.upper())
+        if key_name and hasattr(keys, key_name):
+            return getattr(keys, key_name)
+        key_name = key_map.get(char.lower())
+        if key_name and hasattr(keys, key_name):
+            return getattr(keys, key_name)
+        return None
+
+    for char in text:
+        if char == ' ':
+            emit(keys.KEY_SPACE, 1)
+            emit(keys.KEY_SPACE, 0)
+            continue
+        key = get_key_for_char(char)
+        if key:
+            shift_needed = (char.isupper() and char.isalpha()) or char in SHIFTED_SYMBOLS
+            if shift_needed:
+                emit(keys.KEY_LEFTSHIFT, 1)
+            emit(key, 1)
+            emit(key, 0)
+            if shift_needed:
+                emit(keys.KEY_LEFTSHIFT, 0)
+            continue
+        fallbacks = dict(INTERNATIONAL_FALLBACKS)
+        for fallback_char in fallbacks.get(char, ''):
+            key = get_key_for_char(fallback_char)
+            if key:
+                emit(key, 1)
+                emit(key, 0)
+
+
+def measure(func, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    return (time.perf_counter() - start) / (rounds * len(SAMPLE))
+
+
+def main(rounds: int = 2000):
+    keys = fake_keys()
+
+    compile_start = time.perf_counter()
+    keymap = compile_keymap(keys)
+    compile_time = time.perf_counter() - compile_start
+
+    # Both sides emit into a recording device, which is cleared every round
+    device = RecordingDevice()
+    keyboard = KeyboardSimulator(device=device, keys=keys)
+
+    def legacy_round():
+        device.clear()
+        legacy_type_text(keys, SAMPLE, device.emit)
+
+    def type_text_round():
+        device.clear()
+        keyboard.type_text(SAMPLE, 0.0)
+
+    legacy = measure(legacy_round, rounds)
+    type_text = measure(type_text_round, rounds)
+
+    print(f"Keymap compile:  {compile_time * 1e6:8.1f} us ({len(keymap)} chars)")
+    print(f"Legacy lookup:   {legacy * 1e9:8.1f} ns/char")
+    print(f"type_text:       {type_text * 1e9:8.1f} ns/char")
+    print(f"Speedup:         {legacy / type_text:8.1f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000))
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""Number speller throughput vs numbers.json list lookup, plus a 0-1000 consistency check."""
+import json
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.core.number_speller import get_speller
+
+
+def per_call(func, count, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for index in range(count):
+            func(index)
+    return (time.perf_counter() - start) / (count * rounds)
+
+
+def main(rounds: int = 50) -> int:
+    failed = False
+    for lang_code in ('en', 'ptbr'):
+        with open(ROOT / 'languages' / lang_code / 'numbers.json', 'r', encoding='utf-8') as f:
+            numbers = json.load(f)['numbers']
+        speller = get_speller(lang_code)
+
+        mismatches = [index for index, expected in enumerate(numbers) if speller.spell(index) != expected]
+        if mismatches:
+            failed = True
+            print(f"[{lang_code}] {len(mismatches)} mismatches against numbers.json, first: {mismatches[:5]}")
+        else:
+            print(f"[{lang_code}] speller matches numbers.json for 0-{len(numbers) - 1}")
+
+        lookup = per_call(numbers.__getitem__, len(numbers), rounds)
+        generated = per_call(speller.spell, len(numbers), rounds)
+        large = per_call(lambda index: speller.spell(999_000_000 + index), len(numbers), rounds)
+        print(f"[{lang_code}] list lookup:        {lookup * 1e9:8.1f} ns/number")
+        print(f"[{lang_code}] spell 0-1000:       {generated * 1e9:8.1f} ns/number")
+        print(f"[{lang_code}] spell ~999,000,000: {large * 1e9:8.1f} ns/number")
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 50))
@@ -0,0 +1,423 @@
+#!/usr/bin/env python3
+"""Headless end-to-end benchmarks on a recording fake device, with JSON results for regression tracking.
+
+    python benchmarks/bench_suite.py --output results.json
+    python benchmarks/bench_suite.py --compare results.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from recording_device import RecordingDevice, fake_keys
+from src.config.config_manager import ConfigManager
+from src.core.keyboard import KeyboardSimulator
+from src.core.keystroke_plan import compile_plan
+from src.core.language_manager import LanguageManager
+from src.core.rate_limiter import RateLimiter
+from src.core.session_planner import plan_range
+from src.styles.jack_styles import StyleManager
+
+SAMPLE = "NOVECENTOS E NOVENTA E NOVE. três mil e quarenta! one hundred twenty-two."
+ZERO_DELAYS = {'prefix_key': '/', 'prefix_delay': 0.0, 'char_delay': 0.0, 'enter_delay': 0.0, 'space_delay': 0.0}
+
+
+def quiet():
+    return contextlib.redirect_stdout(io.StringIO())
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def make_simulator(device: RecordingDevice) -> KeyboardSimulator:
+    return KeyboardSimulator(device=device, keys=fake_keys())
+
+
+def load_numbers(count: int) -> List[str]:
+    with quiet():
+        manager = LanguageManager(str(ROOT / 'languages'))
+        manager.load_language('en')
+    return [manager.get_current_number(index) for index in range(count)]
+
+
+def bench_keystrokes(numbers: List[str]) -> Dict[str, Any]:
+    device = RecordingDevice()
+    keyboard = make_simulator(device)
+    plan = keyboard.compile_plan([number.upper() + '.' for number in numbers], ZERO_DELAYS, line_delay=0.0)
+    start = time.perf_counter()
+    keyboard.replay(plan)
+    elapsed = time.perf_counter() - start
+    return {'events': len(device), 'seconds': elapsed, 'keystrokes_per_second': len(device) / elapsed}
+
+
+def bench_type_text(rounds: int) -> Dict[str, Any]:
+    keyboard = make_simulator(RecordingDevice())
+    keyboard.type_text(SAMPLE, 0.0)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        keyboard.type_text(SAMPLE, 0.0)
+    per_char = (time.perf_counter() - start) / (rounds * len(SAMPLE))
+    return {'chars': rounds * len(SAMPLE), 'ns_per_char': per_char * 1e9}
+
+
+def bench_timing(config: ConfigManager, numbers: List[str], scale: float) -> Dict[str, Any]:
+    """Compare recorded event times with the schedule implied by `delays`"""
+    delays = config.get_delays()
+    typing_config = {
+        'prefix_key': config.get_prefix_key(),
+        'prefix_delay': delays['prefix'] * scale,
+        'char_delay': delays['character'] * scale,
+        'enter_delay': delays['enter'] * scale,
+        'space_delay': delays['space'] * scale
+    }
+    device = RecordingDevice()
+    keyboard = make_simulator(device)
+    plan = keyboard.compile_plan(numbers, typing_config)
+    keyboard.replay(plan)
+
+    errors = []
+    expected = 0.0
+    start = device.times[0]
+    for index, recorded in enumerate(device.times):
+        errors.append(abs((recorded - start) / 1e9 - expected))
+        expected += plan.delays[index]
+    return {
+        'scale': scale,
+        'events': len(errors),
+        'scheduled_seconds': plan.total_delay(),
+        'mean_error_us': statistics.fmean(errors) * 1e6,
+        'p95_error_us': percentile(errors, 0.95) * 1e6,
+        'max_error_us': max(errors) * 1e6
+    }
+
+
+def bench_coalescing(config: ConfigManager, numbers: List[str]) -> Dict[str, Any]:
+    """Shift-run coalescing and SYN_REPORT framing: event counts (tests/test_keystroke_plan.py checks the output)"""
+    device = RecordingDevice()
+    keyboard = make_simulator(device)
+    manager = StyleManager()
+    lines = [SAMPLE]
+    for style_name in manager.get_available_styles():
+        style = manager.get_style(style_name, config.get_style_config(style_name))
+        for number in numbers:
+            lines.extend(style.format(number))
+    typing_config = dict(ZERO_DELAYS, char_delay=0.01, enter_delay=0.1)
+
+    results = {}
+    chars = sum(len(line) for line in lines)
+    for label, coalesce in (('per_char', False), ('coalesced', True)):
+        with quiet():
+            plan = compile_plan(lines, keyboard.keymap, keyboard.keys, typing_config,
+                                coalesce_modifiers=coalesce)
+        # Before framing every event carried its own SYN_REPORT
+        results[label] = {
+            'events': len(plan),
+            'syn_reports': sum(plan.syncs) if coalesce else len(plan),
+            'events_per_char': len(plan) / chars
+        }
+
+    # The framing must survive an actual replay on a device that takes syn=False
+    plan = compile_plan(lines[:50], keyboard.keymap, keyboard.keys, ZERO_DELAYS, line_delay=0.0)
+    keyboard.replay(plan)
+    if device.syncs != sum(plan.syncs) or len(device) != len(plan):
+        raise AssertionError(f"replay sent {device.syncs} frames / {len(device)} events, "
+                             f"plan has {sum(plan.syncs)} / {len(plan)}")
+    results['event_reduction'] = 1 - results['coalesced']['events'] / results['per_char']['events']
+    results['syn_report_reduction'] = 1 - results['coalesced']['syn_reports'] / results['per_char']['syn_reports']
+    return results
+
+
+def bench_rate_limit(numbers: List[str]) -> Dict[str, Any]:
+    """Lines sent under token buckets, against padding every line to the strictest limit"""
+    buckets = [{'lines': 4, 'per': 0.4}, {'lines': 10, 'per': 2.0, 'burst': 2}]
+    device = RecordingDevice()
+    keyboard = make_simulator(device)
+    keyboard.rate_limiter = RateLimiter(buckets)
+    lines = [number.upper() + '.' for number in numbers]
+    plan = keyboard.compile_plan(lines, dict(ZERO_DELAYS, char_delay=0.001), line_delay=0.0)
+    start = time.perf_counter()
+    report = keyboard.replay(plan)
+    elapsed = time.perf_counter() - start
+
+    enter = keyboard.keys.KEY_ENTER
+    sent = [device.times[index] / 1e9 for index, (key, value) in enumerate(device.events)
+            if key == enter and value]
+    for bucket in buckets:
+        allowed = bucket.get('burst', bucket['lines']) + bucket['lines']
+        for first, timestamp in enumerate(sent):
+            inside = sum(1 for later in sent[first:] if later - timestamp < bucket['per'])
+            if inside > allowed:
+                raise AssertionError(f"{inside} lines within {bucket['per']}s, bucket allows {allowed}")
+    # Without the limiter, staying under every limit means the slowest spacing on every line
+    padded = len(lines) * max(bucket['per'] / bucket['lines'] for bucket in buckets)
+    return {
+        'lines': len(sent),
+        'seconds': elapsed,
+        'held_seconds': report.held,
+        'padded_seconds': padded,
+        'speedup': padded / elapsed
+    }
+
+
+def bench_planner(config: ConfigManager, count: int) -> Dict[str, Any]:
+    """Dry-run planning speed per style, and its totals checked against compiled plans"""
+    with quiet():
+        manager = LanguageManager(str(ROOT / 'languages'), max_generated=config.get_max_generated_number())
+        manager.load_language('en')
+    keys = fake_keys()
+    results = {}
+    for style_name in StyleManager().get_available_styles():
+        start = time.perf_counter()
+        plan = plan_range(config, manager, 0, count, [style_name], keys)
+        elapsed = time.perf_counter() - start
+        if not plan['verified']:
+            raise AssertionError(f"{style_name}: sampled numbers' costs differ from their compiled plans")
+        totals = plan['styles'][0]
+        results[style_name] = {'numbers_per_second': count / elapsed, 'lines': totals['lines']}
+
+        sample = plan_range(config, manager, 0, 200, [style_name], keys)['styles'][0]
+        style = StyleManager().get_style(style_name, config.get_style_config(style_name))
+        lines = [line for index in range(200) for line in style.format(manager.get_current_number(index))]
+        with quiet():
+            compiled = compile_plan(lines, make_simulator(RecordingDevice()).keymap, keys,
+                                    config.get_typing_config(), config.is_auto_jumping())
+        if sample['events'] != len(compiled) or abs(sample['typing_seconds'] - compiled.total_delay()) > 1e-6:
+            raise AssertionError(f"{style_name}: planned {sample['events']} events / {sample['typing_seconds']}s, "
+                                 f"compiled {len(compiled)} / {compiled.total_delay()}s")
+    return results
+
+
+def bench_styles(config: ConfigManager, numbers: List[str], rounds: int) -> Dict[str, Any]:
+    manager = StyleManager()
+    results = {}
+    for style_name in manager.get_available_styles():
+        style = manager.get_style(style_name, config.get_style_config(style_name))
+        lines = 0
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for number in numbers:
+                lines += len(style.format(number))
+        elapsed = time.perf_counter() - start
+        results[style_name] = {
+            'numbers_per_second': rounds * len(numbers) / elapsed,
+            'lines_per_second': lines / elapsed
+        }
+    return results
+
+
+def bench_language_load(rounds: int) -> Dict[str, Any]:
+    results = {}
+    with quiet():
+        codes = LanguageManager(str(ROOT / 'languages')).get_available_languages()
+    for code in codes:
+        timings = []
+        for _ in range(rounds):
+            start = time.perf_counter()
+            with quiet():
+                manager = LanguageManager(str(ROOT / 'languages'))
+                manager.load_language(code)
+            timings.append(time.perf_counter() - start)
+        results[code] = {'first_ms': timings[0] * 1e3, 'median_ms': statistics.median(timings) * 1e3}
+    return results
+
+
+def bench_end_to_end(config: ConfigManager, rounds: int) -> Dict[str, Any]:
+    """_type_current_number with zero delays: first-event latency and overhead beyond the schedule"""
+    from src.core.number_flow import NumberFlow
+
+    for name in ('prefix', 'character', 'enter', 'space'):
+        config.set(f'delays.{name}', 0.0)
+    with quiet():
+        flow = NumberFlow(config)
+        # NumberFlow looks for languages/ in the working directory; use the repo's from anywhere
+        flow.language_manager = LanguageManager(str(ROOT / 'languages'), max_generated=config.get_max_generated_number())
+        flow.language_manager.load_language(config.get_language())
+    device = RecordingDevice()
+    flow.keyboard = make_simulator(device)
+
+    results = {}
+    for label, cold in (('cold', True), ('warm', False)):
+        first_event = []
+        overhead = []
+        flow.current_index = 0
+        if not cold:
+            for index in range(rounds):
+                flow.plan_for(index)
+        for _ in range(rounds):
+            if cold:
+                flow.plan_cache.clear()
+            scheduled = None if cold else flow.plan_for(flow.current_index).total_delay()
+            device.clear()
+            start = time.perf_counter_ns()
+            with quiet():
+                flow._type_current_number()
+            end = time.perf_counter_ns()
+            if scheduled is None:
+                scheduled = flow.plan_for(flow.current_index - 1).total_delay()
+            first_event.append((device.times[0] - start) / 1e3)
+            overhead.append((end - start) / 1e3 - scheduled * 1e6)
+        results[label] = {
+            'first_event_us_p50': statistics.median(first_event),
+            'first_event_us_max': max(first_event),
+            'overhead_us_p50': statistics.median(overhead)
+        }
+    flow.stop()
+    return results
+
+
+def bench_typing_queue(config: ConfigManager, burst: int) -> Dict[str, Any]:
+    """A burst of type requests through each runtime's entry point: coalescing, the max_pending bound, cancel on stop"""
+    import asyncio
+    from src.core.async_runtime import AsyncRuntime
+    from src.core.number_flow import NumberFlow
+
+    for name in ('prefix', 'character', 'enter', 'space'):
+        config.set(f'delays.{name}', 0.0)
+    with quiet():
+        flow = NumberFlow(config)
+        flow.language_manager = LanguageManager(str(ROOT / 'languages'), max_generated=config.get_max_generated_number())
+        flow.language_manager.load_language(config.get_language())
+    device = RecordingDevice()
+    flow.keyboard = make_simulator(device)
+    flow.running = True
+    worker = flow.typing_worker
+    max_pending = worker.max_pending
+
+    def check(label: str, accepted: int, typed: int):
+        if accepted > max_pending or typed > max_pending:
+            raise AssertionError(f"{label}: {accepted} accepted / {typed} typed, max_pending is {max_pending}")
+        if accepted != typed:
+            raise AssertionError(f"{label}: {accepted} accepted but {typed} typed")
+
+    async def burst_async() -> int:
+        runtime = AsyncRuntime(flow)
+        runtime.loop = asyncio.get_running_loop()
+        # Stall the worker so the whole burst arrives while the first number waits
+        with flow.keyboard._lock:
+            futures = [runtime.submit_type() for _ in range(burst)]
+        accepted = [future for future in futures if future is not None]
+        await asyncio.gather(*accepted)
+        return len(accepted)
+
+    results = {}
+    for label in ('threaded', 'async'):
+        worker.coalesced = worker.rejected = 0
+        flow.current_index = 0
+        with quiet():
+            worker.start()
+            if label == 'async':
+                accepted = asyncio.run(burst_async())
+            else:
+                with flow.keyboard._lock:
+                    accepted = sum(flow.request_type() for _ in range(burst))
+                while worker.is_busy():
+                    time.sleep(0.001)
+        # Requests beyond the first one in flight fold into the waiting job
+        check(label, accepted, flow.current_index)
+        results[label] = {'accepted': accepted, 'coalesced': worker.coalesced, 'rejected': worker.rejected}
+
+    # stop() must abort the number being typed, not wait for it to finish
+    flow.config.set('delays.character', 0.05)
+    flow.plan_cache.clear()
+    flow.current_index = 0
+    with quiet():
+        worker.start()
+        flow.request_type()
+        time.sleep(0.1)
+        start = time.perf_counter()
+        worker.stop()
+        stopped = time.perf_counter() - start
+    scheduled = flow.plan_for(0).total_delay()
+    if flow.current_index != 0 or stopped > scheduled / 2:
+        raise AssertionError(f"stop took {stopped:.3f}s of a {scheduled:.3f}s number")
+    results['stop_ms'] = stopped * 1e3
+    flow.stop()
+    return results
+
+
+def flatten(results: Dict[str, Any], prefix: str = '') -> Dict[str, float]:
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, name + '.'))
+        elif isinstance(value, (int, float)):
+            flat[name] = value
+    return flat
+
+
+def compare(results: Dict[str, Any], baseline_file: str):
+    with open(baseline_file, 'r', encoding='utf-8') as f:
+        baseline = flatten(json.load(f)['results'])
+    print(f"\n=== Compared with {baseline_file} ===")
+    for name, value in flatten(results).items():
+        old = baseline.get(name)
+        if old:
+            print(f"  {name:<45} {old:14.2f} -> {value:14.2f}  ({(value - old) / old * 100:+6.1f}%)")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-c', '--config', default=str(ROOT / 'config.json'), help='Configuration file to take delays and styles from')
+    parser.add_argument('--output', help='Write results as JSON to this file')
+    parser.add_argument('--compare', metavar='FILE', help='Print changes against a previous JSON result')
+    parser.add_argument('--timing-scale', type=float, default=0.1,
+                        help='Scale factor for configured delays in the timing benchmark (default: 0.1)')
+    parser.add_argument('--quick', action='store_true', help='Fewer rounds, for a smoke run')
+    args = parser.parse_args()
+
+    rounds = 5 if args.quick else 50
+    with quiet():
+        config = ConfigManager(args.config, create_missing=False)
+    numbers = load_numbers(1000)
+
+    benchmarks = [
+        ('keystrokes', lambda: bench_keystrokes(numbers[:200])),
+        ('type_text', lambda: bench_type_text(rounds * 20)),
+        ('coalescing', lambda: bench_coalescing(config, numbers[:200])),
+        ('timing', lambda: bench_timing(config, numbers[1:4], args.timing_scale)),
+        ('rate_limit', lambda: bench_rate_limit(numbers[:12])),
+        ('planner', lambda: bench_planner(config, 20000 if args.quick else 200000)),
+        ('styles', lambda: bench_styles(config, numbers, max(1, rounds // 5))),
+        ('language_load', lambda: bench_language_load(max(3, rounds // 5))),
+        ('end_to_end', lambda: bench_end_to_end(config, max(5, rounds // 2))),
+        ('typing_queue', lambda: bench_typing_queue(config, 50))
+    ]
+
+    results = {}
+    for name, run in benchmarks:
+        results[name] = run()
+        for metric, value in flatten(results[name]).items():
+            print(f"{name + '.' + metric:<45} {value:14.2f}")
+
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'quick': args.quick
+        },
+        'results': results
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.output}")
+    if args.compare:
+        compare(results, args.compare)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,42 @@
+"""In-memory stand-in for uinput.Device that timestamps every emitted event."""
+import time
+from array import array
+from types import SimpleNamespace
+from typing import Any, List, Tuple
+
+from src.core.keyboard import KEY_MAP, INTERNATIONAL_MAP
+
+SPECIAL_KEYS = (
+    'KEY_ENTER', 'KEY_SPACE', 'KEY_SLASH', 'KEY_BACKSPACE', 'KEY_LEFT', 'KEY_RIGHT',
+    'KEY_UP', 'KEY_DOWN', 'KEY_ESC', 'KEY_LEFTSHIFT'
+)
+
+
+def fake_keys() -> SimpleNamespace:
+    """KEY_* constants shaped like python-uinput's (event type, code) tuples"""
+    names = set(KEY_MAP.values()) | {base for base, _ in INTERNATIONAL_MAP.values()} | set(SPECIAL_KEYS)
+    return SimpleNamespace(**{name: (1, code) for code, name in enumerate(sorted(names), 1)})
+
+
+class RecordingDevice:
+    def __init__(self):
+        self.times = array('q')
+        self.events: List[Tuple[Any, int]] = []
+        self.syncs = 0
+
+    def emit(self, key: Any, value: int, syn: bool = True):
+        self.times.append(time.perf_counter_ns())
+        self.events.append((key, value))
+        if syn:
+            self.syncs += 1
+
+    def syn(self):
+        self.syncs += 1
+
+    def clear(self):
+        del self.times[:]
+        self.events.clear()
+        self.syncs = 0
+
+    def __len__(self) -> int:
+        return len(self.events)
@@ -1,19 +1,21 @@
+import time
+_MAIN_START = time.perf_counter()
+
+import os
 import sys
+import json
+import signal
 import argparse
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent / 'src'))
 
 from src.config.config_manager import ConfigManager
-from src.core.number_flow import NumberFlow
 from src.core.language_manager import LanguageManager
+from src.core.startup import StartupProbe
 
-try:
-    from pynput import keyboard
-    PYNPUT_AVAILABLE = True
-except ImportError:
-    keyboard = None
-    PYNPUT_AVAILABLE = False
+# NumberFlow, uinput and pynput are only imported when a session actually
+# starts, keeping --list-languages and --validate fast
 
 
 def main():
@@ -27,8 +29,17 @@ Examples:
   %(prog)s -s HJs           # Start with HJs style
   %(prog)s --list-languages  # Show available languages
   %(prog)s --validate       # Validate current configuration
+  %(prog)s --plan 1-100000  # Predict events and wall time for a range, per style
+  %(prog)s --range 1-5000   # Type numbers 1-5000 unattended with progress and ETA
   %(prog)s --debug 1        # Enable basic debug mode
   %(prog)s --debug 2        # Enable detailed debug with key detection
+  %(prog)s --input-backend evdev  # Read hotkeys from /dev/input (Wayland)
+  %(prog)s --startup-benchmark  # Measure time to listener ready and first event
+  %(prog)s --stats          # Print latency/throughput stats (live with kill -USR1)
+  %(prog)s --trace out.json # Record a trace for chrome://tracing or Perfetto
+  %(prog)s --control-socket /tmp/autojjs.sock  # Scriptable control API
+  %(prog)s --daemon         # Keep the device warm; drive it with --client
+  %(prog)s --client type    # Type the current number via the daemon
         """
     )
     
@@ -46,11 +57,51 @@ Examples:
                        help='Validate configuration and language files')
     parser.add_argument('--debug', type=int, choices=[1, 2], metavar='LEVEL',
                         help='Enable debug mode (1=basic, 2=detailed with key detection)')
+    parser.add_argument('--runtime', choices=['async', 'threaded'],
+                        help='Event core for global mode (default: async)')
+    parser.add_argument('--input-backend', choices=['pynput', 'evdev'],
+                        help='Global key source: pynput, or evdev to read /dev/input directly (default: pynput)')
+    parser.add_argument('--input-replay', metavar='FILE',
+                        help='Read keys from a recorded evdev stream instead of the keyboards (implies evdev)')
+    parser.add_argument('--plan', metavar='RANGE',
+                        help='Dry run: predict lines, events and wall time for numbers RANGE '
+                             '(e.g. 1-100000, 1-indexed) in every style, or just the one given with -s, then exit')
+    parser.add_argument('--range', metavar='RANGE',
+                        help='Type numbers RANGE (e.g. 1-5000, 1-indexed) unattended with live progress, '
+                             'then print a summary and exit')
+    parser.add_argument('--range-json', metavar='FILE',
+                        help='Also write the --range summary to FILE as JSON')
+    parser.add_argument('--startup-benchmark', action='store_true',
+                        help='Report time from process start to listener ready and first event, then exit')
+    
+    parser.add_argument('--stats', action='store_true',
+                        help='Collect per-stage latencies and throughput; printed at exit and on SIGUSR1')
+    parser.add_argument('--stats-json', metavar='FILE',
+                        help='Also write the stats to FILE as JSON at exit (implies --stats)')
+    parser.add_argument('--trace', metavar='FILE',
+                        help='Write a Chrome/Perfetto trace of the session to FILE')
+    parser.add_argument('--control-socket', metavar='PATH',
+                        help='Accept line-delimited JSON commands on a UNIX socket at PATH')
+    parser.add_argument('--daemon', action='store_true',
+                        help='Run headless, keeping the virtual keyboard open and serving the control '
+                             'socket (default: $XDG_RUNTIME_DIR/autojjs.sock)')
+    parser.add_argument('--client', nargs='+', metavar='CMD',
+                        help='Send one command to a running daemon and print the reply '
+                             '(e.g. --client type, --client set_index index=41)')
     
     args = parser.parse_args()
     
+    if args.client:
+        return run_client(args.client, args.control_socket)
+    
+    probe = StartupProbe(_MAIN_START) if args.startup_benchmark else None
+    
     try:
-        config = ConfigManager(args.config)
+        # Read-only commands never write a default config.json
+        config = ConfigManager(args.config,
+                               create_missing=not (args.validate or args.list_languages or args.plan))
+        if probe:
+            probe.mark('config loaded')
         
         if args.debug:
             config.set('debug.level', args.debug)
@@ -70,6 +121,12 @@ Examples:
         if args.style:
             config.set_jack_style(args.style)
         
+        if args.runtime:
+            config.set_runtime(args.runtime)
+        
+        if args.input_backend or args.input_replay:
+            config.set_input_backend('evdev' if args.input_replay else args.input_backend)
+        
         validation = config.validate_config()
         if not validation['valid']:
             print("Configuration errors:")
@@ -77,16 +134,71 @@ Examples:
                 print(f"  - {error}")
             return 1
         
+        if args.plan:
+            return plan_session(config, args.plan, [args.style] if args.style else None)
+        
+        from src.core.number_flow import NumberFlow, load_pynput
+        
         flow = NumberFlow(config)
+        flow.input_replay = args.input_replay
+        
+        indices = None
+        if args.range:
+            try:
+                indices = parse_range(args.range, flow.language_manager.get_total_numbers())
+            except ValueError as e:
+                print(f"Error: {e}")
+                return 1
         
-        if not PYNPUT_AVAILABLE:
+        if probe:
+            flow.run_startup_benchmark(probe)
+            print(probe.report())
+            return 0
+        
+        if config.get_input_backend() == 'pynput' and not load_pynput():
             print("Note: pynput not available. Global key detection disabled.")
             print("Install with: pip install pynput")
             print("Or run in terminal mode only.\n")
         
-        flow.start()
+        stats = None
+        if args.stats or args.stats_json:
+            stats = enable_stats(flow)
         
-        return 0
+        if args.trace:
+            from src.core import tracing
+            tracing.start_tracing(args.trace)
+        
+        if args.control_socket or args.daemon:
+            from src.core.control_client import default_socket_path
+            from src.core.control_server import ControlServer
+            flow.control_server = ControlServer(flow, args.control_socket or default_socket_path())
+        
+        summary = None
+        try:
+            if args.daemon:
+                flow.run_daemon()
+            elif indices is not None:
+                summary = flow.run_range(indices.start, indices.stop)
+                if summary is None:
+                    return 1
+                if args.range_json:
+                    with open(args.range_json, 'w', encoding='utf-8') as f:
+                        json.dump(summary, f, indent=2)
+                    print(f"Range summary written to {args.range_json}")
+            else:
+                flow.start()
+        finally:
+            if args.trace:
+                tracer = tracing.stop_tracing()
+                print(f"Trace written to {args.trace} ({tracer.written} events"
+                      f"{f', {tracer.dropped} dropped' if tracer.dropped else ''})")
+            if stats:
+                print(f"\n{stats.report()}")
+                if args.stats_json:
+                    stats.dump_json(args.stats_json)
+                    print(f"Stats written to {args.stats_json}")
+        
+        return 1 if summary and summary['cancelled'] else 0
         
     except KeyboardInterrupt:
         print("\nInterrupted by user")
@@ -99,6 +211,93 @@ Examples:
         return 1
 
 
+def run_client(words, socket_path=None) -> int:
+    from src.core.control_client import default_socket_path, parse_command, send_request
+    
+    path = socket_path or default_socket_path()
+    try:
+        request = parse_command(words)
+        response = send_request(path, request)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+    except (FileNotFoundError, ConnectionRefusedError):
+        print(f"No daemon listening on {path} (start one with --daemon)")
+        return 1
+    except OSError as e:
+        print(f"Error talking to daemon: {e}")
+        return 1
+    
+    if not response.get('ok'):
+        print(f"Error: {response.get('error')}")
+        return 1
+    print(json.dumps(response.get('result'), indent=2, ensure_ascii=False))
+    return 0
+
+
+def parse_range(text: str, total: int) -> range:
+    """1-indexed inclusive 'A-B' (or a single 'A') -> 0-based range, clamped to the available numbers"""
+    first, _, last = text.partition('-')
+    try:
+        start = int(first)
+        end = int(last) if last else start
+    except ValueError:
+        raise ValueError(f"Invalid range '{text}' (expected e.g. 1-1000)")
+    if start < 1 or end < start:
+        raise ValueError(f"Invalid range '{text}' (expected 1 <= start <= end)")
+    if start > total:
+        raise ValueError(f"Range '{text}' starts past the last number ({total})")
+    return range(start - 1, min(end, total))
+
+
+def plan_session(config: ConfigManager, range_text: str, styles=None) -> int:
+    from src.core.session_planner import plan_range, report
+    
+    lang_manager = LanguageManager(max_generated=config.get_max_generated_number())
+    if not lang_manager.load_language(config.get_language()):
+        print(f"Err: Failed to load language '{config.get_language()}'")
+        return 1
+    try:
+        indices = parse_range(range_text, lang_manager.get_total_numbers())
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+    
+    started = time.perf_counter()
+    progress = None
+    if len(indices) >= 200000:
+        progress = lambda done: print(f"  planned {done}/{len(indices)}...", end='\r', flush=True)
+    plan = plan_range(config, lang_manager, indices.start, indices.stop, styles, progress=progress)
+    if progress:
+        print()
+    print(report(plan, config.get_jack_style()))
+    print(f"  Planned in {time.perf_counter() - started:.2f}s ({config.get_language()}, "
+          f"* = configured style)")
+    return 0
+
+
+def enable_stats(flow):
+    import threading
+    from src.core.stats import StatsRecorder
+    
+    stats = flow.stats = StatsRecorder()
+    if hasattr(signal, 'SIGUSR1'):
+        # The handler runs on the main thread, which may be holding the
+        # recorder's lock mid-record, so it only asks a thread to print
+        requested = threading.Event()
+
+        def print_reports():
+            while True:
+                requested.wait()
+                requested.clear()
+                print(f"\n{stats.report()}")
+
+        threading.Thread(target=print_reports, name='stats-report', daemon=True).start()
+        signal.signal(signal.SIGUSR1, lambda signum, frame: requested.set())
+        print(f"Stats enabled - live report: kill -USR1 {os.getpid()}")
+    return stats
+
+
 def validate_system(config: ConfigManager) -> int:
     print("=== System Validation ===\n")
     
@@ -120,7 +319,7 @@ def validate_system(config: ConfigManager) -> int:
     print(f"Style: {config.get_jack_style()}")
     print(f"Prefix key: {config.get_prefix_key()}")
     
-    lang_manager = LanguageManager()
+    lang_manager = LanguageManager(max_generated=config.get_max_generated_number())
     available = lang_manager.get_available_languages()
     
     if not available:
@@ -154,6 +353,15 @@ def validate_system(config: ConfigManager) -> int:
     total = lang_manager.get_total_numbers()
     print(f"✅ Loaded {total} numbers")
     
+    consistency = lang_manager.check_speller_consistency(config.get_language())
+    if consistency['mismatches']:
+        print(f"Language '{config.get_language()}' speller differs from numbers.json "
+              f"({len(consistency['mismatches'])} of {consistency['checked']}):")
+        for index, expected, generated in consistency['mismatches'][:10]:
+            print(f"  ⚠️  {index}: '{expected}' != '{generated}'")
+    elif consistency['checked']:
+        print(f"✅ Speller matches numbers.json for 0-{consistency['checked'] - 1}")
+    
     print("\n=== Validation Complete ===")
     return 0
 
@@ -161,7 +369,7 @@ def validate_system(config: ConfigManager) -> int:
 def list_languages(config: ConfigManager) -> int:
     print("=== Available Languages ===\n")
     
-    lang_manager = LanguageManager()
+    lang_manager = LanguageManager(max_generated=config.get_max_generated_number())
     available = lang_manager.get_available_languages()
     
     if not available:
@@ -169,8 +377,10 @@ def list_languages(config: ConfigManager) -> int:
         print("Create language directories in 'languages/' folder.")
         return 1
     
+    validations = lang_manager.validate_languages(available)
+    
     for lang_code in sorted(available):
-        validation = lang_manager.validate_language_structure(lang_code)
+        validation = validations[lang_code]
         
         if validation['valid']:
             status = "✅"
@@ -187,8 +397,8 @@ def list_languages(config: ConfigManager) -> int:
             for warning in validation['warnings']:
                 print(f"    Warning: {warning}")
         
-        if lang_manager.load_language(lang_code):
-            total = lang_manager.get_total_numbers()
+        total = lang_manager.get_language_total(lang_code)
+        if validation['valid'] and total:
             print(f"    Numbers: {total}")
         
         print()
@@ -1,9 +1,52 @@
+import copy
 import json
 import os
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Set
 from pathlib import Path
 
 
+class ConfigSnapshot:
+    """Immutable, pre-resolved view of the settings read on the key listener path.
+    
+    ConfigManager.get walks a dotted path through nested dicts; code that runs
+    for every key press on the machine reads these plain attributes instead.
+    """
+    __slots__ = ('debug_level', 'show_keys', 'next_key', 'previous_key', 'jump_key',
+                 'quit_key', 'type_key', 'type_special_key', 'automatic_mode')
+    
+    def __init__(self, config: 'ConfigManager'):
+        set_field = object.__setattr__
+        nav_config = config.get_navigation_config()
+        special_keys = config.get('navigation.special_keys', {}) or {}
+        set_field(self, 'debug_level', config.get_debug_level())
+        set_field(self, 'show_keys', bool(config.should_show_keys()))
+        set_field(self, 'next_key', nav_config.get('next'))
+        set_field(self, 'previous_key', nav_config.get('previous'))
+        set_field(self, 'jump_key', nav_config.get('jump'))
+        set_field(self, 'quit_key', nav_config.get('quit'))
+        set_field(self, 'type_key', config.get_type_key())
+        set_field(self, 'type_special_key', special_keys.get('type'))
+        set_field(self, 'automatic_mode', bool(config.is_automatic_mode()))
+    
+    def __setattr__(self, name, value):
+        raise AttributeError(f"ConfigSnapshot is read-only ('{name}')")
+    
+    def key_actions(self) -> Dict[str, str]:
+        """Listener token (lowercase char or special key name) -> action"""
+        actions = {}
+        if self.type_special_key:
+            actions[self.type_special_key] = 'type'
+        actions['esc'] = 'esc'
+        # Inserted from lowest to highest priority so a key bound twice keeps
+        # the action the original if/elif chain would have picked
+        for key, action in ((self.type_key, 'type'), (self.jump_key, 'jump'),
+                            (self.previous_key, 'previous'), (self.next_key, 'next'),
+                            (self.quit_key, 'quit')):
+            if key:
+                actions[key] = action
+        return actions
+
+
 class ConfigManager:
     DEFAULT_CONFIG = {
         "language": "en",
@@ -23,7 +66,8 @@ class ConfigManager:
             "type": ".",
             "special_keys": {
                 "type": "shift_r"
-            }
+            },
+            "jump_timeout": 5.0
         },
         "styles": {
             "JJs": {
@@ -43,13 +87,42 @@ class ConfigManager:
         "automatic_mode": {
             "enabled": False,
             "min_delay": 2.0,
-            "max_delay": 5.0
+            "max_delay": 5.0,
+            "mode": "uniform",
+            "rate": 12.0
+        },
+        "rate_limit": {
+            "buckets": []
         },
         "auto_jumping": False,
+        "runtime": "async",
+        "input": {
+            "backend": "pynput",
+            "devices": []
+        },
         "international_support": {
             "enabled": True,
             "use_ascii_fallbacks": True
         },
+        "number_generation": {
+            "enabled": True,
+            "max_number": 1000000
+        },
+        "performance": {
+            "plan_cache_size": 256,
+            "prefetch_ahead": 3,
+            "spin_threshold_us": 500,
+            "max_pending_types": 5,
+            "format_table_size": 10000
+        },
+        "device": {
+            "ready_timeout": 2.0,
+            "settle_ms": 150
+        },
+        "hot_reload": {
+            "enabled": True,
+            "poll_interval": 0.5
+        },
         "debug": {
             "level": 0,
             "show_index": True,
@@ -59,12 +132,17 @@ class ConfigManager:
         }
     }
     
-    def __init__(self, config_file: str = "config.json"):
+    def __init__(self, config_file: str = "config.json", create_missing: bool = True):
         self.config_file = Path(config_file)
-        self.config = self.DEFAULT_CONFIG.copy()
+        self.config = copy.deepcopy(self.DEFAULT_CONFIG)
+        self.create_missing = create_missing
+        self._snapshot: Optional[ConfigSnapshot] = None
+        # Values set at runtime (command line flags) survive a reload of the file
+        self.overrides: Dict[str, Any] = {}
         self.load_config()
     
     def load_config(self):
+        self._snapshot = None
         if self.config_file.exists():
             try:
                 with open(self.config_file, 'r', encoding='utf-8') as f:
@@ -74,9 +152,11 @@ class ConfigManager:
             except Exception as e:
                 print(f"Error loading config file: {e}")
                 print("Using default configuration")
-        else:
+        elif self.create_missing:
             print(f"Config file {self.config_file} not found, creating default")
             self.save_config()
+        else:
+            print(f"Config file {self.config_file} not found, using default configuration")
     
     def _merge_config(self, default: Dict[str, Any], user: Dict[str, Any]):
         for key, value in user.items():
@@ -115,6 +195,55 @@ class ConfigManager:
             config = config[key]
         
         config[keys[-1]] = value
+        self.overrides[key_path] = value
+        self._snapshot = None
+    
+    def reload(self) -> Optional[Set[str]]:
+        """Re-read the config file and swap it in if it validates.
+        
+        Returns the top-level sections that changed (empty if nothing did),
+        or None when the file could not be read or failed validation, in
+        which case the running configuration is left untouched.
+        """
+        try:
+            with open(self.config_file, 'r', encoding='utf-8') as f:
+                user_config = json.load(f)
+        except Exception as e:
+            print(f"Error reloading config file: {e}")
+            return None
+        
+        candidate = ConfigManager.__new__(ConfigManager)
+        candidate.config_file = self.config_file
+        candidate.create_missing = False
+        candidate.config = copy.deepcopy(self.DEFAULT_CONFIG)
+        candidate._snapshot = None
+        candidate.overrides = {}
+        self._merge_config(candidate.config, user_config)
+        for key_path, value in self.overrides.items():
+            candidate.set(key_path, value)
+        
+        validation = candidate.validate_config()
+        if not validation['valid']:
+            print("Config reload rejected:")
+            for error in validation['errors']:
+                print(f"  - {error}")
+            return None
+        
+        old_config = self.config
+        changed = {key for key in set(old_config) | set(candidate.config)
+                   if old_config.get(key) != candidate.config.get(key)}
+        if changed:
+            # Readers see either the old or the new dict, never a mix
+            self.config = candidate.config
+            self._snapshot = None
+        return changed
+    
+    def snapshot(self) -> ConfigSnapshot:
+        """Current ConfigSnapshot; a new one is built only after the config changes"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            snapshot = self._snapshot = ConfigSnapshot(self)
+        return snapshot
     
     def get_language(self) -> str:
         return self.get('language', 'en')
@@ -143,17 +272,90 @@ class ConfigManager:
     def get_navigation_config(self) -> Dict[str, str]:
         return self.get('navigation', self.DEFAULT_CONFIG['navigation'])
     
+    def get_typing_config(self) -> Dict[str, Any]:
+        """Delays and prefix in the form compile_plan takes"""
+        delays = self.get_delays()
+        return {
+            'prefix_key': self.get_prefix_key(),
+            'prefix_delay': delays['prefix'],
+            'char_delay': delays['character'],
+            'enter_delay': delays['enter'],
+            'space_delay': delays['space']
+        }
+    
     def get_type_key(self) -> str:
         return self.get('navigation.type', '.')
     
     def is_automatic_mode(self) -> bool:
         return self.get('automatic_mode.enabled', False)
     
+    def get_jump_timeout(self) -> float:
+        return self.get('navigation.jump_timeout', 5.0)
+    
     def get_automatic_delays(self) -> tuple:
         min_delay = self.get('automatic_mode.min_delay', 2.0)
         max_delay = self.get('automatic_mode.max_delay', 5.0)
         return min_delay, max_delay
     
+    def get_automatic_settings(self) -> Dict[str, Any]:
+        min_delay, max_delay = self.get_automatic_delays()
+        return {
+            'mode': self.get('automatic_mode.mode', 'uniform'),
+            'rate': self.get('automatic_mode.rate', 12.0),
+            'min_delay': min_delay,
+            'max_delay': max_delay
+        }
+    
+    def get_rate_limits(self) -> List[Dict[str, Any]]:
+        return self.get('rate_limit.buckets', [])
+    
+    def get_max_generated_number(self) -> Optional[int]:
+        if not self.get('number_generation.enabled', True):
+            return None
+        return self.get('number_generation.max_number', 1000000)
+    
+    def get_plan_cache_size(self) -> int:
+        return self.get('performance.plan_cache_size', 256)
+    
+    def get_prefetch_ahead(self) -> int:
+        return self.get('performance.prefetch_ahead', 3)
+    
+    def get_format_table_size(self) -> int:
+        return self.get('performance.format_table_size', 10000)
+    
+    def get_spin_threshold_us(self) -> int:
+        return self.get('performance.spin_threshold_us', 500)
+    
+    def get_device_ready_timeout(self) -> float:
+        return self.get('device.ready_timeout', 2.0)
+    
+    def get_device_settle_ms(self) -> int:
+        return self.get('device.settle_ms', 150)
+    
+    def is_hot_reload_enabled(self) -> bool:
+        return self.get('hot_reload.enabled', True)
+    
+    def get_hot_reload_poll_interval(self) -> float:
+        return self.get('hot_reload.poll_interval', 0.5)
+    
+    def get_runtime(self) -> str:
+        return self.get('runtime', 'async')
+    
+    def set_runtime(self, runtime: str):
+        self.set('runtime', runtime)
+    
+    def get_input_backend(self) -> str:
+        return self.get('input.backend', 'pynput')
+    
+    def set_input_backend(self, backend: str):
+        self.set('input.backend', backend)
+    
+    def get_input_devices(self) -> List[str]:
+        return self.get('input.devices', [])
+    
+    def get_max_pending_types(self) -> int:
+        return self.get('performance.max_pending_types', 5)
+    
     def get_debug_level(self) -> int:
         return self.get('debug.level', 0)
     
@@ -197,8 +399,69 @@ class ConfigManager:
         if style not in ['JJs', 'HJs', 'GJs']:
             result['warnings'].append(f'Unknown jack style: {style}')
         
+        max_number = self.get('number_generation.max_number')
+        if not isinstance(max_number, int) or max_number < 0:
+            result['errors'].append(f'Invalid number_generation.max_number: {max_number}')
+        
+        for perf_name in ('plan_cache_size', 'prefetch_ahead', 'spin_threshold_us', 'max_pending_types',
+                          'format_table_size'):
+            perf_value = self.get(f'performance.{perf_name}')
+            if not isinstance(perf_value, int) or perf_value < 0:
+                result['errors'].append(f'Invalid performance value for {perf_name}: {perf_value}')
+        
+        ready_timeout = self.get_device_ready_timeout()
+        if not isinstance(ready_timeout, (int, float)) or ready_timeout < 0:
+            result['errors'].append(f'Invalid device.ready_timeout: {ready_timeout}')
+        
+        settle_ms = self.get_device_settle_ms()
+        if not isinstance(settle_ms, int) or settle_ms < 0:
+            result['errors'].append(f'Invalid device.settle_ms: {settle_ms}')
+        
+        poll_interval = self.get_hot_reload_poll_interval()
+        if not isinstance(poll_interval, (int, float)) or poll_interval <= 0:
+            result['errors'].append(f'Invalid hot_reload.poll_interval: {poll_interval}')
+        
+        auto = self.get_automatic_settings()
+        if auto['mode'] not in ['uniform', 'rate', 'poisson']:
+            result['errors'].append(f'Unknown automatic_mode.mode: {auto["mode"]} (expected "uniform", "rate" or "poisson")')
+        if not isinstance(auto['rate'], (int, float)) or auto['rate'] <= 0:
+            result['errors'].append(f'Invalid automatic_mode.rate: {auto["rate"]} (numbers per minute)')
+        if (not isinstance(auto['min_delay'], (int, float)) or not isinstance(auto['max_delay'], (int, float))
+                or not 0 <= auto['min_delay'] <= auto['max_delay']):
+            result['errors'].append(f'Invalid automatic_mode delays: {auto["min_delay"]}..{auto["max_delay"]}')
+        
+        buckets = self.get_rate_limits()
+        if not isinstance(buckets, list):
+            result['errors'].append(f'Invalid rate_limit.buckets: {buckets} (expected a list)')
+            buckets = []
+        for bucket in buckets:
+            numbers = isinstance(bucket, dict) and all(
+                isinstance(bucket.get(name), (int, float)) and bucket[name] > 0 for name in ('lines', 'per'))
+            # The effective burst, as TokenBucket defaults it
+            burst = bucket.get('burst', max(1, bucket['lines'])) if numbers else None
+            if not numbers or not isinstance(burst, (int, float)) or burst < 1:
+                result['errors'].append(f'Invalid rate_limit bucket: {bucket} '
+                                        f'(expected {{"lines": N, "per": seconds}} and optionally "burst" >= 1)')
+        
+        jump_timeout = self.get_jump_timeout()
+        if not isinstance(jump_timeout, (int, float)) or jump_timeout <= 0:
+            result['errors'].append(f'Invalid navigation.jump_timeout: {jump_timeout}')
+        
+        runtime = self.get_runtime()
+        if runtime not in ['async', 'threaded']:
+            result['errors'].append(f'Unknown runtime: {runtime} (expected "async" or "threaded")')
+        
+        backend = self.get_input_backend()
+        if backend not in ['pynput', 'evdev']:
+            result['errors'].append(f'Unknown input.backend: {backend} (expected "pynput" or "evdev")')
+        
+        devices = self.get_input_devices()
+        if not isinstance(devices, list) or not all(isinstance(device, str) for device in devices):
+            result['errors'].append(f'Invalid input.devices: {devices} (expected a list of /dev/input paths)')
+        
         prefix_key = self.get_prefix_key()
         if len(prefix_key) != 1:
             result['errors'].append('Prefix key must be a single character')
         
+        result['valid'] = not result['errors']
         return result
\ No newline at end of file
@@ -0,0 +1,148 @@
+import ctypes
+import ctypes.util
+import os
+import selectors
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Optional, Tuple
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+
+_EVENT_HEADER = struct.Struct('iIII')
+# Editors often write a file in several steps; wait this long for the burst to end
+SETTLE_DELAY = 0.05
+
+
+def _load_libc():
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        libc.inotify_init1
+        libc.inotify_add_watch
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+class ConfigWatcher:
+    """Calls `on_change` when the config file is written, moved into place or created.
+
+    The file's directory is watched with inotify, so atomic saves (write a
+    temp file, rename it over the original) are seen as well as in-place
+    writes. Where inotify is unavailable the file's mtime and size are polled
+    every `poll_interval` seconds instead.
+    """
+
+    def __init__(self, config_file, on_change: Callable[[], None], poll_interval: float = 0.5):
+        self.path = Path(config_file).absolute()
+        self.on_change = on_change
+        self.poll_interval = poll_interval
+        self.backend: Optional[str] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._inotify_fd: Optional[int] = None
+        self._wake_r: Optional[int] = None
+        self._wake_w: Optional[int] = None
+        # Serializes stop()'s wake-up write with the watcher closing the pipe
+        self._wake_lock = threading.Lock()
+
+    def start(self) -> str:
+        self._inotify_fd = self._open_inotify()
+        self.backend = 'inotify' if self._inotify_fd is not None else 'polling'
+        target = self._watch_inotify if self._inotify_fd is not None else self._watch_polling
+        self._thread = threading.Thread(target=target, name='config-watcher', daemon=True)
+        self._thread.start()
+        return self.backend
+
+    def stop(self):
+        self._stop.set()
+        with self._wake_lock:
+            if self._wake_w is not None:
+                try:
+                    os.write(self._wake_w, b'\0')
+                except OSError:
+                    pass
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1.0)
+
+    def _open_inotify(self) -> Optional[int]:
+        libc = _load_libc()
+        if libc is None:
+            return None
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            return None
+        mask = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_MODIFY
+        if libc.inotify_add_watch(fd, os.fsencode(str(self.path.parent)), mask) < 0:
+            os.close(fd)
+            return None
+        self._wake_r, self._wake_w = os.pipe()
+        return fd
+
+    def _watch_inotify(self):
+        fd = self._inotify_fd
+        name = os.fsencode(self.path.name)
+        selector = selectors.DefaultSelector()
+        selector.register(fd, selectors.EVENT_READ)
+        selector.register(self._wake_r, selectors.EVENT_READ)
+        try:
+            while not self._stop.is_set():
+                selector.select()
+                if self._stop.is_set():
+                    break
+                if not self._read_events(fd, name):
+                    continue
+                # Let the rest of the save land, then reload once
+                time.sleep(SETTLE_DELAY)
+                self._read_events(fd, name)
+                self._notify()
+        finally:
+            selector.close()
+            with self._wake_lock:
+                for handle in (fd, self._wake_r, self._wake_w):
+                    os.close(handle)
+                self._inotify_fd = self._wake_r = self._wake_w = None
+
+    @staticmethod
+    def _read_events(fd: int, name: bytes) -> bool:
+        matched = False
+        while True:
+            try:
+                data = os.read(fd, 4096)
+            except BlockingIOError:
+                return matched
+            offset = 0
+            while offset + _EVENT_HEADER.size <= len(data):
+                _, _, _, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                if data[offset:offset + length].rstrip(b'\0') == name:
+                    matched = True
+                offset += length
+
+    def _signature(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _watch_polling(self):
+        last = self._signature()
+        while not self._stop.wait(self.poll_interval):
+            current = self._signature()
+            if current != last:
+                last = current
+                if current is not None:
+                    self._notify()
+
+    def _notify(self):
+        try:
+            self.on_change()
+        except Exception as e:
+            print(f"Error reloading config: {e}")
@@ -0,0 +1,152 @@
+import asyncio
+import signal
+import time
+from typing import Optional, Set
+
+from . import tracing
+
+
+class AsyncRuntime:
+    """asyncio event core for NumberFlow's global mode.
+
+    The key listener thread only hands key events to the loop. Key
+    handling and shutdown are tasks on the loop, so an idle session does
+    not wake up at all. Typing goes to the flow's TypingWorker, the same
+    bounded, coalescing queue the threaded runtime uses (uinput emission
+    blocks, so it runs on the worker's thread), and quitting cancels the
+    typing in progress right away.
+    """
+
+    def __init__(self, flow):
+        self.flow = flow
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.key_events: Optional[asyncio.Queue] = None
+        self.stop_event: Optional[asyncio.Event] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    def run(self):
+        try:
+            asyncio.run(self._main())
+        except KeyboardInterrupt:
+            print("\nInterrupted by user")
+        finally:
+            self.flow.stop()
+
+    def request_stop(self):
+        """Thread-safe: stop the runtime from any thread"""
+        self.flow.typing_worker.cancel()
+        loop = self.loop
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(self.stop_event.set)
+
+    async def _main(self):
+        self.loop = asyncio.get_running_loop()
+        self.key_events = asyncio.Queue()
+        self.stop_event = asyncio.Event()
+        self.flow.async_runtime = self
+
+        try:
+            self.loop.add_signal_handler(signal.SIGINT, self.request_stop)
+        except (NotImplementedError, RuntimeError):
+            pass
+
+        self.flow.typing_worker.start()
+        self.flow._show_current_status()
+        listener = self.flow._start_listener(self._on_press)
+
+        self._spawn(self._dispatch_keys())
+
+        try:
+            await self.stop_event.wait()
+        finally:
+            self.flow.typing_worker.cancel()
+            listener.stop()
+            for task in list(self._tasks):
+                task.cancel()
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+            self.flow.async_runtime = None
+
+    def _spawn(self, coroutine) -> asyncio.Task:
+        task = self.loop.create_task(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    def _on_press(self, key):
+        # Runs on the listener thread: drop our own keystrokes, hand the rest
+        # over and return at once
+        pressed_ns = time.perf_counter_ns()
+        pressed_mono = time.monotonic_ns()
+        if self.flow._is_self_injected(key):
+            return
+        self.loop.call_soon_threadsafe(self.key_events.put_nowait, (key, pressed_ns))
+        stats = self.flow.stats
+        if stats is not None:
+            stats.record('on_press', time.perf_counter_ns() - pressed_ns)
+        trace = tracing.tracer
+        if trace is not None:
+            trace.complete('on_press', 'listener', pressed_mono, time.monotonic_ns(), {'key': str(key)})
+
+    async def _dispatch_keys(self):
+        flow = self.flow
+        while True:
+            key, pressed_ns = await self.key_events.get()
+            try:
+                if flow.jump_capture.active and flow._feed_jump(key):
+                    continue
+                action = flow._resolve_key_action(key)
+                if action == 'type':
+                    flow._type_trigger_ns = pressed_ns
+                if action is not None:
+                    trace = tracing.tracer
+                    handled = time.monotonic_ns()
+                    await self._perform(action)
+                    if trace is not None:
+                        trace.complete(f'handle {action}', 'listener', handled, time.monotonic_ns())
+            except Exception as e:
+                if flow.config.is_debug_level(1):
+                    print(f"Error handling key: {e}")
+
+    async def _perform(self, action: str):
+        flow = self.flow
+        if action in ('quit', 'esc'):
+            print("\nQuit key pressed - stopping..." if action == 'quit' else "\nESC pressed - stopping...")
+            self.request_stop()
+        elif action == 'next':
+            flow.next_number()
+            flow._show_current_status()
+        elif action == 'previous':
+            flow.previous_number()
+            flow._show_current_status()
+        elif action == 'jump':
+            flow._begin_jump()
+        elif action == 'type':
+            if flow.is_automatic_mode():
+                flow._on_auto_key()
+            else:
+                self.submit_type()
+
+    def submit_type(self) -> Optional[asyncio.Future]:
+        """Queue one number on the typing worker; a future resolved once it is typed, None if rejected"""
+        worker = self.flow.typing_worker
+        job = worker.submit()
+        if job is None:
+            print(f"Typing queue full ({worker.max_pending} pending) - request dropped")
+            return None
+        loop = self.loop
+        done = loop.create_future()
+
+        def resolve():
+            if not done.done():
+                done.set_result(not job.cancel.is_set())
+
+        def on_done():
+            # Runs on the worker thread; the loop may already be gone at shutdown
+            if not loop.is_closed():
+                try:
+                    loop.call_soon_threadsafe(resolve)
+                except RuntimeError:
+                    pass
+
+        job.add_done_callback(on_done)
+        return done
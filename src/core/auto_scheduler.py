@@ -0,0 +1,250 @@
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from . import tracing
+
+AUTO_MODES = ('uniform', 'rate', 'poisson')
+
+
+class AutoScheduler:
+    """Automatic mode: type a number, wait, repeat, on a thread of its own.
+
+    The gap between numbers depends on the mode:
+      uniform  a random pause of min_delay..max_delay seconds after each number
+      rate     `rate` numbers per minute, start to start
+      poisson  random arrivals averaging `rate` per minute (exponential gaps)
+    In the rate modes each start is scheduled from the previous start, so
+    the time spent typing is part of the gap and the achieved rate matches
+    the target as long as a number takes less than a gap; a late start is
+    not made up with a burst. pause(), resume() and stop() wake the
+    scheduler at once. stop() also aborts a number being typed; on
+    pause it is finished, and no new one starts while paused. Time spent
+    paused does not count against the rate.
+    """
+
+    def __init__(self, type_fn: Callable[[Callable[[], None]], bool],
+                 settings: Callable[[], Dict[str, Any]], verbose: Callable[[], bool] = lambda: False,
+                 cancel_fn: Callable[[], None] = lambda: None):
+        # type_fn(on_done) queues one number and calls on_done once it is typed;
+        # cancel_fn aborts the number it queued last
+        self._type = type_fn
+        self._cancel = cancel_fn
+        self._settings = settings
+        self._verbose = verbose
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self._paused = False
+        self.rng = random.Random()
+        self.state = 'stopped'
+        self.mode = 'uniform'
+        self._reset_counters()
+
+    def _reset_counters(self):
+        self.started = 0.0
+        self.typed = 0
+        self.dropped = 0
+        self.late = 0
+        self.typing_time = 0.0
+        self.paused_time = 0.0
+        self._paused_at = 0.0
+        self.next_at: Optional[float] = None
+        # Start-to-start time covered by the numbers typed so far, minus pauses
+        self.starts = 0
+        self._last_start = 0.0
+        self._span = 0.0
+        self._span_paused = 0.0
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> bool:
+        with self._condition:
+            if self.is_running():
+                return False
+            self._stopping = False
+            self._paused = False
+            self._reset_counters()
+            self.started = time.monotonic()
+            self.state = 'waiting'
+            self._thread = threading.Thread(target=self._run, name='auto-scheduler', daemon=True)
+            self._thread.start()
+            return True
+
+    def stop(self):
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+
+    def pause(self) -> bool:
+        with self._condition:
+            if not self.is_running() or self._paused or self._stopping:
+                return False
+            self._paused = True
+            self._paused_at = time.monotonic()
+            self._condition.notify_all()
+            return True
+
+    def resume(self) -> bool:
+        with self._condition:
+            if not self._paused:
+                return False
+            self._paused = False
+            paused = time.monotonic() - self._paused_at
+            self.paused_time += paused
+            self._span_paused += paused
+            self._condition.notify_all()
+            return True
+
+    @property
+    def paused(self) -> bool:
+        return self._paused
+
+    def gap(self, settings: Dict[str, Any]) -> float:
+        mode = settings['mode']
+        if mode == 'rate':
+            return 60.0 / settings['rate']
+        if mode == 'poisson':
+            return self.rng.expovariate(settings['rate'] / 60.0)
+        return self.rng.uniform(settings['min_delay'], settings['max_delay'])
+
+    def target_rate(self, settings: Optional[Dict[str, Any]] = None) -> Optional[float]:
+        """Numbers per minute the settings aim for; for uniform gaps, given the typing time so far"""
+        settings = settings or self._settings()
+        if settings['mode'] != 'uniform':
+            return float(settings['rate'])
+        if not self.typed:
+            return None
+        cycle = (settings['min_delay'] + settings['max_delay']) / 2 + self.typing_time / self.typed
+        return 60.0 / cycle if cycle > 0 else None
+
+    def achieved_rate(self) -> Optional[float]:
+        """Numbers per minute, from the intervals between starts with pauses left out"""
+        if self.starts < 2 or self._span <= 0:
+            return None
+        return (self.starts - 1) * 60.0 / self._span
+
+    def _mark_start(self, now: float):
+        if self.starts:
+            self._span += now - self._last_start - self._span_paused
+        self._span_paused = 0.0
+        self._last_start = now
+        self.starts += 1
+
+    def status(self) -> Dict[str, Any]:
+        with self._condition:
+            next_in = None
+            if self.state == 'waiting' and self.next_at is not None:
+                next_in = max(0.0, self.next_at - time.monotonic())
+            return {
+                'state': self.state,
+                'mode': self.mode,
+                'typed': self.typed,
+                'dropped': self.dropped,
+                'late': self.late,
+                'target_per_min': self.target_rate(),
+                'achieved_per_min': self.achieved_rate(),
+                'next_in': next_in
+            }
+
+    def _run(self):
+        try:
+            settings = self._settings()
+            self.mode = settings['mode']
+            gap = self.gap(settings)
+            print(f"Starting automatic typing in {gap:.1f} seconds...")
+            next_start = time.monotonic() + gap
+            while True:
+                scheduled = self._wait_until(next_start)
+                if scheduled is None:
+                    break
+                begun = time.monotonic()
+                self._mark_start(begun)
+                typed = self._type_one()
+                finished = time.monotonic()
+                self.typing_time += finished - begun
+                if typed is None:
+                    break
+                if typed:
+                    self.typed += 1
+                else:
+                    self.dropped += 1
+
+                # Re-read every round so a config reload applies to the next gap
+                settings = self._settings()
+                self.mode = settings['mode']
+                gap = self.gap(settings)
+                if self.mode == 'uniform':
+                    next_start = finished + gap
+                else:
+                    next_start = scheduled + gap
+                    if next_start < finished:
+                        self.late += 1
+                        next_start = finished
+                self._report(settings, next_start - finished)
+        finally:
+            with self._condition:
+                self.state = 'stopped'
+                self.next_at = None
+
+    def _report(self, settings: Dict[str, Any], next_in: float):
+        achieved = self.achieved_rate()
+        target = self.target_rate(settings)
+        achieved_text = f"{achieved:.1f}/min" if achieved is not None else "-"
+        target_text = f"{target:.1f}/min" if target is not None else "-"
+        print(f"Auto: {self.typed} typed, {achieved_text} (target {target_text}, {self.mode})")
+        if self._verbose():
+            print(f"[DEBUG1] Next automatic type in {next_in:.1f}s")
+
+    def _wait_until(self, deadline: float) -> Optional[float]:
+        """Wait for `deadline` (monotonic), pushed back by any pause; None once stopped"""
+        trace = tracing.tracer
+        started = time.monotonic_ns()
+        try:
+            with self._condition:
+                while not self._stopping:
+                    if self._paused:
+                        self.state = 'paused'
+                        paused_at = time.monotonic()
+                        while self._paused and not self._stopping:
+                            self._condition.wait()
+                        deadline += time.monotonic() - paused_at
+                        continue
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.state = 'typing'
+                        self.next_at = None
+                        return deadline
+                    self.state = 'waiting'
+                    self.next_at = deadline
+                    self._condition.wait(remaining)
+                return None
+        finally:
+            if trace is not None:
+                trace.complete('auto delay', 'auto', started, time.monotonic_ns())
+
+    def _type_one(self) -> Optional[bool]:
+        """Type one number and wait for it; False if it was rejected, None if stopped meanwhile"""
+        done = threading.Event()
+
+        def on_done():
+            with self._condition:
+                done.set()
+                self._condition.notify_all()
+
+        try:
+            if not self._type(on_done):
+                return False
+        except RuntimeError:
+            # The event loop went away underneath us: the session is ending
+            return None
+        with self._condition:
+            while not done.is_set() and not self._stopping:
+                self._condition.wait()
+            if done.is_set():
+                return True
+        # Stopped while the number was queued or being typed: abort it
+        self._cancel()
+        return None
@@ -0,0 +1,39 @@
+import json
+import os
+import socket
+from typing import Any, Dict, List
+
+
+def default_socket_path() -> str:
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime_dir and os.path.isdir(runtime_dir):
+        return os.path.join(runtime_dir, 'autojjs.sock')
+    return f'/tmp/autojjs-{os.getuid()}.sock'
+
+
+def parse_command(words: List[str]) -> Dict[str, Any]:
+    """['set_index', 'index=41'] -> {'cmd': 'set_index', 'index': 41}"""
+    request: Dict[str, Any] = {'cmd': words[0]}
+    for word in words[1:]:
+        name, separator, value = word.partition('=')
+        if not separator:
+            raise ValueError(f"expected name=value, got '{word}'")
+        try:
+            request[name] = json.loads(value)
+        except ValueError:
+            request[name] = value
+    return request
+
+
+def send_request(path: str, request: Dict[str, Any], timeout: float = 30.0) -> Dict[str, Any]:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(path)
+        sock.sendall(json.dumps(request).encode('utf-8') + b'\n')
+        buffer = b''
+        while not buffer.endswith(b'\n'):
+            chunk = sock.recv(65536)
+            if not chunk:
+                raise ConnectionError("daemon closed the connection")
+            buffer += chunk
+    return json.loads(buffer)
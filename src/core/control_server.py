@@ -0,0 +1,223 @@
+import asyncio
+import json
+import os
+import socket
+import threading
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+# Longest accepted request line
+MAX_LINE = 64 * 1024
+
+
+class ControlError(Exception):
+    pass
+
+
+class ControlServer:
+    """Line-delimited JSON control API for NumberFlow on a UNIX-domain socket.
+
+    Each request is one JSON object per line, e.g. {"id": 1, "cmd": "next"},
+    and gets exactly one response line, {"id": 1, "ok": true, "result": ...}
+    or {"id": 1, "ok": false, "error": "..."}. Requests on one connection
+    are answered in order, so clients may pipeline; connections are served
+    concurrently by an asyncio loop on a dedicated thread.
+    """
+
+    def __init__(self, flow, path: str):
+        self.flow = flow
+        self.path = path
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop: Optional[asyncio.Event] = None
+        self._ready = threading.Event()
+        self._error: Optional[BaseException] = None
+        self.clients = 0
+        self._client_tasks: Set[asyncio.Task] = set()
+        self.commands: Dict[str, Callable[[Dict[str, Any]], Awaitable[Any]]] = {
+            'ping': self._cmd_ping,
+            'status': self._cmd_status,
+            'next': self._cmd_next,
+            'previous': self._cmd_previous,
+            'set_index': self._cmd_set_index,
+            'type': self._cmd_type,
+            'start_auto': self._cmd_start_auto,
+            'stop_auto': self._cmd_stop_auto,
+            'pause_auto': self._cmd_pause_auto,
+            'resume_auto': self._cmd_resume_auto,
+            'shutdown': self._cmd_shutdown
+        }
+
+    def start(self):
+        self._remove_stale_socket()
+        self._thread = threading.Thread(target=self._run, name='control-server', daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        if self._error is not None:
+            raise self._error
+
+    def stop(self):
+        loop = self.loop
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(self._stop.set)
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+
+    def _remove_stale_socket(self):
+        if not os.path.exists(self.path):
+            return
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.path)
+        except (ConnectionRefusedError, FileNotFoundError):
+            os.unlink(self.path)
+            return
+        finally:
+            probe.close()
+        raise RuntimeError(f"Control socket {self.path} is already in use")
+
+    def _run(self):
+        try:
+            asyncio.run(self._main())
+        except BaseException as e:
+            self._error = e
+            self._ready.set()
+
+    async def _main(self):
+        self.loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        server = await asyncio.start_unix_server(self._serve_client, path=self.path, limit=MAX_LINE)
+        os.chmod(self.path, 0o600)
+        self._ready.set()
+        try:
+            await self._stop.wait()
+        finally:
+            server.close()
+            # Drop connections still waiting on a reply, e.g. a type the
+            # stopping session will never finish, so their clients see EOF
+            for task in self._client_tasks:
+                task.cancel()
+            await asyncio.gather(*self._client_tasks, return_exceptions=True)
+            # Let the closed transports release their sockets
+            await asyncio.sleep(0)
+            await server.wait_closed()
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+
+    async def _serve_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.clients += 1
+        task = asyncio.current_task()
+        self._client_tasks.add(task)
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    writer.write(b'{"ok": false, "error": "request line too long"}\n')
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                response = await self.handle_line(line)
+                writer.write(json.dumps(response, ensure_ascii=False).encode('utf-8') + b'\n')
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except asyncio.CancelledError:
+            # The server is shutting down
+            pass
+        finally:
+            self._client_tasks.discard(task)
+            self.clients -= 1
+            writer.close()
+
+    async def handle_line(self, line: bytes) -> Dict[str, Any]:
+        request_id = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ControlError("request must be a JSON object")
+            request_id = request.get('id')
+            command = self.commands.get(request.get('cmd'))
+            if command is None:
+                raise ControlError(f"unknown command: {request.get('cmd')!r} "
+                                   f"(expected one of {', '.join(sorted(self.commands))})")
+            result = await command(request)
+        except ControlError as e:
+            return {'id': request_id, 'ok': False, 'error': str(e)}
+        except ValueError as e:
+            return {'id': request_id, 'ok': False, 'error': f"invalid request: {e}"}
+        except Exception as e:
+            return {'id': request_id, 'ok': False, 'error': f"{type(e).__name__}: {e}"}
+        return {'id': request_id, 'ok': True, 'result': result}
+
+    def _status(self) -> Dict[str, Any]:
+        status = self.flow.get_status()
+        status['current_number'] = self.flow.get_current_number()
+        return status
+
+    async def _cmd_ping(self, request: Dict[str, Any]) -> str:
+        return 'pong'
+
+    async def _cmd_status(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        return self._status()
+
+    async def _cmd_next(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        self.flow.next_number()
+        return self._status()
+
+    async def _cmd_previous(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        self.flow.previous_number()
+        return self._status()
+
+    async def _cmd_set_index(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        index = request.get('index')
+        if not isinstance(index, int) or isinstance(index, bool):
+            raise ControlError("set_index needs an integer 'index' (0-based)")
+        if not self.flow.set_index(index):
+            raise ControlError(f"index out of range: {index} (0-{self.flow.language_manager.get_total_numbers() - 1})")
+        return self._status()
+
+    async def _cmd_type(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Type the current number; unless "wait" is false, answer once it has been typed"""
+        loop = self.loop
+        done = loop.create_future()
+
+        def on_done():
+            # Runs on the typing worker, possibly after the server has shut down
+            try:
+                loop.call_soon_threadsafe(lambda: done.done() or done.set_result(True))
+            except RuntimeError:
+                pass
+
+        if not self.flow.request_type(on_done):
+            raise ControlError("typing queue full or session stopped")
+        if request.get('wait', True):
+            await done
+        return self._status()
+
+    async def _cmd_start_auto(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        self.flow.start_auto()
+        return self._status()
+
+    async def _cmd_stop_auto(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        self.flow.stop_auto()
+        return self._status()
+
+    async def _cmd_pause_auto(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        if not self.flow.pause_auto():
+            raise ControlError("automatic typing is not running or already paused")
+        return self._status()
+
+    async def _cmd_resume_auto(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        if not self.flow.resume_auto():
+            raise ControlError("automatic typing is not paused")
+        return self._status()
+
+    async def _cmd_shutdown(self, request: Dict[str, Any]) -> str:
+        # flow.stop() joins this server's thread, so it must run elsewhere;
+        # the delay lets this response go out first
+        self.loop.call_later(0.05, lambda: threading.Thread(target=self.flow.stop, daemon=True).start())
+        return 'stopping'
@@ -0,0 +1,73 @@
+import os
+import time
+from typing import Any, Dict, List, Optional, Set
+
+INPUT_DEVICES = '/proc/bus/input/devices'
+
+
+def list_input_devices() -> List[Dict[str, Any]]:
+    """Devices from /proc/bus/input/devices: name, handlers and the EV capability bits"""
+    devices = []
+    try:
+        with open(INPUT_DEVICES, 'r', encoding='utf-8', errors='replace') as f:
+            blocks = f.read().split('\n\n')
+    except OSError:
+        return devices
+    for block in blocks:
+        device = {'name': '', 'handlers': [], 'ev': 0}
+        for line in block.splitlines():
+            if line.startswith('N: Name='):
+                device['name'] = line[len('N: Name='):].strip().strip('"')
+            elif line.startswith('H: Handlers='):
+                device['handlers'] = line[len('H: Handlers='):].split()
+            elif line.startswith('B: EV='):
+                device['ev'] = int(line[len('B: EV='):].strip() or '0', 16)
+        if device['handlers']:
+            devices.append(device)
+    return devices
+
+
+def list_event_nodes() -> Dict[str, str]:
+    """Map of evdev handler (e.g. 'event7') -> device name, from /proc/bus/input/devices"""
+    nodes = {}
+    for device in list_input_devices():
+        for handler in device['handlers']:
+            if handler.startswith('event'):
+                nodes[handler] = device['name']
+    return nodes
+
+
+def _udev_processed(event: str) -> bool:
+    # udev writes /run/udev/data/c<major>:<minor> once it has handled the node;
+    # compositors (via libinput) only pick devices up after that
+    if not os.path.isdir('/run/udev/data'):
+        return True
+    try:
+        with open(f'/sys/class/input/{event}/dev', 'r') as f:
+            dev = f.read().strip()
+    except OSError:
+        return True
+    return os.path.exists(f'/run/udev/data/c{dev}')
+
+
+def wait_for_event_node(name: str, known: Set[str], timeout: float = 2.0,
+                        settle: float = 0.15, interval: float = 0.01) -> Optional[str]:
+    """Wait for a new evdev node called `name` (not in `known`) to be ready.
+
+    Ready means the node is listed by the kernel, exists under /dev/input,
+    has been processed by udev and has then been left alone for `settle`
+    seconds. Returns the /dev/input path, or None on timeout.
+    """
+    if not os.path.exists(INPUT_DEVICES):
+        return None
+    deadline = time.monotonic() + timeout
+    event = None
+    while time.monotonic() < deadline:
+        if event is None:
+            event = next((node for node, node_name in list_event_nodes().items()
+                          if node_name == name and node not in known), None)
+        if event is not None and os.path.exists(f'/dev/input/{event}') and _udev_processed(event):
+            time.sleep(settle)
+            return f'/dev/input/{event}'
+        time.sleep(interval)
+    return None
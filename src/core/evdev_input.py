@@ -0,0 +1,298 @@
+import errno
+import os
+import select
+import struct
+import threading
+import time
+from typing import Callable, Iterable, List, Optional
+
+from .device_probe import list_input_devices
+
+# struct input_event on 64-bit Linux: struct timeval (sec, usec), type, code, value
+EVENT_FORMAT = 'llHHi'
+EVENT_SIZE = struct.calcsize(EVENT_FORMAT)
+# The same struct with the timestamp skipped, for decoding
+_KEY_FIELDS = struct.Struct(f"{struct.calcsize('ll')}xHHi")
+# Whole events per read; every read and replay write is a multiple of EVENT_SIZE
+READ_SIZE = EVENT_SIZE * 64
+
+EV_SYN = 0x00
+EV_KEY = 0x01
+EV_REP = 0x14
+SYN_REPORT = 0
+# input_event.value for EV_KEY: 0 release, 1 press, 2 autorepeat
+KEY_PRESS = 1
+KEY_CNT = 0x300
+
+
+class EvdevKey:
+    """Stand-in for a pynput key, one shared instance per keycode.
+
+    `char` is set for printable keys and `name` for the rest, using pynput's
+    names, so listener_token() and the key -> action table treat both
+    backends alike. Characters are the unshifted ones of a US layout.
+    """
+    __slots__ = ('code', 'char', 'name')
+
+    def __init__(self, code: int, char: Optional[str] = None, name: Optional[str] = None):
+        self.code = code
+        self.char = char
+        self.name = name
+
+    def __str__(self):
+        return repr(self.char) if self.char else f'Key.{self.name}'
+
+    __repr__ = __str__
+
+
+# linux/input-event-codes.h
+_CHAR_CODES = {
+    2: '1', 3: '2', 4: '3', 5: '4', 6: '5', 7: '6', 8: '7', 9: '8', 10: '9', 11: '0',
+    12: '-', 13: '=', 16: 'q', 17: 'w', 18: 'e', 19: 'r', 20: 't', 21: 'y', 22: 'u',
+    23: 'i', 24: 'o', 25: 'p', 26: '[', 27: ']', 30: 'a', 31: 's', 32: 'd', 33: 'f',
+    34: 'g', 35: 'h', 36: 'j', 37: 'k', 38: 'l', 39: ';', 40: "'", 41: '`', 43: '\\',
+    44: 'z', 45: 'x', 46: 'c', 47: 'v', 48: 'b', 49: 'n', 50: 'm', 51: ',', 52: '.',
+    53: '/', 55: '*', 74: '-', 78: '+', 83: '.', 98: '/'
+}
+_NAMED_CODES = {
+    1: 'esc', 14: 'backspace', 15: 'tab', 28: 'enter', 29: 'ctrl', 42: 'shift', 54: 'shift_r',
+    56: 'alt', 57: 'space', 58: 'caps_lock', 59: 'f1', 60: 'f2', 61: 'f3', 62: 'f4', 63: 'f5',
+    64: 'f6', 65: 'f7', 66: 'f8', 67: 'f9', 68: 'f10', 69: 'num_lock', 70: 'scroll_lock',
+    87: 'f11', 88: 'f12', 96: 'enter', 97: 'ctrl_r', 100: 'alt_r', 102: 'home', 103: 'up',
+    104: 'page_up', 105: 'left', 106: 'right', 107: 'end', 108: 'down', 109: 'page_down',
+    110: 'insert', 111: 'delete', 119: 'pause', 125: 'cmd', 126: 'cmd_r', 127: 'menu'
+}
+# Keypad digits
+_CHAR_CODES.update({71: '7', 72: '8', 73: '9', 75: '4', 76: '5', 77: '6', 79: '1', 80: '2', 81: '3', 82: '0'})
+
+# Keycode -> key, indexed directly
+KEYMAP: List[Optional[EvdevKey]] = [None] * KEY_CNT
+for _code, _char in _CHAR_CODES.items():
+    KEYMAP[_code] = EvdevKey(_code, char=_char)
+for _code, _name in _NAMED_CODES.items():
+    KEYMAP[_code] = EvdevKey(_code, name=_name)
+# pynput's aliases for the left-hand modifiers
+_ALIASES = {'shift_l': 'shift', 'ctrl_l': 'ctrl', 'alt_l': 'alt', 'cmd_l': 'cmd', 'alt_gr': 'alt_r'}
+
+
+def token_codes(token: str) -> List[int]:
+    """Keycodes that produce a listener token (lowercase char or special key name)"""
+    token = _ALIASES.get(token, token)
+    return [key.code for key in KEYMAP if key is not None and (key.char or key.name) == token]
+
+
+class EventDevice:
+    """An opened /dev/input/event* node"""
+
+    def __init__(self, path: str, name: str = ''):
+        self.path = path
+        self.name = name or path
+        self.fd = os.open(path, os.O_RDONLY | os.O_NONBLOCK | os.O_CLOEXEC)
+
+    def fileno(self) -> int:
+        return self.fd
+
+    def start(self):
+        pass
+
+    def close(self):
+        os.close(self.fd)
+
+
+class ReplaySource:
+    """Plays a recorded evdev stream back through a pipe, as if it were a device.
+
+    A recording is raw input_event structs, e.g. `cat /dev/input/event3 >
+    keys.bin`. Each SYN_REPORT group is written when its recorded timestamp
+    comes up, scaled by `speed` (0 writes everything at once).
+    """
+
+    def __init__(self, path: str, speed: float = 1.0):
+        with open(path, 'rb') as f:
+            data = f.read()
+        usable = len(data) - len(data) % EVENT_SIZE
+        self.path = path
+        self.name = f'replay:{os.path.basename(path)}'
+        self.speed = speed
+        self.groups = self._split(data[:usable])
+        self._read_fd, self._write_fd = os.pipe2(os.O_NONBLOCK | os.O_CLOEXEC)
+        os.set_blocking(self._write_fd, True)
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    @staticmethod
+    def _split(data: bytes) -> List[tuple]:
+        """(timestamp, bytes) per SYN_REPORT group"""
+        groups = []
+        start = 0
+        for offset in range(0, len(data), EVENT_SIZE):
+            sec, usec, type_, code, _ = struct.unpack_from(EVENT_FORMAT, data, offset)
+            if type_ == EV_SYN and code == SYN_REPORT or offset + EVENT_SIZE == len(data):
+                groups.append((sec + usec / 1e6, data[start:offset + EVENT_SIZE]))
+                start = offset + EVENT_SIZE
+        return groups
+
+    def fileno(self) -> int:
+        return self._read_fd
+
+    def start(self):
+        self._thread = threading.Thread(target=self._play, name='evdev-replay', daemon=True)
+        self._thread.start()
+
+    def _play(self):
+        try:
+            if self.groups:
+                first = self.groups[0][0]
+                started = time.monotonic()
+                for timestamp, chunk in self.groups:
+                    if self.speed > 0:
+                        delay = started + (timestamp - first) / self.speed - time.monotonic()
+                        if delay > 0 and self._stop.wait(delay):
+                            return
+                    os.write(self._write_fd, chunk)
+        except OSError:
+            pass
+        finally:
+            # EOF tells the listener the recording is over
+            os.close(self._write_fd)
+
+    def close(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+        else:
+            os.close(self._write_fd)
+        os.close(self._read_fd)
+
+
+def find_keyboards(exclude_names=(), exclude_paths=()) -> List[EventDevice]:
+    """Open every keyboard-like evdev node (EV_KEY with autorepeat), skipping our own devices"""
+    devices = []
+    for device in list_input_devices():
+        if device['name'] in exclude_names or not device['ev'] & (1 << EV_KEY) or not device['ev'] & (1 << EV_REP):
+            continue
+        for handler in device['handlers']:
+            path = f'/dev/input/{handler}'
+            if handler.startswith('event') and path not in exclude_paths:
+                devices.append(EventDevice(path, device['name']))
+    return devices
+
+
+class EvdevListener(threading.Thread):
+    """Global key listener reading evdev nodes directly, with pynput's Listener interface.
+
+    One epoll loop serves every source. Key presses are decoded straight
+    from the raw structs: releases, autorepeats and keys not bound to an
+    action are dropped by a flag table indexed by keycode before any Python
+    callback runs, and bound keys are passed as the shared EvdevKey for
+    their code. As with pynput, on_press returning False stops the listener.
+    """
+
+    def __init__(self, on_press: Callable, sources: List, snapshot_source: Optional[Callable] = None,
+                 extra_tokens: Iterable[str] = ()):
+        super().__init__(name='evdev-listener', daemon=True)
+        self.on_press = on_press
+        self.sources = {source.fileno(): source for source in sources}
+        # Returns the current ConfigSnapshot; without one every known key is delivered
+        self.snapshot_source = snapshot_source
+        # Tokens delivered even when unbound (the digits of a jump capture)
+        self.extra_tokens = frozenset(extra_tokens)
+        self._snapshot = None
+        self.wanted = bytearray(KEY_CNT)
+        self._ready = threading.Event()
+        self._running = True
+        self._wake_read, self._wake_write = os.pipe2(os.O_NONBLOCK | os.O_CLOEXEC)
+        # Held around writes to the wake pipe and its close, which run() does on the way out
+        self._wake_lock = threading.Lock()
+        self.events = 0
+        self.delivered = 0
+        self._refresh_wanted()
+
+    def _refresh_wanted(self):
+        snapshot = self.snapshot_source() if self.snapshot_source is not None else None
+        if snapshot is self._snapshot and snapshot is not None:
+            return
+        self._snapshot = snapshot
+        wanted = bytearray(KEY_CNT)
+        if snapshot is None or snapshot.show_keys:
+            for key in KEYMAP:
+                if key is not None:
+                    wanted[key.code] = 1
+        else:
+            for token in self.extra_tokens.union(snapshot.key_actions()):
+                for code in token_codes(token):
+                    wanted[code] = 1
+        self.wanted = wanted
+
+    def wait(self):
+        self._ready.wait()
+
+    def stop(self):
+        self._running = False
+        with self._wake_lock:
+            if self._wake_write is None:
+                return
+            try:
+                os.write(self._wake_write, b'\0')
+            except OSError:
+                pass
+
+    def run(self):
+        poller = select.epoll()
+        try:
+            poller.register(self._wake_read, select.EPOLLIN)
+            for fd in self.sources:
+                poller.register(fd, select.EPOLLIN)
+            for source in self.sources.values():
+                source.start()
+            self._ready.set()
+            self._loop(poller)
+            if self._running and not self.sources:
+                print("\nNo input devices left - global keys stopped")
+        finally:
+            self._ready.set()
+            poller.close()
+            for source in self.sources.values():
+                try:
+                    source.close()
+                except OSError:
+                    pass
+            with self._wake_lock:
+                os.close(self._wake_read)
+                os.close(self._wake_write)
+                self._wake_read = self._wake_write = None
+
+    def _loop(self, poller):
+        while self._running and self.sources:
+            for fd, _ in poller.poll():
+                if fd == self._wake_read:
+                    return
+                try:
+                    data = os.read(fd, READ_SIZE)
+                except BlockingIOError:
+                    continue
+                except OSError as e:
+                    # ENODEV: the keyboard was unplugged
+                    if e.errno != errno.ENODEV:
+                        raise
+                    data = b''
+                if not data:
+                    poller.unregister(fd)
+                    self.sources.pop(fd).close()
+                    continue
+                if not self.feed(data):
+                    return
+
+    def feed(self, data: bytes) -> bool:
+        """Decode whole input_event structs and dispatch the wanted presses; False once stopped"""
+        self._refresh_wanted()
+        wanted = self.wanted
+        keymap = KEYMAP
+        on_press = self.on_press
+        self.events += len(data) // EVENT_SIZE
+        for type_, code, value in _KEY_FIELDS.iter_unpack(data):
+            if type_ == EV_KEY and value == KEY_PRESS and code < KEY_CNT and wanted[code]:
+                self.delivered += 1
+                if on_press(keymap[code]) is False:
+                    return False
+        return True
@@ -0,0 +1,65 @@
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Mapping, Optional
+
+# How long an emitted key press may take to show up in the global listener
+DEFAULT_WINDOW = 0.25
+
+
+class InjectionFilter:
+    """Recognizes key events that our own virtual device generated.
+
+    The emitter records every key press it sends. When the global listener
+    sees a press of the same key within `window` seconds, that event is
+    consumed as self-injected instead of being handled. Each recorded press
+    matches at most one listener event, so a physical press of a key we are
+    not currently typing is never swallowed.
+    """
+
+    def __init__(self, window: float = DEFAULT_WINDOW):
+        self.window = window
+        self._pending: Dict[Any, Deque[float]] = {}
+        # Listener token (lowercase char or special key name) -> emitted key
+        self._tokens: Mapping[str, Any] = {}
+        self._lock = threading.Lock()
+        self.filtered = 0
+
+    def set_tokens(self, tokens: Mapping[str, Any]):
+        self._tokens = tokens
+
+    def note_press(self, key: Any):
+        expires = time.monotonic() + self.window
+        with self._lock:
+            pending = self._pending.get(key)
+            if pending is None:
+                pending = self._pending[key] = deque()
+            pending.append(expires)
+
+    def consume(self, token: Optional[str]) -> bool:
+        key = self._tokens.get(token)
+        if key is None:
+            return False
+        with self._lock:
+            pending = self._pending.get(key)
+            if not pending:
+                return False
+            now = time.monotonic()
+            while pending and pending[0] < now:
+                pending.popleft()
+            if not pending:
+                return False
+            pending.popleft()
+            self.filtered += 1
+            return True
+
+    def clear(self):
+        with self._lock:
+            self._pending.clear()
+
+
+def listener_token(key: Any) -> Optional[str]:
+    char = getattr(key, 'char', None)
+    if char:
+        return char.lower()
+    return getattr(key, 'name', None)
@@ -0,0 +1,79 @@
+import threading
+import time
+from typing import Optional, Tuple
+
+DIGITS = frozenset('0123456789')
+# Listener tokens a capture reacts to; everything else keeps its usual meaning
+CAPTURE_TOKENS = DIGITS | {'enter', 'esc', 'backspace'}
+
+
+class JumpCapture:
+    """Entry of a jump target from global key presses, one key at a time.
+
+    begin() opens a capture; digits accumulate, backspace drops the last
+    one, enter commits and esc cancels. A capture with no key for `timeout`
+    seconds expires. Nothing here blocks, so the listener keeps handling
+    every other hotkey while a number is being entered.
+    """
+
+    def __init__(self, timeout: float = 5.0, max_digits: int = 10):
+        self.timeout = timeout
+        self.max_digits = max_digits
+        self.active = False
+        self.digits = ''
+        self.deadline = 0.0
+        # Bumped by every begin(), so a stale timeout cannot end a newer capture
+        self.generation = 0
+        self._lock = threading.Lock()
+
+    def begin(self) -> int:
+        with self._lock:
+            self.generation += 1
+            self.active = True
+            self.digits = ''
+            self.deadline = time.monotonic() + self.timeout
+            return self.generation
+
+    def feed(self, token: Optional[str]) -> Optional[Tuple[str, str]]:
+        """Apply one key press to an open capture.
+
+        Returns (state, digits), state being 'digit', 'commit', 'cancel' or
+        'expired', or None if the key is not part of the capture and should
+        be handled as usual.
+        """
+        if token not in CAPTURE_TOKENS:
+            return None
+        with self._lock:
+            if not self.active:
+                return None
+            if time.monotonic() >= self.deadline:
+                self.active = False
+                return ('expired', self.digits)
+            if token in DIGITS:
+                if len(self.digits) < self.max_digits:
+                    self.digits += token
+            elif token == 'backspace':
+                self.digits = self.digits[:-1]
+            else:
+                self.active = False
+                return ('commit' if token == 'enter' and self.digits else 'cancel', self.digits)
+            self.deadline = time.monotonic() + self.timeout
+            return ('digit', self.digits)
+
+    def remaining(self, generation: int) -> Optional[float]:
+        """Seconds until capture `generation` expires, or None if it already ended"""
+        with self._lock:
+            if not self.active or generation != self.generation:
+                return None
+            return max(0.0, self.deadline - time.monotonic())
+
+    def expire(self, generation: int) -> bool:
+        with self._lock:
+            if not self.active or generation != self.generation or time.monotonic() < self.deadline:
+                return False
+            self.active = False
+            return True
+
+    def cancel(self):
+        with self._lock:
+            self.active = False
@@ -1,35 +1,210 @@
 import time
 import threading
-from typing import Optional, Dict, Any
+from contextlib import contextmanager
+from types import MappingProxyType
+from typing import Optional, Callable, Dict, Any, List, Mapping, Tuple
 
-try:
-    import uinput
-    UINPUT_AVAILABLE = True
-except ImportError:
-    uinput = None
-    UINPUT_AVAILABLE = False
+from .keystroke_plan import KeystrokePlan, LINE_DELAY, PlanCache, compile_plan, compile_text
+from . import tracing
+from .device_probe import list_event_nodes, wait_for_event_node
+from .injection_filter import InjectionFilter
+from .pacing import LineTiming, PacingEngine, PacingReport
+from .rate_limiter import RateLimiter
 
-try:
-    from pynput import keyboard
-    PYNPUT_AVAILABLE = True
-except ImportError:
-    keyboard = None
-    PYNPUT_AVAILABLE = False
+# python-uinput is imported on first use (see load_uinput) so that commands
+# which never type, like --list-languages, do not pay for it at startup
+uinput = None
+UINPUT_AVAILABLE = None
+
+
+def load_uinput() -> bool:
+    global uinput, UINPUT_AVAILABLE
+    if UINPUT_AVAILABLE is None:
+        try:
+            import uinput as uinput_module
+            uinput = uinput_module
+            UINPUT_AVAILABLE = True
+        except ImportError:
+            UINPUT_AVAILABLE = False
+    return UINPUT_AVAILABLE
+
+
+# Name of our virtual keyboard, used to find its evdev node
+DEVICE_NAME = 'autojjs-keyboard'
+# Compiled type_text() plans kept for reuse
+TEXT_PLAN_CACHE_SIZE = 64
+
+
+# Basic ASCII mapping
+KEY_MAP = {
+    'A': 'KEY_A', 'B': 'KEY_B', 'C': 'KEY_C', 'D': 'KEY_D',
+    'E': 'KEY_E', 'F': 'KEY_F', 'G': 'KEY_G', 'H': 'KEY_H',
+    'I': 'KEY_I', 'J': 'KEY_J', 'K': 'KEY_K', 'L': 'KEY_L',
+    'M': 'KEY_M', 'N': 'KEY_N', 'O': 'KEY_O', 'P': 'KEY_P',
+    'Q': 'KEY_Q', 'R': 'KEY_R', 'S': 'KEY_S', 'T': 'KEY_T',
+    'U': 'KEY_U', 'V': 'KEY_V', 'W': 'KEY_W', 'X': 'KEY_X',
+    'Y': 'KEY_Y', 'Z': 'KEY_Z',
+    '0': 'KEY_0', '1': 'KEY_1', '2': 'KEY_2', '3': 'KEY_3',
+    '4': 'KEY_4', '5': 'KEY_5', '6': 'KEY_6', '7': 'KEY_7',
+    '8': 'KEY_8', '9': 'KEY_9',
+    '-': 'KEY_MINUS', '=': 'KEY_EQUAL', '[': 'KEY_LEFTBRACE',
+    ']': 'KEY_RIGHTBRACE', ';': 'KEY_SEMICOLON', "'": 'KEY_APOSTROPHE',
+    '`': 'KEY_GRAVE', '\\': 'KEY_BACKSLASH', ',': 'KEY_COMMA',
+    '.': 'KEY_DOT', '!': 'KEY_1', '?': 'KEY_SLASH'
+}
+
+# International character mapping - these need special handling
+INTERNATIONAL_MAP = {
+    'Á': ('KEY_A', True),    # A + acute accent (shift)
+    'À': ('KEY_A', True),    # A + grave accent (shift)
+    'Â': ('KEY_A', True),    # A + circumflex (shift)
+    'Ã': ('KEY_A', True),    # A + tilde (shift)
+    'Ä': ('KEY_A', True),    # A + diaeresis (shift)
+    'É': ('KEY_E', True),    # E + acute accent (shift)
+    'È': ('KEY_E', True),    # E + grave accent (shift)
+    'Ê': ('KEY_E', True),    # E + circumflex (shift)
+    'Í': ('KEY_I', True),    # I + acute accent (shift)
+    'Ì': ('KEY_I', True),    # I + grave accent (shift)
+    'Î': ('KEY_I', True),    # I + circumflex (shift)
+    'Ó': ('KEY_O', True),    # O + acute accent (shift)
+    'Ò': ('KEY_O', True),    # O + grave accent (shift)
+    'Ô': ('KEY_O', True),    # O + circumflex (shift)
+    'Õ': ('KEY_O', True),    # O + tilde (shift)
+    'Ö': ('KEY_O', True),    # O + diaeresis (shift)
+    'Ú': ('KEY_U', True),    # U + acute accent (shift)
+    'Ù': ('KEY_U', True),    # U + grave accent (shift)
+    'Û': ('KEY_U', True),    # U + circumflex (shift)
+    'Ü': ('KEY_U', True),    # U + diaeresis (shift)
+    'Ç': ('KEY_C', True),    # C + cedilla (shift)
+    'Ñ': ('KEY_N', True),    # N + tilde (shift)
+}
+
+# International character ASCII fallback mapping
+# Maps accented characters to their ASCII equivalents
+INTERNATIONAL_FALLBACKS = {
+    'á': 'a', 'à': 'a', 'â': 'a', 'ã': 'a', 'ä': 'ae',
+    'Á': 'A', 'À': 'A', 'Â': 'A', 'Ã': 'A', 'Ä': 'AE',
+    'é': 'e', 'è': 'e', 'ê': 'e', 'ë': 'e',
+    'É': 'E', 'È': 'E', 'Ê': 'E', 'Ë': 'E',
+    'í': 'i', 'ì': 'i', 'î': 'i', 'ï': 'i',
+    'Í': 'I', 'Ì': 'I', 'Î': 'I', 'Ï': 'I',
+    'ó': 'o', 'ò': 'o', 'ô': 'o', 'õ': 'o', 'ö': 'oe',
+    'Ó': 'O', 'Ò': 'O', 'Ô': 'O', 'Õ': 'O', 'Ö': 'OE',
+    'ú': 'u', 'ù': 'u', 'û': 'u', 'ü': 'ue',
+    'Ú': 'U', 'Ù': 'U', 'Û': 'U', 'Ü': 'UE',
+    'ç': 'c', 'Ç': 'C',
+    'ñ': 'n', 'Ñ': 'N',
+    'ý': 'y', 'ÿ': 'y',
+    'Ý': 'Y', 'Ÿ': 'Y',
+}
+
+# Characters that need shift even though they are not uppercase letters
+SHIFTED_SYMBOLS = frozenset('!?')
+
+# A keystroke is (uinput key, needs shift); one character may expand to several
+Keystroke = Tuple[Any, bool]
+
+
+def _resolve_char_key(keys: Any, char: str) -> Optional[Any]:
+    # Check for international characters first
+    if char in INTERNATIONAL_MAP:
+        base_key, needs_shift = INTERNATIONAL_MAP[char]
+        if hasattr(keys, base_key):
+            return getattr(keys, base_key)
+    
+    # Check basic ASCII mapping
+    key_name = KEY_MAP.get(char.upper())
+    if key_name and hasattr(keys, key_name):
+        return getattr(keys, key_name)
+    
+    # Try lowercase version
+    key_name = KEY_MAP.get(char.lower())
+    if key_name and hasattr(keys, key_name):
+        return getattr(keys, key_name)
+    
+    return None
+
+
+def _direct_keystroke(keys: Any, char: str) -> Optional[Keystroke]:
+    key = _resolve_char_key(keys, char)
+    if not key:
+        return None
+    shift_needed = (char.isupper() and char.isalpha()) or char in SHIFTED_SYMBOLS
+    return (key, shift_needed)
+
+
+def compile_keymap(keys: Any) -> Mapping[str, Tuple[Keystroke, ...]]:
+    """Build the immutable char -> keystrokes table used on the typing hot path.
+    
+    `keys` is the uinput module (or anything exposing the same KEY_* names).
+    Characters without a direct key fall back to their ASCII equivalents.
+    """
+    table: Dict[str, Tuple[Keystroke, ...]] = {}
+    
+    if hasattr(keys, 'KEY_SPACE'):
+        table[' '] = ((keys.KEY_SPACE, False),)
+    
+    candidates = set(KEY_MAP) | {char.lower() for char in KEY_MAP} | set(INTERNATIONAL_MAP)
+    for char in candidates:
+        stroke = _direct_keystroke(keys, char)
+        if stroke:
+            table[char] = (stroke,)
+    
+    for char, fallback in INTERNATIONAL_FALLBACKS.items():
+        if char in table:
+            continue
+        strokes = tuple(
+            stroke for stroke in (_direct_keystroke(keys, c) for c in fallback) if stroke
+        )
+        if strokes:
+            table[char] = strokes
+    
+    return MappingProxyType(table)
 
 
 class KeyboardSimulator:
-    def __init__(self, debug_level=0):
+    def __init__(self, debug_level=0, spin_threshold_us: int = 500,
+                 device: Any = None, keys: Any = None,
+                 ready_timeout: float = 2.0, settle_ms: int = 150):
+        # `device` and `keys` substitute for a uinput.Device and the uinput
+        # module's KEY_* constants, e.g. a recording device in the benchmarks
         self.device = None
+        self.keys = keys
+        # Set once the compositor can be expected to see the device; events
+        # emitted before that are silently lost
+        self.device_ready = threading.Event()
+        self.device_node: Optional[str] = None
+        self.ready_timeout = ready_timeout
+        self.settle_ms = settle_ms
         self._lock = threading.Lock()
         self.debug_level = debug_level
+        self.pacer = PacingEngine(spin_threshold_us)
+        # Lets the global listener ignore the key presses we emit ourselves
+        self.injection_filter = InjectionFilter()
+        # Holds line submissions back to the chat's message limits, if set
+        self.rate_limiter: Optional[RateLimiter] = None
+        # Called once after the next emitted event (used by the startup benchmark)
+        self.first_emit_callback: Optional[Callable[[], None]] = None
+        self.keymap: Mapping[str, Tuple[Keystroke, ...]] = MappingProxyType({})
+        self._fallback_chars = frozenset()
+        self._shift_key = None
+        # type_text() plans by (text, char_delay), so repeated text is only compiled once
+        self._text_plans = PlanCache(TEXT_PLAN_CACHE_SIZE)
+        
+        if device is not None:
+            self.device = device
+            self.device_ready.set()
+            self.rebuild_keymap()
+            return
         
-        if not UINPUT_AVAILABLE:
+        if not load_uinput():
             print("Warning: python-uinput not available. Running in debug mode.")
             return
         
         self._initialize_device()
     
     def _initialize_device(self):
+        known_nodes = set(list_event_nodes())
         try:
             self.device = uinput.Device([
                 uinput.KEY_ENTER,
@@ -43,7 +218,11 @@ class KeyboardSimulator:
                 uinput.KEY_ESC,
                 uinput.KEY_LEFTSHIFT,
                 *self._get_all_char_keys()
-            ])
+            ], name=DEVICE_NAME)
+            self.keys = uinput
+            self.rebuild_keymap()
+            threading.Thread(target=self._probe_device, args=(known_nodes,),
+                             name='device-probe', daemon=True).start()
         except PermissionError:
             raise PermissionError(
                 "Failed to create uinput device. "
@@ -53,6 +232,16 @@ class KeyboardSimulator:
         except Exception as e:
             raise RuntimeError(f"Failed to initialize keyboard: {e}")
     
+    def _probe_device(self, known_nodes):
+        started = time.monotonic()
+        self.device_node = wait_for_event_node(DEVICE_NAME, known_nodes, self.ready_timeout, self.settle_ms / 1000)
+        self.device_ready.set()
+        if self.debug_level >= 1:
+            if self.device_node:
+                print(f"[DEBUG1] Device ready at {self.device_node} after {(time.monotonic() - started) * 1e3:.0f}ms")
+            else:
+                print("[DEBUG1] Could not confirm the virtual keyboard's evdev node, typing anyway")
+    
     def _get_all_char_keys(self):
         char_keys = []
         
@@ -77,185 +266,90 @@ class KeyboardSimulator:
         
         return char_keys
     
-    def _get_key_for_char(self, char: str) -> Optional[int]:
-        char_upper = char.upper()
-        
-        # Basic ASCII mapping
-        key_map = {
-            'A': 'KEY_A', 'B': 'KEY_B', 'C': 'KEY_C', 'D': 'KEY_D',
-            'E': 'KEY_E', 'F': 'KEY_F', 'G': 'KEY_G', 'H': 'KEY_H',
-            'I': 'KEY_I', 'J': 'KEY_J', 'K': 'KEY_K', 'L': 'KEY_L',
-            'M': 'KEY_M', 'N': 'KEY_N', 'O': 'KEY_O', 'P': 'KEY_P',
-            'Q': 'KEY_Q', 'R': 'KEY_R', 'S': 'KEY_S', 'T': 'KEY_T',
-            'U': 'KEY_U', 'V': 'KEY_V', 'W': 'KEY_W', 'X': 'KEY_X',
-            'Y': 'KEY_Y', 'Z': 'KEY_Z',
-            '0': 'KEY_0', '1': 'KEY_1', '2': 'KEY_2', '3': 'KEY_3',
-            '4': 'KEY_4', '5': 'KEY_5', '6': 'KEY_6', '7': 'KEY_7',
-            '8': 'KEY_8', '9': 'KEY_9',
-            '-': 'KEY_MINUS', '=': 'KEY_EQUAL', '[': 'KEY_LEFTBRACE',
-            ']': 'KEY_RIGHTBRACE', ';': 'KEY_SEMICOLON', "'": 'KEY_APOSTROPHE',
-            '`': 'KEY_GRAVE', '\\': 'KEY_BACKSLASH', ',': 'KEY_COMMA',
-            '.': 'KEY_DOT', '!': 'KEY_1', '?': 'KEY_SLASH'
-        }
-        
-        # International character mapping - these need special handling
-        international_map = {
-            'Á': ('KEY_A', True),    # A + acute accent (shift)
-            'À': ('KEY_A', True),    # A + grave accent (shift)
-            'Â': ('KEY_A', True),    # A + circumflex (shift)
-            'Ã': ('KEY_A', True),    # A + tilde (shift)
-            'Ä': ('KEY_A', True),    # A + diaeresis (shift)
-            'É': ('KEY_E', True),    # E + acute accent (shift)
-            'È': ('KEY_E', True),    # E + grave accent (shift)
-            'Ê': ('KEY_E', True),    # E + circumflex (shift)
-            'Í': ('KEY_I', True),    # I + acute accent (shift)
-            'Ì': ('KEY_I', True),    # I + grave accent (shift)
-            'Î': ('KEY_I', True),    # I + circumflex (shift)
-            'Ó': ('KEY_O', True),    # O + acute accent (shift)
-            'Ò': ('KEY_O', True),    # O + grave accent (shift)
-            'Ô': ('KEY_O', True),    # O + circumflex (shift)
-            'Õ': ('KEY_O', True),    # O + tilde (shift)
-            'Ö': ('KEY_O', True),    # O + diaeresis (shift)
-            'Ú': ('KEY_U', True),    # U + acute accent (shift)
-            'Ù': ('KEY_U', True),    # U + grave accent (shift)
-            'Û': ('KEY_U', True),    # U + circumflex (shift)
-            'Ü': ('KEY_U', True),    # U + diaeresis (shift)
-            'Ç': ('KEY_C', True),    # C + cedilla (shift)
-            'Ñ': ('KEY_N', True),    # N + tilde (shift)
-        }
+    def rebuild_keymap(self):
+        """Recompile the char -> keystroke table, e.g. after a layout change"""
+        keys = self.keys
+        self.keymap = compile_keymap(keys)
+        self._text_plans.clear()
+        self._fallback_chars = frozenset(
+            char for char in INTERNATIONAL_FALLBACKS if _resolve_char_key(keys, char) is None
+        )
+        self._shift_key = keys.KEY_LEFTSHIFT
         
-        # Check for international characters first
-        if char in international_map:
-            base_key, needs_shift = international_map[char]
-            if hasattr(uinput, base_key):
-                return getattr(uinput, base_key)
-        
-        # Check basic ASCII mapping
-        key_name = key_map.get(char_upper)
-        if key_name and hasattr(uinput, key_name):
-            return getattr(uinput, key_name)
-        
-        # Try lowercase version
-        key_name = key_map.get(char.lower())
-        if key_name and hasattr(uinput, key_name):
-            return getattr(uinput, key_name)
-        
-        return None
+        tokens = {char.lower(): strokes[0][0] for char, strokes in self.keymap.items() if len(strokes) == 1}
+        tokens.update({
+            'space': keys.KEY_SPACE,
+            'enter': keys.KEY_ENTER,
+            'shift': keys.KEY_LEFTSHIFT,
+            '/': keys.KEY_SLASH
+        })
+        self.injection_filter.set_tokens(tokens)
     
-    def _type_char_with_fallback(self, char: str, char_delay: float) -> bool:
-        """Type a character with international character support and fallback"""
-        # Try direct mapping first
-        key = self._get_key_for_char(char)
-        if key:
-            shift_needed = char.isupper() and char.isalpha()
-            
-            # Special handling for ! and ?
-            if char in ['!', '?']:
-                shift_needed = True
-            
-            if shift_needed:
-                self.device.emit(uinput.KEY_LEFTSHIFT, 1)
-            
-            self.device.emit(key, 1)
-            self.device.emit(key, 0)
-            
-            if shift_needed:
-                self.device.emit(uinput.KEY_LEFTSHIFT, 0)
-            time.sleep(char_delay)
-            return True
-        
-        # International character ASCII fallback mapping
-        # Maps accented characters to their ASCII equivalents
-        international_fallbacks = {
-            'á': 'a', 'à': 'a', 'â': 'a', 'ã': 'a', 'ä': 'a',
-            'Á': 'A', 'À': 'A', 'Â': 'A', 'Ã': 'A', 'Ä': 'A',
-            'é': 'e', 'è': 'e', 'ê': 'e', 'ë': 'e',
-            'É': 'E', 'È': 'E', 'Ê': 'E', 'Ë': 'E',
-            'í': 'i', 'ì': 'i', 'î': 'i', 'ï': 'i',
-            'Í': 'I', 'Ì': 'I', 'Î': 'I', 'Ï': 'I',
-            'ó': 'o', 'ò': 'o', 'ô': 'o', 'õ': 'o', 'ö': 'o',
-            'Ó': 'O', 'Ò': 'O', 'Ô': 'O', 'Õ': 'O', 'Ö': 'O',
-            'ú': 'u', 'ù': 'u', 'û': 'u', 'ü': 'u',
-            'Ú': 'U', 'Ù': 'U', 'Û': 'U', 'Ü': 'U',
-            'ç': 'c', 'Ç': 'C',
-            'ñ': 'n', 'Ñ': 'N',
-            'ý': 'y', 'ÿ': 'y',
-            'Ý': 'Y', 'Ÿ': 'Y',
-            'â': 'a', 'ê': 'e', 'î': 'i', 'ô': 'o', 'û': 'u',
-            'Â': 'A', 'Ê': 'E', 'Î': 'I', 'Ô': 'O', 'Û': 'U',
-            'ä': 'ae', 'ö': 'oe', 'ü': 'ue',
-            'Ä': 'AE', 'Ö': 'OE', 'Ü': 'UE',
-        }
-        
-        # Check if character needs fallback and international support is enabled
-        # Note: international_fallbacks is always enabled by default
-        if char in international_fallbacks:
-            fallback_char = international_fallbacks[char]
-            if self.debug_level >= 2:  # Simple debug check
-                print(f"[DEBUG2] International char '{char}' -> '{fallback_char}'")
-            
-            # If fallback is multiple characters, type each one
-            for fallback_char_single in fallback_char:
-                key = self._get_key_for_char(fallback_char_single)
-                if key:
-                    shift_needed = fallback_char_single.isupper() and fallback_char_single.isalpha()
-                    
-                    if shift_needed:
-                        self.device.emit(uinput.KEY_LEFTSHIFT, 1)
-                    
-                    self.device.emit(key, 1)
-                    self.device.emit(key, 0)
-                    
-                    if shift_needed:
-                        self.device.emit(uinput.KEY_LEFTSHIFT, 0)
-                    time.sleep(char_delay)
-                    return True
-            return True
-        
-        # Unknown character - try to skip with warning
-        print(f"Warning: Cannot type character '{char}' - skipping")
-        return False
+    def _get_key_for_char(self, char: str) -> Optional[Any]:
+        strokes = self.keymap.get(char)
+        if strokes:
+            return strokes[0][0]
+        return None
     
     def type_text(self, text: str, char_delay: float = 0.05):
-        if not UINPUT_AVAILABLE or self.device is None:
+        if self.device is None:
             print(f"DEBUG: Would type: {text}")
             return
-            
-        with self._lock:
+        
+        if self.debug_level >= 2:
             for char in text:
-                if char == ' ':
-                    self.device.emit(uinput.KEY_SPACE, 1)
-                    self.device.emit(uinput.KEY_SPACE, 0)
-                    time.sleep(char_delay)
-                else:
-                    self._type_char_with_fallback(char, char_delay)
+                if char in self._fallback_chars:
+                    print(f"[DEBUG2] International char '{char}' -> '{INTERNATIONAL_FALLBACKS[char]}'")
+        
+        key = (text, char_delay)
+        plan = self._text_plans.get(key)
+        if plan is None:
+            plan = compile_text(text, self.keymap, self.keys, char_delay)
+            self._text_plans.put(key, plan)
+        self.replay(plan)
     
     def press_key(self, key: int, delay: float = 0.1):
-        if not UINPUT_AVAILABLE or self.device is None:
+        if self.device is None:
             print(f"DEBUG: Would press key: {key}")
+            self._notify_debug_emit()
             return
             
-        with self._lock:
-            self.device.emit(key, 1)
-            self.device.emit(key, 0)
+        with self._locked():
+            emit = self._emitter()
+            emit(key, 1)
+            emit(key, 0)
             time.sleep(delay)
     
+    def tap_shift(self):
+        if self.device is not None:
+            self.press_key(self.keys.KEY_LEFTSHIFT, 0)
+        else:
+            self.press_key('shift', 0)
+    
+    def _notify_debug_emit(self):
+        # Without a device, "would emit" counts as the first event
+        callback, self.first_emit_callback = self.first_emit_callback, None
+        if callback is not None:
+            callback()
+    
     def press_enter(self, delay: float = 0.2):
-        if UINPUT_AVAILABLE and self.device is not None:
-            self.press_key(uinput.KEY_ENTER, delay)
+        if self.rate_limiter:
+            self.rate_limiter.acquire()
+        if self.device is not None:
+            self.press_key(self.keys.KEY_ENTER, delay)
         else:
             print("DEBUG: Would press Enter")
     
     def press_space(self, delay: float = 0.2):
-        if UINPUT_AVAILABLE and self.device is not None:
-            self.press_key(uinput.KEY_SPACE, delay)
+        if self.device is not None:
+            self.press_key(self.keys.KEY_SPACE, delay)
         else:
             print("DEBUG: Would press Space")
     
     def press_prefix(self, prefix_key: str = '/', delay: float = 0.1):
         if prefix_key == '/':
-            if UINPUT_AVAILABLE and self.device is not None:
-                self.press_key(uinput.KEY_SLASH, delay)
+            if self.device is not None:
+                self.press_key(self.keys.KEY_SLASH, delay)
             else:
                 print("DEBUG: Would press /")
         else:
@@ -263,18 +357,72 @@ class KeyboardSimulator:
             if key:
                 self.press_key(key, delay)
     
-    def type_sequence(self, text: str, config: Dict[str, Any], auto_jumping: bool = False):
-        prefix_delay = config.get('prefix_delay', 0.1)
-        char_delay = config.get('char_delay', 0.05)
-        enter_delay = config.get('enter_delay', 0.2)
-        space_delay = config.get('space_delay', 0.2)
-        prefix_key = config.get('prefix_key', '/')
-        
-        if auto_jumping:
-            self.press_space(0.2)  # Press space
-            time.sleep(0.2)         # Wait 200ms
+    def compile_plan(self, lines: List[str], config: Dict[str, Any], auto_jumping: bool = False,
+                     line_delay: float = LINE_DELAY) -> KeystrokePlan:
+        if self.device is None:
+            return KeystrokePlan(lines)
+        return compile_plan(lines, self.keymap, self.keys, config, auto_jumping, line_delay)
+    
+    def replay(self, plan: KeystrokePlan, cancel: Optional[threading.Event] = None,
+               on_line: Optional[Callable[[LineTiming], Any]] = None) -> Optional[PacingReport]:
+        limiter = self.rate_limiter
+        if self.device is None:
+            for line in plan.lines:
+                if limiter and limiter.acquire(cancel) is None:
+                    break
+                print(f"DEBUG: Would type: {line}")
+            self._notify_debug_emit()
+            return None
         
-        self.press_prefix(prefix_key, prefix_delay)
+        with self._locked():
+            return self.pacer.run(plan, self._emitter(), cancel, limiter.acquire if limiter else None, on_line)
+    
+    @contextmanager
+    def _locked(self):
+        # Manual and automatic typing contend for the device; traces show the wait
+        trace = tracing.tracer
+        if trace is None:
+            with self._lock:
+                yield
+            return
+        waiting = time.monotonic_ns()
+        with self._lock:
+            trace.complete('lock wait', 'lock', waiting, time.monotonic_ns())
+            yield
+    
+    def _emitter(self) -> Callable[..., Any]:
+        if not self.device_ready.is_set():
+            self.device_ready.wait(self.ready_timeout)
+        emit = self.device.emit
+        # python-uinput can leave the SYN_REPORT out (emit(..., syn=False)) to
+        # batch events into one frame; other devices get one per event
+        frames = callable(getattr(self.device, 'syn', None))
+        note_press = self.injection_filter.note_press
+        callback = self.first_emit_callback
+        self.first_emit_callback = None
+
+        if frames and callback is None:
+            # The usual case, with nothing left to check per event
+            def emit_framed(key, value, syn=True):
+                if value:
+                    note_press(key)
+                emit(key, value, syn)
+
+            return emit_framed
+
+        def emit_tracked(key, value, syn=True):
+            nonlocal callback
+            if value:
+                note_press(key)
+            if frames:
+                emit(key, value, syn)
+            else:
+                emit(key, value)
+            if callback is not None:
+                notify, callback = callback, None
+                notify()
         
-        self.type_text(text, char_delay)
-        self.press_enter(enter_delay)
\ No newline at end of file
+        return emit_tracked
+    
+    def type_sequence(self, text: str, config: Dict[str, Any], auto_jumping: bool = False) -> Optional[PacingReport]:
+        return self.replay(self.compile_plan([text], config, auto_jumping, line_delay=0.0))
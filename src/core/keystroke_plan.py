@@ -0,0 +1,285 @@
+import queue
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Mapping, Optional, Tuple
+
+# Fixed pause after every submitted line (was time.sleep(0.1) in NumberFlow)
+LINE_DELAY = 0.1
+# auto_jumping presses space, then waits 200ms + 200ms before the prefix
+AUTO_JUMP_DELAY = 0.4
+
+
+class KeystrokePlan:
+    """Pre-compiled key events for one or more lines.
+
+    Event i emits keys[codes[i]] with values[i] (1 = press, 0 = release) and
+    then waits delays[i] seconds. syncs[i] is 1 if a SYN_REPORT closes the
+    input frame after event i, 0 if the next event joins the same frame.
+    line_ends[n] is the index one past the last event of line n, and
+    submits holds the index of each event that submits a line (the Enter
+    press), where a rate limiter may hold the plan back.
+    """
+    __slots__ = ('keys', 'codes', 'values', 'delays', 'syncs', 'lines', 'line_ends', 'submits')
+
+    def __init__(self, lines: Iterable[str] = ()):
+        self.keys: Tuple[Any, ...] = ()
+        self.codes = array('H')
+        self.values = array('B')
+        self.delays = array('d')
+        self.syncs = array('B')
+        self.lines: Tuple[str, ...] = tuple(lines)
+        self.line_ends = array('I')
+        self.submits = array('I')
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def total_delay(self) -> float:
+        return sum(self.delays)
+
+
+class PlanBuilder:
+    """Appends key events to a KeystrokePlan.
+
+    With `coalesce_modifiers`, shift stays held across a run of characters
+    that all need it instead of being pressed and released around each one:
+    two events per character instead of four, and the same keys reach the
+    application in the same shift state.
+    """
+
+    def __init__(self, coalesce_modifiers: bool = True):
+        self.plan = KeystrokePlan()
+        self.coalesce_modifiers = coalesce_modifiers
+        self._key_index: Dict[Any, int] = {}
+        self._keys: List[Any] = []
+        self._lines: List[str] = []
+        self._held: Any = None
+
+    def _code(self, key: Any) -> int:
+        code = self._key_index.get(key)
+        if code is None:
+            code = len(self._keys)
+            self._key_index[key] = code
+            self._keys.append(key)
+        return code
+
+    def event(self, key: Any, value: int, delay: float = 0.0):
+        plan = self.plan
+        plan.codes.append(self._code(key))
+        plan.values.append(value)
+        plan.delays.append(delay)
+
+    def tap(self, key: Any, delay: float = 0.0, shift_key: Any = None):
+        if self.coalesce_modifiers:
+            self.hold(shift_key)
+            self.event(key, 1)
+            self.event(key, 0, delay)
+            return
+        if shift_key is not None:
+            self.event(shift_key, 1)
+        self.event(key, 1)
+        if shift_key is not None:
+            self.event(key, 0)
+            self.event(shift_key, 0, delay)
+        else:
+            self.event(key, 0, delay)
+
+    def hold(self, modifier: Any):
+        """Make `modifier` (or nothing, for None) the held modifier"""
+        if modifier == self._held:
+            return
+        if self._held is not None:
+            self.event(self._held, 0)
+        if modifier is not None:
+            self.event(modifier, 1)
+        self._held = modifier
+
+    def submit(self, key: Any, delay: float = 0.0):
+        """Tap the key that submits the line, marking its press in plan.submits"""
+        self.hold(None)
+        self.plan.submits.append(len(self.plan.codes))
+        self.tap(key, delay)
+
+    def add_delay(self, delay: float):
+        if self.plan.delays:
+            self.plan.delays[-1] += delay
+
+    def end_line(self, text: str):
+        self.hold(None)
+        self._lines.append(text)
+        self.plan.line_ends.append(len(self.plan.codes))
+
+    def build(self) -> KeystrokePlan:
+        self.hold(None)
+        self.plan.keys = tuple(self._keys)
+        self.plan.lines = tuple(self._lines)
+        self.plan.syncs = frame_events(self.plan)
+        return self.plan
+
+
+def frame_events(plan: KeystrokePlan) -> array:
+    """SYN_REPORT flags grouping the events with no delay between them into frames.
+
+    A frame ends after any event followed by a wait, at the end of each
+    line, before a submit (which may be held back), and before a key is
+    released that was pressed in the same frame, so a press and its release
+    are never reported as simultaneous.
+    """
+    codes = plan.codes
+    values = plan.values
+    delays = plan.delays
+    count = len(codes)
+    syncs = array('B', bytes(count))
+    line_ends = set(plan.line_ends)
+    submits = set(plan.submits)
+    pressed = set()
+    for i in range(count):
+        if values[i]:
+            pressed.add(codes[i])
+        last = i + 1 == count
+        if (last or delays[i] or i + 1 in line_ends or i + 1 in submits
+                or (not values[i + 1] and codes[i + 1] in pressed)):
+            syncs[i] = 1
+            pressed.clear()
+    return syncs
+
+
+def _add_text(builder: PlanBuilder, text: str, keymap: Mapping[str, Tuple[Tuple[Any, bool], ...]],
+              shift_key: Any, char_delay: float):
+    for char in text:
+        strokes = keymap.get(char)
+        if strokes is None:
+            print(f"Warning: Cannot type character '{char}' - skipping")
+            continue
+        for key, shift_needed in strokes:
+            builder.tap(key, char_delay, shift_key if shift_needed else None)
+
+
+def compile_text(text: str, keymap: Mapping[str, Tuple[Tuple[Any, bool], ...]],
+                 keys: Any, char_delay: float, coalesce_modifiers: bool = True) -> KeystrokePlan:
+    builder = PlanBuilder(coalesce_modifiers)
+    _add_text(builder, text, keymap, keys.KEY_LEFTSHIFT, char_delay)
+    builder.end_line(text)
+    return builder.build()
+
+
+def compile_plan(lines: Iterable[str], keymap: Mapping[str, Tuple[Tuple[Any, bool], ...]],
+                 keys: Any, typing_config: Dict[str, Any], auto_jumping: bool = False,
+                 line_delay: float = LINE_DELAY, coalesce_modifiers: bool = True) -> KeystrokePlan:
+    prefix_delay = typing_config.get('prefix_delay', 0.1)
+    char_delay = typing_config.get('char_delay', 0.05)
+    enter_delay = typing_config.get('enter_delay', 0.2)
+    prefix_key = typing_config.get('prefix_key', '/')
+
+    if prefix_key == '/':
+        prefix = keys.KEY_SLASH
+    else:
+        strokes = keymap.get(prefix_key)
+        prefix = strokes[0][0] if strokes else None
+
+    shift_key = keys.KEY_LEFTSHIFT
+    builder = PlanBuilder(coalesce_modifiers)
+
+    for line in lines:
+        if auto_jumping:
+            builder.tap(keys.KEY_SPACE, AUTO_JUMP_DELAY)
+
+        if prefix is not None:
+            builder.tap(prefix, prefix_delay)
+
+        _add_text(builder, line, keymap, shift_key, char_delay)
+        builder.submit(keys.KEY_ENTER, enter_delay)
+        builder.add_delay(line_delay)
+        builder.end_line(line)
+
+    return builder.build()
+
+
+def freeze(value: Any) -> Hashable:
+    if isinstance(value, dict):
+        return tuple(sorted((key, freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+class PlanCache:
+    def __init__(self, capacity: int = 256):
+        self.capacity = max(1, capacity)
+        self._plans: 'OrderedDict[Hashable, KeystrokePlan]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[KeystrokePlan]:
+        with self._lock:
+            plan = self._plans.get(key)
+            if plan is None:
+                self.misses += 1
+                return None
+            self._plans.move_to_end(key)
+            self.hits += 1
+            return plan
+
+    def put(self, key: Hashable, plan: KeystrokePlan):
+        with self._lock:
+            self._plans[key] = plan
+            self._plans.move_to_end(key)
+            while len(self._plans) > self.capacity:
+                self._plans.popitem(last=False)
+
+    def resize(self, capacity: int):
+        with self._lock:
+            self.capacity = max(1, capacity)
+            while len(self._plans) > self.capacity:
+                self._plans.popitem(last=False)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._plans
+
+    def __len__(self) -> int:
+        return len(self._plans)
+
+    def clear(self):
+        with self._lock:
+            self._plans.clear()
+
+
+class PlanPrefetcher:
+    """Background worker that compiles upcoming plans into a PlanCache."""
+
+    def __init__(self, cache: PlanCache, plan_key: Callable[[int], Hashable],
+                 compile_fn: Callable[[int], Optional[KeystrokePlan]]):
+        self.cache = cache
+        self._plan_key = plan_key
+        self._compile = compile_fn
+        self._queue: 'queue.Queue[Optional[int]]' = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+
+    def prefetch(self, indices: Iterable[int]):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name='plan-prefetch', daemon=True)
+            self._thread.start()
+        for index in indices:
+            self._queue.put(index)
+
+    def stop(self):
+        if self._thread and self._thread.is_alive():
+            self._queue.put(None)
+
+    def _run(self):
+        while True:
+            index = self._queue.get()
+            if index is None:
+                return
+            try:
+                key = self._plan_key(index)
+                if key in self.cache:
+                    continue
+                plan = self._compile(index)
+                if plan is not None:
+                    self.cache.put(key, plan)
+            except Exception as e:
+                print(f"Warning: failed to prefetch plan for index {index}: {e}")
@@ -1,15 +1,25 @@
 import os
 import json
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Sequence
 from pathlib import Path
 
+from .language_pack import open_pack
+from .language_registry import LanguageRegistry
+from .number_speller import NumberSpeller, get_speller
+
 
 class LanguageManager:
-    def __init__(self, languages_dir: str = "languages"):
+    def __init__(self, languages_dir: str = "languages", max_generated: Optional[int] = None):
         self.languages_dir = Path(languages_dir)
+        # Compiled, memory-mapped copies of each numbers.json (see language_pack.py)
+        self.cache_dir = self.languages_dir / ".cache"
         self.current_language = None
         self.numbers = []
         self.available_languages = {}
+        # Highest number spelled on demand past the end of numbers.json (None disables generation)
+        self.max_generated = max_generated
+        self.speller: Optional[NumberSpeller] = None
+        self.registry = LanguageRegistry(self.languages_dir, self.cache_dir)
         
         self._scan_languages()
     
@@ -18,18 +28,12 @@ class LanguageManager:
             print(f"Warning: Languages directory '{self.languages_dir}' not found")
             return
         
-        for lang_dir in self.languages_dir.iterdir():
-            if lang_dir.is_dir():
-                lang_code = lang_dir.name
-                numbers_file = lang_dir / "numbers.json"
-                
-                if numbers_file.exists():
-                    self.available_languages[lang_code] = {
-                        'path': lang_dir,
-                        'numbers_file': numbers_file
-                    }
-                else:
-                    print(f"Warning: No numbers.json found in {lang_dir}")
+        for lang_code in self.registry.scan():
+            lang_dir = self.registry.path_of(lang_code)
+            self.available_languages[lang_code] = {
+                'path': lang_dir,
+                'numbers_file': lang_dir / "numbers.json"
+            }
     
     def get_available_languages(self) -> List[str]:
         return list(self.available_languages.keys())
@@ -40,30 +44,48 @@ class LanguageManager:
             return False
         
         try:
-            numbers_file = self.available_languages[lang_code]['numbers_file']
-            with open(numbers_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            self.numbers = data.get('numbers', [])
+            self.numbers = self._load_numbers(lang_code)
             self.current_language = lang_code
+            self.speller = get_speller(lang_code) if self.max_generated is not None else None
             
-            if not self.numbers:
+            if not self.numbers and not self.speller:
                 print(f"Warning: No numbers found in {lang_code}")
                 return False
             
-            print(f"Loaded {len(self.numbers)} numbers for language '{lang_code}'")
+            if self.speller:
+                print(f"Loaded {len(self.numbers)} numbers for language '{lang_code}' "
+                      f"(generated up to {self.get_total_numbers() - 1})")
+            else:
+                print(f"Loaded {len(self.numbers)} numbers for language '{lang_code}'")
             return True
             
         except Exception as e:
             print(f"Error loading language '{lang_code}': {e}")
             return False
     
+    def _pack_path(self, lang_code: str) -> Path:
+        return self.cache_dir / f"{lang_code}.pack"
+    
+    def _load_numbers(self, lang_code: str) -> Sequence[str]:
+        numbers_file = self.available_languages[lang_code]['numbers_file']
+        try:
+            return open_pack(numbers_file, self._pack_path(lang_code))
+        except OSError as e:
+            # Cache directory not writable - fall back to parsing the JSON directly
+            print(f"Warning: Cannot use compiled pack for '{lang_code}': {e}")
+            with open(numbers_file, 'r', encoding='utf-8') as f:
+                return json.load(f).get('numbers', [])
+    
     def get_current_number(self, index: int) -> Optional[str]:
-        if not self.numbers or index < 0 or index >= len(self.numbers):
-            return None
-        return self.numbers[index]
+        if 0 <= index < len(self.numbers):
+            return self.numbers[index]
+        if self.speller and 0 <= index < self.get_total_numbers():
+            return self.speller.spell(index)
+        return None
     
     def get_total_numbers(self) -> int:
+        if self.speller:
+            return max(len(self.numbers), self.max_generated + 1)
         return len(self.numbers)
     
     def get_current_language(self) -> Optional[str]:
@@ -73,45 +95,33 @@ class LanguageManager:
         if lang_code not in self.available_languages:
             return {'valid': False, 'error': f'Language {lang_code} not found'}
         
-        lang_path = self.available_languages[lang_code]['path']
-        numbers_file = lang_path / "numbers.json"
-        
+        return self.registry.validate([lang_code])[lang_code]['validation']
+    
+    def validate_languages(self, lang_codes: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        return {code: entry['validation'] for code, entry in self.registry.validate(lang_codes).items()}
+    
+    def get_language_total(self, lang_code: str) -> int:
+        entries = self.registry.validate([lang_code]).get(lang_code, {}).get('entries') or 0
+        if self.max_generated is not None and get_speller(lang_code):
+            return max(entries, self.max_generated + 1)
+        return entries
+    
+    def check_speller_consistency(self, lang_code: str) -> Dict[str, Any]:
         result = {
-            'valid': True,
-            'errors': [],
-            'warnings': []
+            'checked': 0,
+            'mismatches': []
         }
         
-        if not numbers_file.exists():
-            result['valid'] = False
-            result['errors'].append('numbers.json file missing')
+        speller = get_speller(lang_code)
+        if not speller or lang_code not in self.available_languages:
             return result
         
-        try:
-            with open(numbers_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            if 'numbers' not in data:
-                result['valid'] = False
-                result['errors'].append('Missing "numbers" array in JSON')
-            elif not isinstance(data['numbers'], list):
-                result['valid'] = False
-                result['errors'].append('"numbers" must be an array')
-            elif len(data['numbers']) == 0:
-                result['warnings'].append('No numbers in the array')
-            
-            if 'metadata' in data:
-                metadata = data['metadata']
-                if 'language_name' not in metadata:
-                    result['warnings'].append('Missing language_name in metadata')
-                if 'description' not in metadata:
-                    result['warnings'].append('Missing description in metadata')
-            
-        except json.JSONDecodeError as e:
-            result['valid'] = False
-            result['errors'].append(f'Invalid JSON: {e}')
-        except Exception as e:
-            result['valid'] = False
-            result['errors'].append(f'Read error: {e}')
+        numbers = self._load_numbers(lang_code)
+        
+        for index, expected in enumerate(numbers):
+            generated = speller.spell(index)
+            if generated != expected:
+                result['mismatches'].append((index, expected, generated))
+        result['checked'] = len(numbers)
         
         return result
\ No newline at end of file
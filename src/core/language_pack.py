@@ -0,0 +1,143 @@
+import json
+import mmap
+import os
+import struct
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# Compiled language pack layout:
+#   header   magic, version, entry count, source mtime_ns, source size, metadata length
+#   metadata UTF-8 JSON of the source "metadata" object, space-padded to 8 bytes
+#   offsets  (count + 1) native-endian uint64 offsets into the blob
+#   blob     UTF-8 encoded entries, back to back
+# Packs are a machine-local cache, so native byte order for the offsets is fine.
+PACK_MAGIC = b'AJJSPACK'
+PACK_VERSION = 1
+HEADER = struct.Struct('<8sIQqQI')
+OFFSET_SIZE = 8
+
+
+class LanguagePack:
+    """Read-only, memory-mapped view of a compiled numbers.json.
+
+    Behaves like a list of strings; each lookup slices the mapping and
+    decodes only the requested entry.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+        self._offsets = None
+
+        magic, version, count, mtime_ns, size, metadata_len = HEADER.unpack_from(self._view, 0)
+        if magic != PACK_MAGIC or version != PACK_VERSION:
+            self.close()
+            raise ValueError(f"{self.path} is not a version {PACK_VERSION} language pack")
+
+        self.count = count
+        self.source_mtime_ns = mtime_ns
+        self.source_size = size
+        metadata_start = HEADER.size
+        offsets_start = metadata_start + metadata_len
+        self._blob_start = offsets_start + (count + 1) * OFFSET_SIZE
+        self.metadata: Dict[str, Any] = json.loads(
+            str(self._view[metadata_start:offsets_start], 'utf-8') or 'null'
+        )
+        self._offsets = self._view[offsets_start:self._blob_start].cast('Q')
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index: int) -> str:
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError('language pack index out of range')
+        blob_start = self._blob_start
+        return str(self._view[blob_start + self._offsets[index]:blob_start + self._offsets[index + 1]], 'utf-8')
+
+    def __iter__(self):
+        for index in range(self.count):
+            yield self[index]
+
+    def is_fresh_for(self, source: Path) -> bool:
+        return is_fresh(self.source_mtime_ns, self.source_size, source)
+
+    def close(self):
+        if self._mmap is not None:
+            if self._offsets is not None:
+                self._offsets.release()
+                self._offsets = None
+            self._view.release()
+            self._mmap.close()
+            self._mmap = None
+
+
+def is_fresh(mtime_ns: int, size: int, source: Path) -> bool:
+    try:
+        stat = source.stat()
+    except OSError:
+        return False
+    return stat.st_mtime_ns == mtime_ns and stat.st_size == size
+
+
+def read_pack_header(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, 'rb') as f:
+            header = f.read(HEADER.size)
+    except OSError:
+        return None
+    if len(header) != HEADER.size:
+        return None
+    magic, version, count, mtime_ns, size, _ = HEADER.unpack(header)
+    if magic != PACK_MAGIC or version != PACK_VERSION:
+        return None
+    return {'count': count, 'mtime_ns': mtime_ns, 'size': size}
+
+
+def build_pack(source: Path, destination: Path) -> int:
+    stat = source.stat()
+    with open(source, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    numbers = data.get('numbers', [])
+    if not isinstance(numbers, list):
+        raise ValueError('"numbers" must be an array')
+    if not all(isinstance(number, str) for number in numbers):
+        raise ValueError('"numbers" must only contain strings')
+
+    encoded = [number.encode('utf-8') for number in numbers]
+    metadata = json.dumps(data.get('metadata'), ensure_ascii=False).encode('utf-8')
+    metadata += b' ' * (-(HEADER.size + len(metadata)) % OFFSET_SIZE)
+    offsets = array('Q', [0])
+    position = 0
+    for entry in encoded:
+        position += len(entry)
+        offsets.append(position)
+
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    temp = destination.with_name(f"{destination.name}.{os.getpid()}.tmp")
+    try:
+        with open(temp, 'wb') as f:
+            f.write(HEADER.pack(PACK_MAGIC, PACK_VERSION, len(encoded),
+                                stat.st_mtime_ns, stat.st_size, len(metadata)))
+            f.write(metadata)
+            f.write(offsets.tobytes())
+            f.write(b''.join(encoded))
+        os.replace(temp, destination)
+    finally:
+        if temp.exists():
+            temp.unlink()
+
+    return len(encoded)
+
+
+def open_pack(source: Path, destination: Path) -> LanguagePack:
+    """Open the compiled pack for `source`, rebuilding it if the source changed"""
+    header = read_pack_header(destination)
+    if header is None or not is_fresh(header['mtime_ns'], header['size'], source):
+        build_pack(source, destination)
+    return LanguagePack(destination)
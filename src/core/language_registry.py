@@ -0,0 +1,187 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+# 2: entry paths are directory names under the languages directory
+MANIFEST_VERSION = 2
+# Validate in a process pool once at least this many packs need (re)validation
+PARALLEL_THRESHOLD = 8
+
+
+def inspect_language(numbers_file: str) -> Dict[str, Any]:
+    """Hash, count and validate one numbers.json (runs in worker processes)"""
+    result = {
+        'valid': True,
+        'errors': [],
+        'warnings': []
+    }
+    info: Dict[str, Any] = {'hash': None, 'entries': 0, 'validation': result}
+
+    try:
+        with open(numbers_file, 'rb') as f:
+            raw = f.read()
+        info['hash'] = hashlib.sha256(raw).hexdigest()
+        data = json.loads(raw.decode('utf-8'))
+
+        if 'numbers' not in data:
+            result['valid'] = False
+            result['errors'].append('Missing "numbers" array in JSON')
+        elif not isinstance(data['numbers'], list):
+            result['valid'] = False
+            result['errors'].append('"numbers" must be an array')
+        elif len(data['numbers']) == 0:
+            result['warnings'].append('No numbers in the array')
+        else:
+            info['entries'] = len(data['numbers'])
+
+        if 'metadata' in data:
+            metadata = data['metadata']
+            if 'language_name' not in metadata:
+                result['warnings'].append('Missing language_name in metadata')
+            if 'description' not in metadata:
+                result['warnings'].append('Missing description in metadata')
+
+    except json.JSONDecodeError as e:
+        result['valid'] = False
+        result['errors'].append(f'Invalid JSON: {e}')
+    except Exception as e:
+        result['valid'] = False
+        result['errors'].append(f'Read error: {e}')
+
+    return info
+
+
+class LanguageRegistry:
+    """Cached manifest of language packs under the languages directory.
+
+    Each entry records code, path, size, mtime, content hash, entry count and
+    the last validation result. The path is the pack's directory name, so
+    the manifest stays valid whatever the languages directory is called
+    from; path_of() joins it back onto `languages_dir`. Entries are only re-inspected when their
+    numbers.json changes, and the directory listing is only re-read when the
+    languages directory itself changes.
+    """
+
+    def __init__(self, languages_dir: Path, cache_dir: Path):
+        self.languages_dir = Path(languages_dir)
+        self.manifest_file = Path(cache_dir) / "registry.json"
+        self.languages: Dict[str, Dict[str, Any]] = {}
+        self._pending: List[str] = []
+        self._dir_mtime_ns: Optional[int] = None
+        self._dirty = False
+
+    def _load_manifest(self) -> Dict[str, Any]:
+        try:
+            with open(self.manifest_file, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get('version') == MANIFEST_VERSION:
+                return manifest
+        except (OSError, ValueError):
+            pass
+        return {'version': MANIFEST_VERSION, 'dir_mtime_ns': None, 'languages': {}, 'pending': []}
+
+    def path_of(self, lang_code: str) -> Path:
+        return self.languages_dir / self.languages[lang_code]['path']
+
+    @staticmethod
+    def _is_local(name: Any) -> bool:
+        """Whether a cached path is a plain directory name, i.e. stays under languages_dir"""
+        return isinstance(name, str) and name not in ('', '.', '..') and Path(name).name == name
+
+    def save(self):
+        if not self._dirty:
+            return
+        manifest = {
+            'version': MANIFEST_VERSION,
+            'dir_mtime_ns': self._dir_mtime_ns,
+            'languages': self.languages,
+            'pending': self._pending
+        }
+        try:
+            self.manifest_file.parent.mkdir(parents=True, exist_ok=True)
+            temp = self.manifest_file.with_name(f"{self.manifest_file.name}.{os.getpid()}.tmp")
+            with open(temp, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, indent=2, ensure_ascii=False)
+            os.replace(temp, self.manifest_file)
+            self._dirty = False
+        except OSError as e:
+            print(f"Warning: Cannot write language registry: {e}")
+
+    def scan(self) -> Dict[str, Dict[str, Any]]:
+        manifest = self._load_manifest()
+        cached = manifest.get('languages', {})
+        self._dir_mtime_ns = self.languages_dir.stat().st_mtime_ns
+
+        lang_dirs = None
+        if manifest.get('dir_mtime_ns') == self._dir_mtime_ns:
+            # Directories that had no numbers.json yet are re-checked every scan
+            names = [entry.get('path') for entry in cached.values()] + list(manifest.get('pending', []))
+            # Anything that would resolve outside languages_dir means a full rescan
+            if all(map(self._is_local, names)):
+                lang_dirs = [self.languages_dir / name for name in names]
+        if lang_dirs is None:
+            lang_dirs = [path for path in self.languages_dir.iterdir()
+                         if path.is_dir() and not path.name.startswith('.')]
+            self._dirty = True
+
+        languages = {}
+        pending = []
+        for lang_dir in lang_dirs:
+            lang_code = lang_dir.name
+            numbers_file = lang_dir / "numbers.json"
+            try:
+                stat = numbers_file.stat()
+            except OSError:
+                print(f"Warning: No numbers.json found in {lang_dir}")
+                pending.append(lang_code)
+                continue
+
+            entry = cached.get(lang_code)
+            if (entry is None or entry['mtime_ns'] != stat.st_mtime_ns
+                    or entry['size'] != stat.st_size or entry['path'] != lang_code):
+                entry = {
+                    'code': lang_code,
+                    'path': lang_code,
+                    'size': stat.st_size,
+                    'mtime_ns': stat.st_mtime_ns,
+                    'hash': None,
+                    'entries': None,
+                    'validation': None
+                }
+                self._dirty = True
+            languages[lang_code] = entry
+
+        if set(languages) != set(cached) or pending != manifest.get('pending', []):
+            self._dirty = True
+        self.languages = languages
+        self._pending = pending
+        self.save()
+        return languages
+
+    def validate(self, lang_codes: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, Any]]:
+        codes = list(self.languages) if lang_codes is None else [c for c in lang_codes if c in self.languages]
+        stale = [code for code in codes if self.languages[code]['validation'] is None]
+
+        if stale:
+            files = [str(self.path_of(code) / "numbers.json") for code in stale]
+            for code, info in zip(stale, self._inspect_all(files)):
+                self.languages[code].update(info)
+            self._dirty = True
+            self.save()
+
+        return {code: self.languages[code] for code in codes}
+
+    def _inspect_all(self, files: List[str]) -> List[Dict[str, Any]]:
+        if len(files) < PARALLEL_THRESHOLD:
+            return [inspect_language(numbers_file) for numbers_file in files]
+        # Imported here: concurrent.futures.process is slow to import and
+        # rarely needed at startup
+        from concurrent.futures import ProcessPoolExecutor
+        try:
+            with ProcessPoolExecutor() as pool:
+                return list(pool.map(inspect_language, files, chunksize=4))
+        except (OSError, RuntimeError) as e:
+            print(f"Warning: Parallel validation unavailable ({e}), validating serially")
+            return [inspect_language(numbers_file) for numbers_file in files]
@@ -1,34 +1,100 @@
+import os
 import sys
 import time
-import random
 import threading
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Callable
+from . import tracing
+from .auto_scheduler import AutoScheduler
 from .keyboard import KeyboardSimulator
+from .injection_filter import listener_token
+from .jump_capture import JumpCapture, CAPTURE_TOKENS
+from .keystroke_plan import KeystrokePlan, PlanCache, PlanPrefetcher, freeze
 from .language_manager import LanguageManager
-from ..styles.jack_styles import StyleManager
+from .pacing import PacingEngine
+from .range_runner import PROGRESS_INTERVAL, RangeRunner, format_summary
+from .rate_limiter import RateLimiter
+from .startup import StartupProbe
+from .stats import StatsRecorder
+from .typing_worker import TypingJob, TypingWorker
+from ..styles.jack_styles import FormattedTable, StyleManager
 from ..config.config_manager import ConfigManager
+from ..config.config_watcher import ConfigWatcher
 
-try:
-    from pynput import keyboard
-    PYNPUT_AVAILABLE = True
-except ImportError:
-    keyboard = None
-    PYNPUT_AVAILABLE = False
+# Top-level config sections that feed into compiled keystroke plans
+PLAN_SECTIONS = frozenset({'language', 'prefix_key', 'jack_style', 'delays', 'styles', 'auto_jumping'})
+# Sections that change the formatted lines
+FORMAT_SECTIONS = frozenset({'language', 'jack_style', 'styles'})
+# Sections only read while starting up
+RESTART_SECTIONS = frozenset({'runtime', 'input', 'number_generation', 'hot_reload'})
+
+JUMP_PROMPT = "Jump to number (1-indexed): "
+# Seconds to focus the target window before a range starts typing
+RANGE_COUNTDOWN = 3.0
+
+# pynput is imported on first use (see load_pynput); importing it can take
+# noticeably long and connects to the display server
+keyboard = None
+PYNPUT_AVAILABLE = None
+
+
+def load_pynput() -> bool:
+    global keyboard, PYNPUT_AVAILABLE
+    if PYNPUT_AVAILABLE is None:
+        try:
+            from pynput import keyboard as keyboard_module
+            keyboard = keyboard_module
+            PYNPUT_AVAILABLE = True
+        except ImportError:
+            PYNPUT_AVAILABLE = False
+    return PYNPUT_AVAILABLE
 
 
 class NumberFlow:
     def __init__(self, config_manager: ConfigManager):
         self.config = config_manager
         debug_level = config_manager.get_debug_level() if hasattr(config_manager, 'get_debug_level') else 0
-        self.keyboard = KeyboardSimulator(debug_level)
-        self.language_manager = LanguageManager()
+        self.keyboard = KeyboardSimulator(
+            debug_level, config_manager.get_spin_threshold_us(),
+            ready_timeout=config_manager.get_device_ready_timeout(),
+            settle_ms=config_manager.get_device_settle_ms()
+        )
+        self.rate_limiter = RateLimiter(config_manager.get_rate_limits())
+        self.keyboard.rate_limiter = self.rate_limiter
+        self.language_manager = LanguageManager(max_generated=config_manager.get_max_generated_number())
         self.style_manager = StyleManager()
         
         self.current_index = 0
         self.running = False
-        self.last_key_time = 0
-        self.key_debounce = 0.2  # 200ms debounce to prevent rapid firing
-        self.auto_thread = None
+        self.startup_probe: Optional[StartupProbe] = None
+        self.async_runtime = None
+        # Key -> action table, rebuilt whenever the config snapshot changes
+        self._key_actions: Dict[str, str] = {}
+        self._dispatch_snapshot = None
+        # Digits typed after the jump key, collected without blocking the listener
+        self.jump_capture = JumpCapture(config_manager.get_jump_timeout())
+        
+        self.plan_cache = PlanCache(self.config.get_plan_cache_size())
+        self.plan_prefetcher = PlanPrefetcher(self.plan_cache, self._plan_key, self._compile_plan)
+        self.typing_worker = TypingWorker(self._type_current_number, self.config.get_max_pending_types())
+        self.auto_scheduler = AutoScheduler(
+            self._request_auto_type, self.config.get_automatic_settings, lambda: self.config.is_debug_level(1),
+            cancel_fn=self._cancel_auto_type
+        )
+        # The typing job behind automatic mode's current number
+        self._auto_job: Optional[TypingJob] = None
+        self.config_watcher: Optional[ConfigWatcher] = None
+        self.format_table: Optional[FormattedTable] = None
+        # Set to a StatsRecorder to collect per-stage latencies (--stats)
+        self.stats: Optional[StatsRecorder] = None
+        # perf_counter_ns of the key press behind the next typed number
+        self._type_trigger_ns: Optional[int] = None
+        # Optional ControlServer (--control-socket), served while the session runs
+        self.control_server = None
+        # Recorded evdev stream to read instead of the keyboards (--input-replay)
+        self.input_replay: Optional[str] = None
+        # The evdev backend never sees our own device, so nothing needs filtering
+        self._filter_injected = config_manager.get_input_backend() != 'evdev'
+        self._format_generation = 0
         
         self._load_initial_language()
     
@@ -48,13 +114,186 @@ class NumberFlow:
             return
         
         self.running = True
-        if PYNPUT_AVAILABLE:
+        self._rebuild_format_table()
+        self._start_config_watcher()
+        if self.control_server is not None:
+            self.control_server.start()
+            print(f"Control socket: {self.control_server.path}")
+        if self._global_input_available():
             self._run_global_mode()
         else:
             self._run_interactive_mode()
     
     def stop(self):
         self.running = False
+        self.auto_scheduler.stop()
+        self.jump_capture.cancel()
+        if self.config_watcher is not None:
+            self.config_watcher.stop()
+            self.config_watcher = None
+        if self.control_server is not None:
+            self.control_server.stop()
+        self.typing_worker.stop()
+        if self.async_runtime is not None:
+            self.async_runtime.request_stop()
+        self.plan_prefetcher.stop()
+    
+    def run_daemon(self):
+        """Serve the control socket without hotkeys, keeping the virtual device open.
+        
+        Clients (main.py --client) drive the session; the device, caches and
+        current index persist between their invocations.
+        """
+        if self.control_server is None:
+            print("Daemon mode needs a control socket")
+            return
+        if not self.language_manager.get_current_language():
+            print("No language loaded. Cannot start.")
+            return
+        
+        self.running = True
+        self._rebuild_format_table()
+        self._start_config_watcher()
+        self.typing_worker.start()
+        self.control_server.start()
+        
+        if self.keyboard.device is not None and not self.keyboard.device_ready.wait(self.keyboard.ready_timeout):
+            print("Warning: virtual keyboard not confirmed ready")
+        print(f"AutoJJs daemon listening on {self.control_server.path} (pid {os.getpid()})")
+        self._show_current_status()
+        
+        try:
+            while self.running:
+                time.sleep(0.1)
+        except KeyboardInterrupt:
+            print("\nInterrupted by user")
+        finally:
+            self.stop()
+            print("Daemon stopped")
+    
+    def run_range(self, start: int, stop: int, countdown: float = RANGE_COUNTDOWN) -> Optional[Dict[str, Any]]:
+        """Type the numbers at indices start..stop-1 unattended and return a summary.
+        
+        After `countdown` seconds to focus the target window, a worker thread
+        types the range while this thread prints progress. ESC, the quit key
+        or Ctrl+C stop it cleanly; the index is left after the last number typed.
+        """
+        if not self.language_manager.get_current_language():
+            print("No language loaded. Cannot start.")
+            return None
+        total = self.language_manager.get_total_numbers()
+        if not 0 <= start < stop <= total:
+            print(f"Invalid range. Must be within 1-{total}")
+            return None
+        
+        self.running = True
+        self._rebuild_format_table()
+        runner = RangeRunner(self, start, stop, self.config.get_prefetch_ahead())
+        # Compile the first number while the user switches windows
+        self.plan_prefetcher.prefetch((start,))
+        
+        listener = None
+        if self._global_input_available():
+            def on_press(key):
+                if self._is_self_injected(key):
+                    return
+                if self._resolve_key_action(key) in ('quit', 'esc'):
+                    runner.cancel.set()
+                    return False
+            listener = self._start_listener(on_press)
+        
+        quit_key = self.config.get_navigation_config()['quit']
+        print(f"\nTyping numbers {start + 1}-{stop} ({stop - start}) in "
+              f"{self.language_manager.get_current_language()}, style {self.config.get_jack_style()}")
+        stop_keys = f"ESC, {quit_key} or Ctrl+C" if listener is not None else "Ctrl+C"
+        print(f"Starting in {countdown:g} seconds - focus the target window ({stop_keys} to stop)")
+        
+        interactive = sys.stdout.isatty()
+        thread = None
+        try:
+            if not runner.cancel.wait(countdown):
+                thread = threading.Thread(target=runner.run, name='range-runner', daemon=True)
+                thread.start()
+                finished = False
+                while not finished:
+                    finished = runner.done.wait(PROGRESS_INTERVAL if interactive else PROGRESS_INTERVAL * 20)
+                    # Redraw in place on a terminal; a log gets a line every few seconds
+                    if interactive:
+                        print(f"\r{runner.progress()}\033[K", end="", flush=True)
+                    else:
+                        print(runner.progress(), flush=True)
+                if interactive:
+                    print()
+        except KeyboardInterrupt:
+            runner.cancel.set()
+            if thread is not None:
+                runner.done.wait()
+            print("\nInterrupted by user")
+        finally:
+            if listener is not None and listener.is_alive():
+                listener.stop()
+            self.stop()
+        
+        if thread is None:
+            runner.cancelled = True
+        summary = runner.summary()
+        print(format_summary(summary))
+        return summary
+        
+    def _start_config_watcher(self):
+        if not self.config.is_hot_reload_enabled() or self.config_watcher is not None:
+            return
+        self.config_watcher = ConfigWatcher(
+            self.config.config_file, self.reload_config, self.config.get_hot_reload_poll_interval()
+        )
+        backend = self.config_watcher.start()
+        if self.config.is_debug_level(1):
+            print(f"[DEBUG1] Watching {self.config.config_file} for changes ({backend})")
+    
+    def reload_config(self) -> bool:
+        changed = self.config.reload()
+        if not changed:
+            return False
+        self._apply_config_changes(changed)
+        print(f"\nConfig reloaded: {', '.join(sorted(changed))}")
+        return True
+    
+    def _apply_config_changes(self, changed):
+        """Push a reloaded config into the running session, dropping only the caches it affects"""
+        if 'language' in changed:
+            language = self.config.get_language()
+            if self.language_manager.load_language(language):
+                total = self.language_manager.get_total_numbers()
+                self.current_index = min(self.current_index, max(total - 1, 0))
+            else:
+                print(f"Failed to load language '{language}', keeping {self.language_manager.get_current_language()}")
+        
+        if changed & FORMAT_SECTIONS or 'performance' in changed:
+            self._rebuild_format_table()
+        
+        if changed & PLAN_SECTIONS:
+            self.plan_cache.clear()
+        
+        if 'performance' in changed:
+            self.keyboard.pacer = PacingEngine(self.config.get_spin_threshold_us())
+            self.plan_cache.resize(self.config.get_plan_cache_size())
+            self.typing_worker.max_pending = max(1, self.config.get_max_pending_types())
+        
+        if 'navigation' in changed:
+            self.jump_capture.timeout = self.config.get_jump_timeout()
+        
+        if 'rate_limit' in changed:
+            self.rate_limiter.configure(self.config.get_rate_limits())
+        
+        if 'debug' in changed:
+            self.keyboard.debug_level = self.config.get_debug_level()
+        
+        if 'automatic_mode' in changed and not self.config.is_automatic_mode():
+            self.stop_auto()
+        
+        restart = changed & RESTART_SECTIONS
+        if restart:
+            print(f"Restart to apply: {', '.join(sorted(restart))}")
     
     def _run_interactive_mode(self):
         nav_config = self.config.get_navigation_config()
@@ -82,9 +321,9 @@ class NumberFlow:
                     if choice == nav_config['quit']:
                         break
                     elif choice == nav_config['next']:
-                        self._next_number()
+                        self.next_number()
                     elif choice == nav_config['previous']:
-                        self._previous_number()
+                        self.previous_number()
                     elif choice == nav_config['jump']:
                         self._jump_to_number()
                     elif choice == self.config.get_type_key():
@@ -102,6 +341,15 @@ class NumberFlow:
             print("\nGoodbye!")
     
     def _run_global_mode(self):
+        self._print_global_banner()
+        
+        if self.config.get_runtime() == 'async':
+            from .async_runtime import AsyncRuntime
+            AsyncRuntime(self).run()
+        else:
+            self._run_threaded_mode()
+    
+    def _print_global_banner(self):
         nav_config = self.config.get_navigation_config()
         type_key = self.config.get_type_key()
         auto_mode = self.config.is_automatic_mode()
@@ -128,83 +376,155 @@ class NumberFlow:
         print(f"\nFeatures:")
         print(f"  Auto Mode: {'Enabled' if auto_mode else 'Disabled'}")
         print(f"  Auto-Jumping: {'Enabled' if auto_jumping else 'Disabled'}")
+        print(f"  Runtime: {self.config.get_runtime()}")
         
         if auto_jumping:
             print(f"  (Space + 100ms delay will be added to typing)")
         
         print(f"\nPress ESC, Ctrl+C or {nav_config['quit']} to stop...")
+    
+    def _resolve_key_action(self, key) -> Optional[str]:
+        snapshot = self.config.snapshot()
+        if snapshot is not self._dispatch_snapshot:
+            self._key_actions = snapshot.key_actions()
+            self._dispatch_snapshot = snapshot
         
-        def on_press(key):
-            current_time = time.time()
-            
-            # Debounce: prevent rapid key repeat
-            if current_time - self.last_key_time < self.key_debounce:
-                return
-                
+        # Debug level 2: show key detection
+        if snapshot.show_keys:
             try:
-                # Debug level 2: show key detection
-                if self.config.should_show_keys():
-                    try:
-                        if hasattr(key, 'char') and key.char:
-                            print(f"[DEBUG2] Key pressed: {key.char}")
-                        else:
-                            print(f"[DEBUG2] Special key: {key}")
-                    except:
-                        print(f"[DEBUG2] Unknown key type: {type(key)}")
-                
-                # Handle regular character keys
                 if hasattr(key, 'char') and key.char:
-                    char = key.char.lower()
-                    
-                    if char == nav_config['quit']:
-                        print("\nQuit key pressed - stopping...")
-                        self.stop()
-                        return False
-                    elif char == nav_config['next']:
-                        self._next_number()
-                        self._show_current_status()
-                        self.last_key_time = current_time
-                    elif char == nav_config['previous']:
-                        self._previous_number()
-                        self._show_current_status()
-                        self.last_key_time = current_time
-                    elif char == nav_config['jump']:
-                        self._jump_to_number_global()
-                        self.last_key_time = current_time
-                    elif char == type_key:
-                        if auto_mode:
-                            self._start_automatic_typing()
-                        else:
-                            self._type_current_number()
-                        self.last_key_time = current_time
-                # Handle special keys like ESC
+                    print(f"[DEBUG2] Key pressed: {key.char}")
                 else:
-                    if keyboard and hasattr(keyboard, 'Key'):
-                        if key == keyboard.Key.esc:
-                            print("\nESC pressed - stopping...")
-                            self.stop()
-                            return False
-                        # Handle configurable special keys
-                        elif hasattr(key, 'name') and key.name:
-                            special_keys = self.config.get('navigation.special_keys', {})
-                            type_special = special_keys.get('type')
-                            if type_special and key.name == type_special:
-                                if auto_mode:
-                                    self._start_automatic_typing()
-                                else:
-                                    self._type_current_number()
-                                self.last_key_time = current_time
-                        
-            except Exception as e:
-                if self.config.is_debug_level(1):
-                    print(f"Error handling key: {e}")
+                    print(f"[DEBUG2] Special key: {key}")
+            except:
+                print(f"[DEBUG2] Unknown key type: {type(key)}")
         
+        # Regular keys resolve by lowercase char, special keys (ESC, the
+        # configurable type key) by name
+        return self._key_actions.get(listener_token(key))
+    
+    def _is_self_injected(self, key) -> bool:
+        return self._filter_injected and self.keyboard.injection_filter.consume(listener_token(key))
+    
+    def _on_key_press(self, key):
+        pressed_ns = time.perf_counter_ns()
+        pressed_mono = time.monotonic_ns()
+        if self._is_self_injected(key):
+            return
+        
+        try:
+            if self.jump_capture.active and self._feed_jump(key):
+                return
+            action = self._resolve_key_action(key)
+            if action is None:
+                return
+            if action == 'type':
+                self._type_trigger_ns = pressed_ns
+            
+            if action in ('quit', 'esc'):
+                print("\nQuit key pressed - stopping..." if action == 'quit' else "\nESC pressed - stopping...")
+                self.stop()
+                return False
+            elif action == 'next':
+                self.next_number()
+                self._show_current_status()
+            elif action == 'previous':
+                self.previous_number()
+                self._show_current_status()
+            elif action == 'jump':
+                self._begin_jump()
+            elif action == 'type':
+                if self.is_automatic_mode():
+                    self._on_auto_key()
+                else:
+                    self._request_type()
+            
+        except Exception as e:
+            if self.config.is_debug_level(1):
+                print(f"Error handling key: {e}")
+        finally:
+            if self.stats is not None:
+                self.stats.record('on_press', time.perf_counter_ns() - pressed_ns)
+            trace = tracing.tracer
+            if trace is not None:
+                trace.complete('on_press', 'listener', pressed_mono, time.monotonic_ns(), {'key': str(key)})
+    
+    def _request_type(self):
+        # Never type on the listener thread: hand the job to the typing worker
+        if self.typing_worker.submit() is None:
+            print(f"Typing queue full ({self.typing_worker.max_pending} pending) - request dropped")
+    
+    def request_type(self, on_done: Optional[Callable[[], None]] = None) -> bool:
+        """Type the current number from any thread without blocking.
+        
+        `on_done` is called from the typing side once the number has been
+        typed (or dropped). Returns False if the request was rejected.
+        """
+        return self._submit_type(on_done) is not None
+    
+    def _submit_type(self, on_done: Optional[Callable[[], None]] = None) -> Optional[TypingJob]:
+        if not self.running:
+            return None
+        self.typing_worker.start()
+        job = self.typing_worker.submit()
+        if job is not None and on_done is not None:
+            job.add_done_callback(on_done)
+        return job
+    
+    def _request_auto_type(self, on_done: Callable[[], None]) -> bool:
+        self._auto_job = self._submit_type(on_done)
+        return self._auto_job is not None
+    
+    def _cancel_auto_type(self):
+        # Stopping automatic mode aborts its number instead of letting it finish
+        job = self._auto_job
+        if job is not None:
+            job.cancel.set()
+    
+    def start_auto(self) -> bool:
+        if not self.auto_scheduler.start():
+            print("Automatic typing already running...")
+            return False
+        return True
+    
+    def stop_auto(self):
+        self.auto_scheduler.stop()
+    
+    def pause_auto(self) -> bool:
+        if self.auto_scheduler.pause():
+            print("Automatic typing paused")
+            return True
+        return False
+    
+    def resume_auto(self) -> bool:
+        if self.auto_scheduler.resume():
+            print("Automatic typing resumed")
+            return True
+        return False
+    
+    def _on_auto_key(self):
+        # In automatic mode the type key starts the scheduler, then pauses and resumes it
+        if not self.auto_scheduler.is_running():
+            self.start_auto()
+        elif self.auto_scheduler.paused:
+            self.resume_auto()
+        else:
+            self.pause_auto()
+    
+    def is_auto_running(self) -> bool:
+        return self.auto_scheduler.is_running()
+    
+    def is_automatic_mode(self) -> bool:
+        """Whether the type key drives automatic mode, per the config the last key was resolved with"""
+        snapshot = self._dispatch_snapshot or self.config.snapshot()
+        return snapshot.automatic_mode
+    
+    def _run_threaded_mode(self):
         self._show_current_status()
         
-        if PYNPUT_AVAILABLE and keyboard:
-            # Create and start listener like in your example
-            listener = keyboard.Listener(on_press=on_press)
-            listener.start()
+        if self._global_input_available():
+            self.typing_worker.start()
+            listener = self._start_listener(self._on_key_press)
             
             try:
                 while self.running:
@@ -219,53 +539,113 @@ class NumberFlow:
             print("pynput not available, falling back to terminal mode")
             self._run_interactive_mode()
     
-    def _start_automatic_typing(self):
-        if self.auto_thread and self.auto_thread.is_alive():
-            print("Automatic typing already running...")
-            return
+    def _global_input_available(self) -> bool:
+        if self.config.get_input_backend() == 'evdev':
+            return True
+        return load_pynput()
+    
+    def _start_listener(self, on_press):
+        if self.config.get_input_backend() == 'evdev':
+            listener = self._create_evdev_listener(on_press)
+        else:
+            listener = keyboard.Listener(on_press=on_press)
+        listener.start()
+        listener.wait()
+        if self.startup_probe:
+            self.startup_probe.mark('listener ready')
+        return listener
+    
+    def _create_evdev_listener(self, on_press):
+        from .evdev_input import EvdevListener, EventDevice, ReplaySource, find_keyboards
+        from .keyboard import DEVICE_NAME
         
-        min_delay, max_delay = self.config.get_automatic_delays()
-        random_delay = random.uniform(min_delay, max_delay)
+        if self.input_replay:
+            sources = [ReplaySource(self.input_replay)]
+        elif self.config.get_input_devices():
+            sources = [EventDevice(path) for path in self.config.get_input_devices()]
+        else:
+            exclude = [self.keyboard.device_node] if self.keyboard.device_node else []
+            sources = find_keyboards(exclude_names=(DEVICE_NAME,), exclude_paths=exclude)
+        if not sources:
+            raise RuntimeError("No keyboards found under /dev/input (set input.devices, or use the pynput backend)")
+        if self.config.is_debug_level(1):
+            print(f"[DEBUG1] Reading keys from: {', '.join(source.name for source in sources)}")
+        return EvdevListener(on_press, sources, self.config.snapshot, CAPTURE_TOKENS)
+    
+    def run_startup_benchmark(self, probe: StartupProbe):
+        """Measure time to a ready listener and a first emitted event, then exit.
         
-        print(f"Starting automatic typing in {random_delay:.1f} seconds...")
+        Instead of typing the current number, the first event is a lone shift
+        tap so the benchmark never types into the focused window.
+        """
+        self.startup_probe = probe
+        self.keyboard.first_emit_callback = lambda: probe.mark('first event')
+        probe.mark('flow ready')
         
-        def auto_type():
-            time.sleep(random_delay)
-            while self.running:
-                self._type_current_number()
-                # Random delay between each number
-                delay = random.uniform(min_delay, max_delay)
-                if self.config.is_debug_level(1):
-                    print(f"[DEBUG1] Next automatic type in {delay:.1f}s")
-                time.sleep(delay)
-        
-        self.auto_thread = threading.Thread(target=auto_type, daemon=True)
-        self.auto_thread.start()
-    
-    def _jump_to_number_global(self):
-        print("\nJump to number (1-indexed): ", end="", flush=True)
-        try:
-            # Temporarily switch to terminal input for jump
-            jump_input = input()
-            if not jump_input:
-                return
-            
-            jump_index = int(jump_input) - 1
-            total = self.language_manager.get_total_numbers()
-            
-            if 0 <= jump_index < total:
-                self.current_index = jump_index
-                print(f"Jumped to number {jump_index + 1}")
-                self._show_current_status()
-            else:
-                print(f"Invalid number. Must be between 1 and {total}")
-                self._show_current_status()
-                
-        except ValueError:
-            print("Invalid input. Please enter a number.")
+        listener = None
+        if self._global_input_available():
+            listener = self._start_listener(lambda key: None)
+        else:
+            print("Note: pynput not available, skipping listener startup")
+        
+        plan = self.plan_for(self.current_index)
+        if plan is not None:
+            probe.mark('plan compiled')
+        self.keyboard.tap_shift()
+        
+        if listener is not None:
+            listener.stop()
+        self.startup_probe = None
+    
+    def _begin_jump(self):
+        """Start collecting a jump target from the following digit key presses"""
+        generation = self.jump_capture.begin()
+        print(f"\n{JUMP_PROMPT}", end="", flush=True)
+        self._schedule_jump_timeout(generation)
+    
+    def _schedule_jump_timeout(self, generation: int):
+        remaining = self.jump_capture.remaining(generation)
+        if remaining is None:
+            return
+        timer = threading.Timer(remaining + 0.001, self._on_jump_timeout, (generation,))
+        timer.daemon = True
+        timer.start()
+    
+    def _on_jump_timeout(self, generation: int):
+        if self.jump_capture.expire(generation):
+            print("\nJump timed out")
             self._show_current_status()
-        except (EOFError, KeyboardInterrupt):
-            pass
+        else:
+            # A key press moved the deadline (or the capture ended)
+            self._schedule_jump_timeout(generation)
+    
+    def _feed_jump(self, key) -> bool:
+        """Route a key press to the open jump capture; True if it was consumed"""
+        result = self.jump_capture.feed(listener_token(key))
+        if result is None:
+            return False
+        state, digits = result
+        if state == 'digit':
+            # Trailing space + backspace clears the digit a backspace removed
+            print(f"\r{JUMP_PROMPT}{digits} \b", end="", flush=True)
+        elif state == 'commit':
+            print()
+            self._commit_jump(digits)
+        else:
+            print("\nJump cancelled" if state == 'cancel' else "\nJump timed out")
+            self._show_current_status()
+        return True
+    
+    def _commit_jump(self, digits: str):
+        jump_index = int(digits) - 1
+        total = self.language_manager.get_total_numbers()
+        
+        if 0 <= jump_index < total:
+            self.current_index = jump_index
+            print(f"Jumped to number {jump_index + 1}")
+        else:
+            print(f"Invalid number. Must be between 1 and {total}")
+        self._show_current_status()
     
     def _show_current_status(self):
         current_number = self.language_manager.get_current_number(self.current_index)
@@ -275,7 +655,7 @@ class NumberFlow:
             print(f"\n[{self.current_index + 1}/{total}] ", end="")
         
         if current_number and self.config.should_show_formatted():
-            formatted = self._format_number(current_number)
+            formatted = self._format_index(self.current_index, current_number)
             if len(formatted) == 1:
                 print(f"Current: {formatted[0]}")
             else:
@@ -283,14 +663,28 @@ class NumberFlow:
         
         print(f"Language: {self.language_manager.get_current_language()} | "
               f"Style: {self.config.get_jack_style()}")
-    
-    def _type_current_number(self):
+        if self.rate_limiter:
+            buckets = self.rate_limiter.status()['buckets']
+            print("Rate limit: " + ", ".join(
+                f"{bucket['tokens']:.1f}/{bucket['burst']:g} of {bucket['lines']:g} per {bucket['per']:g}s"
+                for bucket in buckets))
+
+    def _type_current_number(self, cancel: Optional[threading.Event] = None):
+        started_ns = self._type_trigger_ns or time.perf_counter_ns()
+        self._type_trigger_ns = None
         current_number = self.language_manager.get_current_number(self.current_index)
         if not current_number:
             print("No number available")
             return
         
-        formatted_lines = self._format_number(current_number)
+        stats = self.stats
+        if stats is not None:
+            first_event = []
+            self.keyboard.first_emit_callback = lambda: first_event.append(time.perf_counter_ns())
+        
+        plan = self.plan_for(self.current_index)
+        self._prefetch_upcoming(self.current_index)
+        formatted_lines = plan.lines
         
         print(f"\nTyping: {current_number}")
         if len(formatted_lines) > 1:
@@ -298,21 +692,109 @@ class NumberFlow:
         else:
             print(f"Formatted as: {formatted_lines[0]}")
         
-        delays = self.config.get_delays()
-        auto_jumping = self.config.is_auto_jumping()
-        typing_config = {
-            'prefix_key': self.config.get_prefix_key(),
-            'prefix_delay': delays['prefix'],
-            'char_delay': delays['character'],
-            'enter_delay': delays['enter'],
-            'space_delay': delays['space']
-        }
+        trace = tracing.tracer
+        if trace is not None:
+            replay_start = time.monotonic_ns()
+        report = self.keyboard.replay(plan, cancel)
+        if trace is not None:
+            trace.complete('type number', 'typing', replay_start, time.monotonic_ns(),
+                           {'index': self.current_index + 1, 'number': current_number})
+        if stats is not None:
+            stats.record_number(started_ns, first_event[0] if first_event else None, report)
+        if report and report.cancelled:
+            print("Typing cancelled")
+            return
+        if report and self.config.is_debug_level(1):
+            for number, line in enumerate(report.lines, 1):
+                print(f"[DEBUG1] Line {number}: {line.actual:.3f}s (target {line.target:.3f}s) "
+                      f"jitter avg {line.mean_jitter * 1e3:.3f}ms max {line.max_jitter * 1e3:.3f}ms "
+                      f"drift {line.drift * 1e3:+.3f}ms")
+            print(f"[DEBUG1] Pacing: {report.summary()}")
+        
+        self.next_number()
+    
+    def _typing_config(self) -> Dict[str, Any]:
+        return self.config.get_typing_config()
+    
+    def _plan_key(self, index: int):
+        style_name = self.config.get_jack_style()
+        return (
+            self.language_manager.get_current_language(),
+            index,
+            style_name,
+            freeze(self.config.get_style_config(style_name)),
+            freeze(self.config.get_delays()),
+            self.config.get_prefix_key(),
+            self.config.is_auto_jumping()
+        )
+    
+    def _compile_plan(self, index: int) -> Optional[KeystrokePlan]:
+        number = self.language_manager.get_current_number(index)
+        if not number:
+            return None
+        if self.stats is not None:
+            started_ns = time.perf_counter_ns()
+            lines = self._format_index(index, number)
+            self.stats.record('format', time.perf_counter_ns() - started_ns)
+        else:
+            lines = self._format_index(index, number)
+        return self.keyboard.compile_plan(lines, self._typing_config(), self.config.is_auto_jumping())
+    
+    def plan_for(self, index: int) -> Optional[KeystrokePlan]:
+        """The compiled plan for the number at `index`, from the plan cache when it is there"""
+        key = self._plan_key(index)
+        plan = self.plan_cache.get(key)
+        if plan is None:
+            plan = self._compile_plan(index)
+            if plan is not None:
+                self.plan_cache.put(key, plan)
+        return plan
+    
+    def _prefetch_upcoming(self, index: int):
+        ahead = self.config.get_prefetch_ahead()
+        total = self.language_manager.get_total_numbers()
+        if ahead <= 0 or total <= 1:
+            return
+        self.plan_prefetcher.prefetch((index + step) % total for step in range(1, min(ahead, total - 1) + 1))
+    
+    def _rebuild_format_table(self):
+        """Render the formatted lines for the start of the range in the background.
+        
+        Until the new table is ready (and past its end) numbers are
+        formatted on demand.
+        """
+        self._format_generation += 1
+        generation = self._format_generation
+        self.format_table = None
+        
+        size = min(self.config.get_format_table_size(), self.language_manager.get_total_numbers())
+        if size <= 0:
+            return
         
-        for line in formatted_lines:
-            self.keyboard.type_sequence(line, typing_config, auto_jumping)
-            time.sleep(0.1)
+        style_name = self.config.get_jack_style()
+        style = self.style_manager.get_style(style_name, self.config.get_style_config(style_name))
+        get_number = self.language_manager.get_current_number
+        key = (self.language_manager.get_current_language(), style_name)
         
-        self._next_number()
+        def build():
+            start = time.perf_counter()
+            table = FormattedTable.build(key, (get_number(i) or '' for i in range(size)), style.format)
+            if generation != self._format_generation:
+                return
+            self.format_table = table
+            if self.config.is_debug_level(1):
+                print(f"[DEBUG1] Rendered {len(table)} formatted numbers in "
+                      f"{(time.perf_counter() - start) * 1e3:.1f}ms ({len(table.buffer)} chars)")
+        
+        threading.Thread(target=build, name='format-table', daemon=True).start()
+    
+    def _format_index(self, index: int, number: str) -> List[str]:
+        table = self.format_table
+        if table is not None:
+            lines = table.get(index)
+            if lines is not None:
+                return lines
+        return self._format_number(number)
     
     def _format_number(self, number: str) -> List[str]:
         style_name = self.config.get_jack_style()
@@ -321,11 +803,11 @@ class NumberFlow:
         style = self.style_manager.get_style(style_name, style_config)
         return style.format(number)
     
-    def _next_number(self):
+    def next_number(self):
         total = self.language_manager.get_total_numbers()
         self.current_index = (self.current_index + 1) % total
     
-    def _previous_number(self):
+    def previous_number(self):
         total = self.language_manager.get_total_numbers()
         self.current_index = (self.current_index - 1) % total
     
@@ -363,5 +845,8 @@ class NumberFlow:
             'total_numbers': self.language_manager.get_total_numbers(),
             'current_language': self.language_manager.get_current_language(),
             'jack_style': self.config.get_jack_style(),
-            'running': self.running
+            'running': self.running,
+            'auto_running': self.is_auto_running(),
+            'auto': self.auto_scheduler.status(),
+            'rate_limit': self.rate_limiter.status()
         }
\ No newline at end of file
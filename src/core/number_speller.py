@@ -0,0 +1,154 @@
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+
+
+class NumberSpeller(ABC):
+    """Rule-based number speller producing the word form of any index on demand"""
+
+    @abstractmethod
+    def spell(self, number: int) -> str:
+        pass
+
+    @abstractmethod
+    def get_language(self) -> str:
+        pass
+
+    @staticmethod
+    def _groups(number: int) -> List[int]:
+        # Split into groups of three digits, least significant first
+        groups = []
+        while number:
+            number, group = divmod(number, 1000)
+            groups.append(group)
+        return groups
+
+
+class EnglishSpeller(NumberSpeller):
+    ONES = ['zero', 'one', 'two', 'three', 'four', 'five', 'six', 'seven', 'eight', 'nine',
+            'ten', 'eleven', 'twelve', 'thirteen', 'fourteen', 'fifteen', 'sixteen',
+            'seventeen', 'eighteen', 'nineteen']
+    TENS = ['', '', 'twenty', 'thirty', 'forty', 'fifty', 'sixty', 'seventy', 'eighty', 'ninety']
+    SCALES = ['', 'thousand', 'million', 'billion', 'trillion', 'quadrillion', 'quintillion',
+              'sextillion', 'septillion', 'octillion', 'nonillion', 'decillion']
+
+    def get_language(self) -> str:
+        return 'en'
+
+    def _spell_group(self, number: int) -> str:
+        hundreds, rest = divmod(number, 100)
+        words = []
+        if hundreds:
+            words.append(f"{self.ONES[hundreds]} hundred")
+        if rest >= 20:
+            tens, ones = divmod(rest, 10)
+            words.append(f"{self.TENS[tens]}-{self.ONES[ones]}" if ones else self.TENS[tens])
+        elif rest:
+            words.append(self.ONES[rest])
+        return ' '.join(words)
+
+    def spell(self, number: int) -> str:
+        if number < 0:
+            return f"minus {self.spell(-number)}"
+        if number == 0:
+            return self.ONES[0]
+
+        groups = self._groups(number)
+        if len(groups) > len(self.SCALES):
+            raise ValueError(f"Number too large to spell: {number}")
+
+        words = []
+        for scale in range(len(groups) - 1, -1, -1):
+            group = groups[scale]
+            if group:
+                words.append(self._spell_group(group))
+                if scale:
+                    words.append(self.SCALES[scale])
+        return ' '.join(words)
+
+
+class PortugueseBRSpeller(NumberSpeller):
+    ONES = ['zero', 'um', 'dois', 'três', 'quatro', 'cinco', 'seis', 'sete', 'oito', 'nove',
+            'dez', 'onze', 'doze', 'treze', 'quatorze', 'quinze', 'dezesseis', 'dezessete',
+            'dezoito', 'dezenove']
+    TENS = ['', '', 'vinte', 'trinta', 'quarenta', 'cinquenta', 'sessenta', 'setenta',
+            'oitenta', 'noventa']
+    HUNDREDS = ['', 'cento', 'duzentos', 'trezentos', 'quatrocentos', 'quinhentos',
+                'seiscentos', 'setecentos', 'oitocentos', 'novecentos']
+    # (singular, plural); "mil" is invariable and is never preceded by "um"
+    SCALES = [('', ''), ('mil', 'mil'), ('milhão', 'milhões'), ('bilhão', 'bilhões'),
+              ('trilhão', 'trilhões'), ('quatrilhão', 'quatrilhões'),
+              ('quintilhão', 'quintilhões'), ('sextilhão', 'sextilhões'),
+              ('septilhão', 'septilhões'), ('octilhão', 'octilhões'),
+              ('nonilhão', 'nonilhões'), ('decilhão', 'decilhões')]
+
+    def get_language(self) -> str:
+        return 'ptbr'
+
+    def _spell_group(self, number: int) -> str:
+        if number == 100:
+            return 'cem'
+        hundreds, rest = divmod(number, 100)
+        words = []
+        if hundreds:
+            words.append(self.HUNDREDS[hundreds])
+        if rest >= 20:
+            tens, ones = divmod(rest, 10)
+            words.append(self.TENS[tens])
+            if ones:
+                words.append(self.ONES[ones])
+        elif rest:
+            words.append(self.ONES[rest])
+        return ' e '.join(words)
+
+    def spell(self, number: int) -> str:
+        if number < 0:
+            return f"menos {self.spell(-number)}"
+        if number == 0:
+            return self.ONES[0]
+
+        groups = self._groups(number)
+        if len(groups) > len(self.SCALES):
+            raise ValueError(f"Number too large to spell: {number}")
+
+        parts = []
+        for scale in range(len(groups) - 1, -1, -1):
+            group = groups[scale]
+            if not group:
+                continue
+            if scale == 0:
+                parts.append((group, self._spell_group(group)))
+            elif scale == 1:
+                parts.append((group, 'mil' if group == 1 else f"{self._spell_group(group)} mil"))
+            else:
+                singular, plural = self.SCALES[scale]
+                parts.append((group, f"{self._spell_group(group)} {singular if group == 1 else plural}"))
+
+        # "e" joins the last group when it is below 100 or a round hundred:
+        # "mil e um", "mil e cem", "dois milhões e quinhentos mil", but "mil cento e um"
+        result = parts[0][1]
+        for index in range(1, len(parts)):
+            group, words = parts[index]
+            is_last = index == len(parts) - 1
+            if is_last and (group < 100 or group % 100 == 0):
+                result += f" e {words}"
+            else:
+                result += f" {words}"
+        return result
+
+
+SPELLERS: Dict[str, type] = {
+    'en': EnglishSpeller,
+    'ptbr': PortugueseBRSpeller,
+}
+
+
+def get_speller(lang_code: str) -> Optional[NumberSpeller]:
+    speller_class = SPELLERS.get(lang_code)
+    return speller_class() if speller_class else None
+
+
+def register_speller(lang_code: str, speller_class: type):
+    if not issubclass(speller_class, NumberSpeller):
+        raise ValueError("Speller class must inherit from NumberSpeller")
+
+    SPELLERS[lang_code] = speller_class
@@ -0,0 +1,189 @@
+import threading
+import time
+from typing import Any, Callable, List, NamedTuple, Optional
+
+from . import tracing
+
+# If emission falls this far behind schedule (e.g. the process was suspended),
+# restart the schedule from now instead of bursting keys to catch up.
+MAX_CATCHUP_NS = 50_000_000
+
+
+class LineTiming(NamedTuple):
+    text: str
+    events: int
+    target: float        # scheduled duration of the line (s)
+    actual: float        # measured duration of the line (s)
+    mean_jitter: float   # mean lateness per wait (s)
+    max_jitter: float    # worst lateness per wait (s)
+    drift: float         # actual - scheduled time since the plan started (s)
+
+
+class PacingReport:
+    def __init__(self):
+        self.lines: List[LineTiming] = []
+        self.rebases = 0
+        self.cancelled = False
+        # Time a rate limiter held line submissions back (s)
+        self.held = 0.0
+
+    @property
+    def target(self) -> float:
+        return sum(line.target for line in self.lines)
+
+    @property
+    def actual(self) -> float:
+        return sum(line.actual for line in self.lines)
+
+    @property
+    def drift(self) -> float:
+        return self.lines[-1].drift if self.lines else 0.0
+
+    @property
+    def max_jitter(self) -> float:
+        return max((line.max_jitter for line in self.lines), default=0.0)
+
+    def summary(self) -> str:
+        summary = (f"{len(self.lines)} line(s) in {self.actual:.3f}s (target {self.target:.3f}s), "
+                   f"max jitter {self.max_jitter * 1e3:.3f}ms, drift {self.drift * 1e3:+.3f}ms")
+        if self.held:
+            summary += f", held {self.held:.3f}s by rate limit"
+        return summary
+
+
+class PacingEngine:
+    """Emits plan events against absolute monotonic deadlines.
+
+    Each delay advances the deadline instead of sleeping relative to "now", so
+    emit cost and sleep overshoot do not accumulate. Waits sleep until
+    `spin_threshold_us` before the deadline and busy-wait the remainder.
+    Before each submit event, `gate(cancel)` may hold the plan back (a rate
+    limiter); the schedule then continues from when it lets go, and the
+    hold counts as scheduled time. `on_line` is called with each line's
+    LineTiming as soon as the line is done.
+    """
+
+    def __init__(self, spin_threshold_us: int = 500):
+        self.spin_ns = max(0, int(spin_threshold_us)) * 1000
+
+    def wait_until(self, deadline_ns: int, cancel: Optional[threading.Event] = None) -> int:
+        now = time.monotonic_ns
+        spin_ns = self.spin_ns
+        # Event.wait is as precise as sleep but returns as soon as cancel is set
+        sleep = cancel.wait if cancel is not None else time.sleep
+        remaining = deadline_ns - now()
+        while remaining > spin_ns:
+            if sleep((remaining - spin_ns) / 1e9):
+                return 0
+            remaining = deadline_ns - now()
+        while remaining > 0:
+            remaining = deadline_ns - now()
+        return -remaining
+
+    def run(self, plan: Any, emit: Callable[[Any, int, bool], Any],
+            cancel: Optional[threading.Event] = None,
+            gate: Optional[Callable[[Optional[threading.Event]], Optional[float]]] = None,
+            on_line: Optional[Callable[[LineTiming], Any]] = None) -> PacingReport:
+        report = PacingReport()
+        keys = plan.keys
+        codes = plan.codes
+        values = plan.values
+        delays = plan.delays
+        syncs = plan.syncs
+        line_ends = plan.line_ends
+        lines = plan.lines
+        now = time.monotonic_ns
+        wait_until = self.wait_until
+        trace = tracing.tracer
+
+        start = now()
+        deadline = start
+        scheduled = 0
+        line_start = start
+        line_scheduled = 0
+        line_index = 0
+        line_event_start = 0
+        jitter_total = 0
+        jitter_max = 0
+        waits = 0
+        next_end = line_ends[0] if line_ends else len(codes)
+        submits = plan.submits if gate is not None else ()
+        submit_index = 0
+        next_submit = submits[0] if submits else -1
+
+        for i in range(len(codes)):
+            if cancel is not None and cancel.is_set():
+                self._release_held(plan, i, emit)
+                report.cancelled = True
+                break
+            if i == next_submit:
+                held = gate(cancel)
+                if held is None:
+                    self._release_held(plan, i, emit)
+                    report.cancelled = True
+                    break
+                if held:
+                    report.held += held
+                    held_ns = now() - deadline
+                    if held_ns > 0:
+                        scheduled += held_ns
+                        deadline += held_ns
+                submit_index += 1
+                next_submit = submits[submit_index] if submit_index < len(submits) else -1
+            emit(keys[codes[i]], values[i], syncs[i])
+            delay = delays[i]
+            if delay:
+                delay_ns = int(delay * 1e9)
+                scheduled += delay_ns
+                deadline += delay_ns
+                if trace is not None:
+                    wait_start = now()
+                late = wait_until(deadline, cancel)
+                if trace is not None:
+                    trace.complete('sleep', 'pacing', wait_start, now(), {'late_us': late / 1e3})
+                if late > MAX_CATCHUP_NS:
+                    deadline = now()
+                    report.rebases += 1
+                jitter_total += late
+                if late > jitter_max:
+                    jitter_max = late
+                waits += 1
+
+            if i + 1 == next_end:
+                line_done = now()
+                if trace is not None:
+                    trace.complete('line', 'typing', line_start, line_done,
+                                   {'text': lines[line_index] if line_index < len(lines) else '',
+                                    'events': i + 1 - line_event_start})
+                timing = LineTiming(
+                    lines[line_index] if line_index < len(lines) else '',
+                    i + 1 - line_event_start,
+                    (scheduled - line_scheduled) / 1e9,
+                    (line_done - line_start) / 1e9,
+                    jitter_total / waits / 1e9 if waits else 0.0,
+                    jitter_max / 1e9,
+                    (line_done - start - scheduled) / 1e9
+                )
+                report.lines.append(timing)
+                if on_line is not None:
+                    on_line(timing)
+                line_index += 1
+                line_event_start = i + 1
+                line_start = line_done
+                line_scheduled = scheduled
+                jitter_total = jitter_max = waits = 0
+                next_end = line_ends[line_index] if line_index < len(line_ends) else len(codes)
+
+        return report
+
+    @staticmethod
+    def _release_held(plan: Any, stop: int, emit: Callable[[Any, int], Any]):
+        # Never leave a key (typically shift) pressed when a plan is cut short
+        held = set()
+        for i in range(stop):
+            if plan.values[i]:
+                held.add(plan.codes[i])
+            else:
+                held.discard(plan.codes[i])
+        for code in held:
+            emit(plan.keys[code], 0)
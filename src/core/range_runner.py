@@ -0,0 +1,174 @@
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from . import tracing
+from .pacing import LineTiming
+from .session_planner import format_duration
+
+# Seconds between progress line updates
+PROGRESS_INTERVAL = 0.5
+
+
+class RangeRunner:
+    """Types the numbers at indices start..stop-1 back to back, unattended.
+
+    Every number is replayed from its compiled plan, so events go out in
+    SYN frames against absolute deadlines and the rate limiter still gates
+    each line, while the prefetcher compiles the next `ahead` numbers in
+    the background. The pacing engine reports each line as it finishes, so
+    the counters behind progress() move even in the middle of a long
+    number. run() is meant for a thread of its own; setting `cancel` stops
+    it after releasing any held keys.
+    """
+
+    def __init__(self, flow, start: int, stop: int, ahead: int = 1):
+        self.flow = flow
+        self.start = start
+        self.stop = stop
+        self.ahead = max(1, ahead)
+        self.cancel = threading.Event()
+        # Set once run() has returned
+        self.done = threading.Event()
+        self.index = start
+        self.numbers = 0
+        self.skipped = 0
+        self.lines = 0
+        self.chars = 0
+        self.events = 0
+        self.held_time = 0.0
+        self.cancelled = False
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        # Lines of the number being typed, and how many of them are done
+        self._number_lines = 0
+        self._number_done = 0
+
+    @property
+    def total(self) -> int:
+        return self.stop - self.start
+
+    def _on_line(self, line: LineTiming):
+        self.lines += 1
+        self.chars += len(line.text)
+        self.events += line.events
+        self._number_done += 1
+
+    def run(self):
+        flow = self.flow
+        keyboard = flow.keyboard
+        stats = flow.stats
+        prefetch = flow.plan_prefetcher.prefetch
+        prefetch(range(self.start + 1, min(self.start + 1 + self.ahead, self.stop)))
+        self.started = time.monotonic()
+        try:
+            for index in range(self.start, self.stop):
+                self.index = index
+                flow.current_index = index
+                if self.cancel.is_set():
+                    self.cancelled = True
+                    break
+                if index + self.ahead < self.stop:
+                    prefetch((index + self.ahead,))
+                started_ns = time.perf_counter_ns()
+                plan = flow.plan_for(index)
+                if plan is None:
+                    self.skipped += 1
+                    continue
+                self._number_lines = len(plan.lines)
+                self._number_done = 0
+
+                trace = tracing.tracer
+                if trace is not None:
+                    replay_start = time.monotonic_ns()
+                report = keyboard.replay(plan, self.cancel, self._on_line)
+                if trace is not None:
+                    trace.complete('type number', 'typing', replay_start, time.monotonic_ns(),
+                                   {'index': index + 1, 'range': True})
+                if stats is not None:
+                    stats.record_number(started_ns, None, report)
+                if report is None:
+                    # No device: nothing was timed, count the lines as typed
+                    if self.cancel.is_set():
+                        self.cancelled = True
+                        break
+                    self.lines += len(plan.lines)
+                    self.chars += sum(map(len, plan.lines))
+                    self.events += len(plan.codes)
+                elif report.cancelled:
+                    self.cancelled = True
+                    break
+                else:
+                    self.held_time += report.held
+                self._number_lines = 0
+                self.numbers += 1
+            if not self.cancelled:
+                total = flow.language_manager.get_total_numbers()
+                flow.current_index = self.stop % total if total else 0
+        finally:
+            self.finished = time.monotonic()
+            self.done.set()
+
+    def elapsed(self) -> float:
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.monotonic()) - self.started
+
+    def done_fraction(self) -> float:
+        """Share of the range typed so far, counting the finished lines of the current number"""
+        if not self.total:
+            return 1.0
+        done = self.numbers + self.skipped
+        if self._number_lines:
+            done += self._number_done / self._number_lines
+        return min(1.0, done / self.total)
+
+    def eta(self) -> Optional[float]:
+        fraction = self.done_fraction()
+        elapsed = self.elapsed()
+        if fraction <= 0 or elapsed <= 0:
+            return None
+        return elapsed * (1 - fraction) / fraction
+
+    def progress(self) -> str:
+        elapsed = self.elapsed()
+        chars_rate = self.chars / elapsed if elapsed > 0 else 0.0
+        lines_rate = self.lines / elapsed if elapsed > 0 else 0.0
+        eta = self.eta()
+        width = len(str(self.stop))
+        return (f"[{self.index + 1:>{width}}/{self.stop}] {self.done_fraction() * 100:5.1f}% | "
+                f"{chars_rate:6.1f} chars/s {lines_rate:5.2f} lines/s | "
+                f"elapsed {format_duration(elapsed)} | ETA {format_duration(eta) if eta is not None else '-'}")
+
+    def summary(self) -> Dict[str, Any]:
+        elapsed = self.elapsed()
+        return {
+            'start': self.start,
+            'stop': self.stop,
+            'numbers': self.numbers,
+            'skipped': self.skipped,
+            'lines': self.lines,
+            'chars': self.chars,
+            'events': self.events,
+            'elapsed_s': round(elapsed, 3),
+            'chars_per_s': round(self.chars / elapsed, 3) if elapsed > 0 else None,
+            'lines_per_s': round(self.lines / elapsed, 3) if elapsed > 0 else None,
+            'held_s': round(self.held_time, 3),
+            'cancelled': self.cancelled,
+            'next_index': self.flow.current_index
+        }
+
+
+def format_summary(summary: Dict[str, Any]) -> str:
+    status = 'cancelled' if summary['cancelled'] else 'complete'
+    lines = [f"=== Range {summary['start'] + 1}-{summary['stop']} {status} ===",
+             f"Numbers typed: {summary['numbers']} of {summary['stop'] - summary['start']}"
+             + (f" ({summary['skipped']} skipped)" if summary['skipped'] else ''),
+             f"Lines: {summary['lines']}, chars: {summary['chars']}, events: {summary['events']}",
+             f"Elapsed: {format_duration(summary['elapsed_s'])}"]
+    if summary['chars_per_s'] is not None:
+        lines.append(f"Throughput: {summary['chars_per_s']:.1f} chars/s, {summary['lines_per_s']:.2f} lines/s")
+    if summary['held_s']:
+        lines.append(f"Held by rate limit: {format_duration(summary['held_s'])}")
+    lines.append(f"Next number: {summary['next_index'] + 1}")
+    return "\n".join(lines)
@@ -0,0 +1,113 @@
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+
+class TokenBucket:
+    """`lines` tokens per `per` seconds, refilled continuously, holding at most `burst`.
+
+    The default burst is `lines`, but never below one whole token: a bucket
+    that cannot hold one would never let a line through.
+    """
+    __slots__ = ('lines', 'per', 'burst', 'tokens', 'updated')
+
+    def __init__(self, lines: float, per: float, burst: Optional[float] = None):
+        self.lines = lines
+        self.per = per
+        self.burst = burst if burst is not None else max(1, lines)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+
+    @property
+    def rate(self) -> float:
+        return self.lines / self.per
+
+    def refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self) -> float:
+        """Seconds until a whole token is available, as of the last refill"""
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def key(self) -> tuple:
+        return (self.lines, self.per, self.burst)
+
+
+class RateLimiter:
+    """Holds line submissions back until every token bucket allows one.
+
+    Each submission takes a token from all buckets, so e.g. one bucket for
+    5 lines per 10 s and one for 20 lines per minute together keep both
+    limits while sending every line as early as they allow. Without buckets
+    nothing is ever held.
+    """
+
+    def __init__(self, buckets: Iterable[Dict[str, Any]] = ()):
+        self._lock = threading.Lock()
+        self.buckets: List[TokenBucket] = []
+        self.held = 0
+        self.held_time = 0.0
+        self.configure(buckets)
+
+    def configure(self, buckets: Iterable[Dict[str, Any]]):
+        """Replace the buckets; one with the same limits as before keeps its tokens"""
+        with self._lock:
+            previous = {bucket.key(): bucket for bucket in self.buckets}
+            configured = []
+            for spec in buckets:
+                bucket = TokenBucket(spec['lines'], spec['per'], spec.get('burst'))
+                configured.append(previous.pop(bucket.key(), bucket))
+            self.buckets = configured
+
+    def __bool__(self) -> bool:
+        return bool(self.buckets)
+
+    def _wait_time(self) -> float:
+        now = time.monotonic()
+        wait = 0.0
+        for bucket in self.buckets:
+            bucket.refill(now)
+            wait = max(wait, bucket.wait_time())
+        return wait
+
+    def try_acquire(self) -> float:
+        """Take a token from every bucket if all have one; else the seconds to wait first"""
+        with self._lock:
+            wait = self._wait_time()
+            if wait <= 0:
+                for bucket in self.buckets:
+                    bucket.tokens -= 1
+            return wait
+
+    def acquire(self, cancel: Optional[threading.Event] = None) -> Optional[float]:
+        """Block until a line may be submitted; seconds held, or None if `cancel` was set"""
+        wait = self.try_acquire()
+        if wait <= 0:
+            return 0.0
+        started = time.monotonic()
+        sleep = cancel.wait if cancel is not None else time.sleep
+        while wait > 0:
+            if sleep(wait):
+                return None
+            wait = self.try_acquire()
+        held = time.monotonic() - started
+        with self._lock:
+            self.held += 1
+            self.held_time += held
+        return held
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            self._wait_time()
+            return {
+                'buckets': [{
+                    'lines': bucket.lines,
+                    'per': bucket.per,
+                    'burst': bucket.burst,
+                    'tokens': round(bucket.tokens, 3),
+                    'wait': round(bucket.wait_time(), 3)
+                } for bucket in self.buckets],
+                'held': self.held,
+                'held_seconds': round(self.held_time, 3)
+            }
@@ -0,0 +1,331 @@
+import contextlib
+import io
+import math
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .keyboard import INTERNATIONAL_MAP, KEY_MAP, compile_keymap
+from .keystroke_plan import LINE_DELAY, compile_plan
+from .rate_limiter import TokenBucket
+from ..styles.jack_styles import StyleManager
+
+# Keys compile_plan presses besides the characters
+PLAN_KEYS = ('KEY_ENTER', 'KEY_SPACE', 'KEY_SLASH', 'KEY_LEFTSHIFT')
+# Distinct lines whose cost is kept; HJs repeats a few dozen letter lines endlessly
+LINE_MEMO_SIZE = 65536
+# Numbers per style, spread evenly over the range, whose costs are checked
+# against a compile_plan of all their lines
+VERIFY_SAMPLES = 32
+
+
+def named_keys() -> SimpleNamespace:
+    """KEY_* names standing in for python-uinput's constants, to plan without a device"""
+    names = set(KEY_MAP.values()) | {base for base, _ in INTERNATIONAL_MAP.values()} | set(PLAN_KEYS)
+    return SimpleNamespace(**{name: name for name in names})
+
+
+class _ShiftTable(dict):
+    """str.translate table: each char -> one 'S' (shifted) or 'u' per keystroke, '' if untypeable"""
+
+    def __init__(self, keymap):
+        super().__init__()
+        self.keymap = keymap
+        self.untypeable = set()
+
+    def __missing__(self, codepoint: int) -> str:
+        char = chr(codepoint)
+        strokes = self.keymap.get(char)
+        if strokes is None:
+            self.untypeable.add(char)
+            shifts = ''
+        else:
+            shifts = ''.join('S' if shift_needed else 'u' for _, shift_needed in strokes)
+        self[codepoint] = shifts
+        return shifts
+
+
+class LineCoster(dict):
+    """Line text -> (key events, scheduled seconds) of typing it, computed on first use.
+
+    Every cost is read off a plan from compile_plan, so the planner follows
+    PlanBuilder's shift handling and delays as they change. A line costs
+    what the plan for an empty line does (auto-jump space, prefix, Enter
+    and the pause after it) plus its text. When space needs no shift,
+    PlanBuilder releases any held shift at each space, so the text costs
+    the sum of its words and spaces. A word's events and delays depend only
+    on its keystrokes' shift pattern, so words are memoized by that pattern
+    (HJs spells whole numbers without spaces) and each new pattern is
+    compiled from the first word that has it. verify() checks whole numbers
+    against a single compile_plan.
+    """
+
+    def __init__(self, keys: Any, typing_config: Dict[str, Any], auto_jumping: bool = False,
+                 line_delay: float = LINE_DELAY):
+        super().__init__()
+        self.keys = keys
+        self.keymap = compile_keymap(keys)
+        self.typing_config = typing_config
+        self.auto_jumping = auto_jumping
+        self.line_delay = line_delay
+        fixed = self.compile([''])
+        self.fixed_events = len(fixed)
+        self.fixed_delay = fixed.total_delay()
+        # Enter's own delay and the pause after the line come after the submit
+        self.after_submit = sum(fixed.delays[fixed.submits[0]:])
+        self._shifts = _ShiftTable(self.keymap)
+        # Shift pattern -> (events, seconds) of a word with that pattern
+        self._words: Dict[str, Tuple[int, float]] = {}
+        space = self.keymap.get(' ')
+        self._split = space is not None and not any(shift_needed for _, shift_needed in space)
+
+    @property
+    def untypeable(self) -> str:
+        return ''.join(sorted(self._shifts.untypeable))
+
+    def compile(self, lines: List[str]):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return compile_plan(lines, self.keymap, self.keys, self.typing_config, self.auto_jumping,
+                                self.line_delay)
+
+    def _text_cost(self, text: str) -> Tuple[int, float]:
+        """Events and seconds `text` adds to a line"""
+        pattern = text.translate(self._shifts)
+        cost = self._words.get(pattern)
+        if cost is None:
+            plan = self.compile([text])
+            cost = self._words[pattern] = (len(plan) - self.fixed_events, plan.total_delay() - self.fixed_delay)
+        return cost
+
+    def __missing__(self, text: str) -> Tuple[int, float]:
+        text_cost = self._text_cost
+        parts = text.split(' ') if self._split else (text,)
+        events = self.fixed_events
+        seconds = self.fixed_delay
+        for part in parts:
+            part_events, part_seconds = text_cost(part)
+            events += part_events
+            seconds += part_seconds
+        if len(parts) > 1:
+            space_events, space_seconds = text_cost(' ')
+            events += (len(parts) - 1) * space_events
+            seconds += (len(parts) - 1) * space_seconds
+        cost = (events, seconds)
+        if len(self) < LINE_MEMO_SIZE:
+            self[text] = cost
+        return cost
+
+    def verify(self, lines: List[str]) -> bool:
+        """Whether the costs of `lines` add up to the plan compile_plan builds for all of them"""
+        plan = self.compile(lines)
+        events = sum(self[line][0] for line in lines)
+        seconds = sum(self[line][1] for line in lines)
+        return events == len(plan) and math.isclose(seconds, plan.total_delay(), rel_tol=1e-9, abs_tol=1e-9)
+
+
+class StylePlan:
+    """Running totals for one style over a range.
+
+    Without rate limits or a rate-based automatic mode, numbers only add to
+    the totals. Otherwise each number is also played on a
+    simulated clock: rate and poisson gaps depend on how long the number
+    before took, and the token buckets on when each line is submitted.
+    """
+
+    def __init__(self, style: str, coster: LineCoster, automatic: Optional[Dict[str, Any]],
+                 rate_limits: Iterable[Dict[str, Any]] = ()):
+        self.style = style
+        self.coster = coster
+        self.automatic = automatic
+        self.buckets = []
+        for spec in rate_limits:
+            bucket = TokenBucket(spec['lines'], spec['per'], spec.get('burst'))
+            bucket.updated = 0.0
+            self.buckets.append(bucket)
+        self.numbers = 0
+        self.lines = 0
+        self.chars = 0
+        self.events = 0
+        self.typing = 0.0
+        self.held = 0.0
+        self.gaps = 0.0
+        self.late = 0
+        self.clock = 0.0
+        self._gap = self._mean_gap()
+        # The scheduler waits one gap before the first number too
+        self._next_wait = self._gap
+        self.timed = bool(self.buckets) or (automatic is not None and automatic['mode'] != 'uniform')
+
+    def _mean_gap(self) -> float:
+        auto = self.automatic
+        if auto is None:
+            return 0.0
+        if auto['mode'] == 'uniform':
+            return (auto['min_delay'] + auto['max_delay']) / 2
+        return 60.0 / auto['rate']
+
+    def add(self, lines: List[str]):
+        coster = self.coster
+        costs = list(map(coster.__getitem__, lines))
+        seconds = 0.0
+        if costs:
+            events, durations = zip(*costs)
+            self.events += sum(events)
+            seconds = sum(durations)
+            self.typing += seconds
+        self.numbers += 1
+        self.lines += len(lines)
+        self.chars += sum(map(len, lines))
+        if not self.timed:
+            return
+
+        self.gaps += self._next_wait
+        self.clock += self._next_wait
+        started = self.clock
+        if self.buckets:
+            after_submit = coster.after_submit
+            for _, line_seconds in costs:
+                self.clock += line_seconds - after_submit
+                self._submit()
+                self.clock += after_submit
+        else:
+            self.clock += seconds
+        if self.automatic is not None:
+            self._next_wait = self._rate_wait(self.clock - started)
+
+    def _submit(self):
+        """Advance the clock to when every bucket has a token, and take them"""
+        wait = 0.0
+        for bucket in self.buckets:
+            bucket.refill(self.clock)
+            wait = max(wait, bucket.wait_time())
+        if wait > 0:
+            self.held += wait
+            self.clock += wait
+            for bucket in self.buckets:
+                bucket.refill(self.clock)
+        for bucket in self.buckets:
+            bucket.tokens -= 1
+
+    def _rate_wait(self, took: float) -> float:
+        mode = self.automatic['mode']
+        if mode == 'uniform':
+            return self._gap
+        # The next start is due a gap after this one; a number that runs over starts the next at once
+        if mode == 'rate':
+            if took > self._gap:
+                self.late += 1
+            return max(0.0, self._gap - took)
+        # E[max(X, took)] - took for exponential X with mean gap
+        return self._gap * math.exp(-took / self._gap)
+
+    def result(self) -> Dict[str, Any]:
+        result = {
+            'style': self.style,
+            'numbers': self.numbers,
+            'lines': self.lines,
+            'chars': self.chars,
+            'events': self.events,
+            'typing_seconds': self.typing
+        }
+        if self.timed:
+            wall = self.clock
+        else:
+            # Uniform gaps: one before each number, the first included
+            self.gaps = self._gap * self.numbers if self.automatic is not None else 0.0
+            wall = result['typing_seconds'] + self.gaps
+        result.update({
+            'gap_seconds': self.gaps,
+            'held_seconds': self.held,
+            'late': self.late,
+            'wall_seconds': wall
+        })
+        return result
+
+
+def plan_range(config: Any, language_manager: Any, start: int, stop: int,
+               styles: Optional[Iterable[str]] = None, keys: Any = None,
+               progress: Optional[Callable[[int], None]] = None) -> Dict[str, Any]:
+    """Dry-run indices start..stop-1 through formatting and plan costing, once per style.
+
+    Nothing is compiled into full plans or emitted. Returns per-style totals
+    and simulated wall time: plan delays, Enter holds from rate_limit, and
+    the mean automatic-mode gaps when automatic mode is enabled.
+    """
+    style_manager = StyleManager()
+    names = list(styles) if styles else style_manager.get_available_styles()
+    coster = LineCoster(keys if keys is not None else named_keys(), config.get_typing_config(),
+                        config.is_auto_jumping())
+    automatic = config.get_automatic_settings() if config.is_automatic_mode() else None
+    rate_limits = config.get_rate_limits()
+    plans = [StylePlan(name, coster, automatic, rate_limits) for name in names]
+    formatters = [(style_manager.get_style(plan.style, config.get_style_config(plan.style)).format, plan.add)
+                  for plan in plans]
+
+    get_number = language_manager.get_current_number
+    samples = set(range(start, stop, max(1, (stop - start) // VERIFY_SAMPLES)))
+    samples.add(stop - 1)
+    missing = 0
+    verified = None
+    for index in range(start, stop):
+        number = get_number(index)
+        if not number:
+            missing += 1
+            continue
+        if index in samples and verified is not False:
+            verified = all(coster.verify(format_number(number)) for format_number, _ in formatters)
+        for format_number, add in formatters:
+            add(format_number(number))
+        if progress is not None and not (index - start + 1) % 100000:
+            progress(index - start + 1)
+
+    return {
+        'start': start,
+        'stop': stop,
+        'missing': missing,
+        'automatic': automatic,
+        'verified': bool(verified),
+        'untypeable': coster.untypeable,
+        'styles': [plan.result() for plan in plans]
+    }
+
+
+def format_duration(seconds: float) -> str:
+    if seconds < 60:
+        return f"{seconds:.1f}s"
+    minutes, secs = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    days, hours = divmod(hours, 24)
+    if days:
+        return f"{days}d {hours:02d}h {minutes:02d}m"
+    if hours:
+        return f"{hours}h {minutes:02d}m {secs:02d}s"
+    return f"{minutes}m {secs:02d}s"
+
+
+def report(plan: Dict[str, Any], current_style: Optional[str] = None) -> str:
+    numbers = plan['stop'] - plan['start']
+    lines = [f"=== Session Plan: {plan['start'] + 1}-{plan['stop']} ({numbers} numbers) ===",
+             f"  {'style':<7} {'lines':>11} {'chars':>12} {'events':>13} {'typing':>13} "
+             f"{'gaps':>13} {'held':>11} {'wall':>13}"]
+    for style in plan['styles']:
+        marker = '*' if style['style'] == current_style else ' '
+        lines.append(f"  {style['style'] + marker:<7} {style['lines']:>11} {style['chars']:>12} "
+                     f"{style['events']:>13} {format_duration(style['typing_seconds']):>13} "
+                     f"{format_duration(style['gap_seconds']):>13} {format_duration(style['held_seconds']):>11} "
+                     f"{format_duration(style['wall_seconds']):>13}")
+    auto = plan['automatic']
+    if auto is None:
+        lines.append("  Automatic mode off: wall time is typing only, plus the time between your key presses")
+    elif auto['mode'] == 'uniform':
+        lines.append(f"  Automatic mode: uniform gaps of {auto['min_delay']}-{auto['max_delay']}s (mean used)")
+    else:
+        late = ', '.join(f"{style['style']} {style['late']}" for style in plan['styles'] if style['late'])
+        lines.append(f"  Automatic mode: {auto['mode']} at {auto['rate']}/min"
+                     f"{f' (numbers longer than a gap: {late})' if late else ''}")
+    if plan['missing']:
+        lines.append(f"  {plan['missing']} indices have no number and were skipped")
+    if plan['untypeable']:
+        lines.append(f"  Characters with no key, skipped when typing: {plan['untypeable']!r}")
+    if not plan['verified']:
+        lines.append("  Warning: costs did not match a compiled plan; figures may be off")
+    return '\n'.join(lines)
@@ -0,0 +1,51 @@
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+
+def process_age() -> Optional[float]:
+    """Seconds since this process was created, from /proc (10ms resolution)"""
+    try:
+        with open('/proc/self/stat', 'r') as f:
+            stat = f.read()
+        # Field 22 (starttime) counts clock ticks since boot; skip past "(comm)"
+        # since the command name may contain spaces
+        start_ticks = int(stat[stat.rindex(')') + 2:].split()[19])
+        started = start_ticks / os.sysconf('SC_CLK_TCK')
+        return time.clock_gettime(time.CLOCK_BOOTTIME) - started
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+class StartupProbe:
+    """Records named milestones relative to process start"""
+
+    def __init__(self, fallback_origin: Optional[float] = None):
+        now = time.perf_counter()
+        age = process_age()
+        if age is not None:
+            self.origin = now - age
+            self.origin_source = 'process start'
+        else:
+            self.origin = fallback_origin if fallback_origin is not None else now
+            self.origin_source = 'interpreter start'
+        self.marks: List[Tuple[str, float]] = []
+        self._seen: Dict[str, float] = {}
+
+    def mark(self, name: str):
+        if name not in self._seen:
+            now = time.perf_counter()
+            self._seen[name] = now
+            self.marks.append((name, now))
+
+    def elapsed(self, name: str) -> Optional[float]:
+        mark = self._seen.get(name)
+        return None if mark is None else mark - self.origin
+
+    def report(self) -> str:
+        lines = [f"=== Startup Benchmark (from {self.origin_source}) ==="]
+        previous = self.origin
+        for name, mark in self.marks:
+            lines.append(f"  {name:<18} {(mark - self.origin) * 1e3:9.2f} ms  (+{(mark - previous) * 1e3:.2f} ms)")
+            previous = mark
+        return '\n'.join(lines)
@@ -0,0 +1,161 @@
+import json
+import threading
+import time
+from array import array
+from typing import Any, Dict, Optional
+
+from .pacing import PacingReport
+
+# Pipeline stages with a latency histogram
+STAGES = ('on_press', 'format', 'first_event', 'line', 'number')
+STAGE_LABELS = {
+    'on_press': 'listener callback',
+    'format': 'formatting',
+    'first_event': 'press -> 1st event',
+    'line': 'line typed',
+    'number': 'press -> complete'
+}
+
+# Log-linear buckets: 16 per power of two (~6% resolution), exact below 32ns
+_SUB_BUCKETS = 16
+_BUCKETS = 64 * _SUB_BUCKETS
+
+
+def _bucket(value_ns: int) -> int:
+    if value_ns < 32:
+        return max(0, value_ns)
+    shift = value_ns.bit_length() - 5
+    return shift * _SUB_BUCKETS + (value_ns >> shift)
+
+
+def _bucket_value(index: int) -> float:
+    if index < 32:
+        return float(index)
+    shift = index // _SUB_BUCKETS - 1
+    top = _SUB_BUCKETS + index % _SUB_BUCKETS
+    # Midpoint of the bucket's range
+    return ((top << shift) + ((top + 1) << shift)) / 2
+
+
+class Histogram:
+    __slots__ = ('counts', 'count', 'total', 'max')
+
+    def __init__(self):
+        self.counts = array('Q', bytes(8 * _BUCKETS))
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def record(self, value_ns: int):
+        self.counts[_bucket(value_ns)] += 1
+        self.count += 1
+        self.total += value_ns
+        if value_ns > self.max:
+            self.max = value_ns
+
+    def percentile(self, fraction: float) -> float:
+        """Approximate value (ns) below which `fraction` of the samples fall"""
+        if not self.count:
+            return 0.0
+        rank = max(1, int(fraction * self.count + 0.5))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(_bucket_value(index), float(self.max))
+        return float(self.max)
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            'count': self.count,
+            'mean_ms': self.total / self.count / 1e6 if self.count else 0.0,
+            'p50_ms': self.percentile(0.50) / 1e6,
+            'p95_ms': self.percentile(0.95) / 1e6,
+            'p99_ms': self.percentile(0.99) / 1e6,
+            'max_ms': self.max / 1e6
+        }
+
+
+class StatsRecorder:
+    """Per-stage latency histograms and throughput counters for a session.
+
+    Recording is a bucket increment under a lock; percentiles are only
+    computed when a report is asked for.
+    """
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.histograms: Dict[str, Histogram] = {stage: Histogram() for stage in STAGES}
+        self._lock = threading.Lock()
+        self.numbers = 0
+        self.cancelled = 0
+        self.lines = 0
+        self.chars = 0
+        self.events = 0
+        self.typing_time = 0.0
+        self.scheduled_time = 0.0
+
+    def record(self, stage: str, value_ns: int):
+        with self._lock:
+            self.histograms[stage].record(value_ns)
+
+    def record_number(self, started_ns: int, first_event_ns: Optional[int], report: Optional[PacingReport]):
+        done_ns = time.perf_counter_ns()
+        with self._lock:
+            if first_event_ns is not None:
+                self.histograms['first_event'].record(first_event_ns - started_ns)
+            if report is None:
+                return
+            for line in report.lines:
+                self.histograms['line'].record(int(line.actual * 1e9))
+                self.lines += 1
+                self.chars += len(line.text)
+                self.events += line.events
+            self.typing_time += report.actual
+            self.scheduled_time += report.target
+            if report.cancelled:
+                self.cancelled += 1
+            else:
+                self.numbers += 1
+                self.histograms['number'].record(done_ns - started_ns)
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            elapsed = time.monotonic() - self.started
+            return {
+                'elapsed_s': elapsed,
+                'numbers': self.numbers,
+                'cancelled': self.cancelled,
+                'lines': self.lines,
+                'chars': self.chars,
+                'events': self.events,
+                'typing_s': self.typing_time,
+                'idle_s': max(0.0, elapsed - self.typing_time),
+                'chars_per_s_typing': self.chars / self.typing_time if self.typing_time else 0.0,
+                'chars_per_s_theoretical': self.chars / self.scheduled_time if self.scheduled_time else 0.0,
+                'chars_per_s_session': self.chars / elapsed if elapsed else 0.0,
+                'stages': {stage: histogram.summary() for stage, histogram in self.histograms.items()}
+            }
+
+    def report(self) -> str:
+        data = self.to_dict()
+        lines = [f"=== Session Stats ({data['elapsed_s']:.1f}s) ===",
+                 f"  {'stage':<20} {'count':>7} {'p50':>10} {'p95':>10} {'p99':>10} {'max':>10}"]
+        for stage, summary in data['stages'].items():
+            if not summary['count']:
+                continue
+            lines.append(f"  {STAGE_LABELS[stage]:<20} {summary['count']:>7} "
+                         f"{summary['p50_ms']:>8.3f}ms {summary['p95_ms']:>8.3f}ms "
+                         f"{summary['p99_ms']:>8.3f}ms {summary['max_ms']:>8.3f}ms")
+        lines.append(f"  Numbers: {data['numbers']} ({data['cancelled']} cancelled), lines: {data['lines']}, "
+                     f"chars: {data['chars']}, events: {data['events']}")
+        lines.append(f"  Rate: {data['chars_per_s_typing']:.1f} chars/s while typing "
+                     f"(theoretical {data['chars_per_s_theoretical']:.1f} from delays), "
+                     f"{data['chars_per_s_session']:.1f} chars/s overall")
+        idle_share = data['idle_s'] / data['elapsed_s'] * 100 if data['elapsed_s'] else 0.0
+        lines.append(f"  Typing: {data['typing_s']:.1f}s, idle: {data['idle_s']:.1f}s ({idle_share:.0f}%)")
+        return '\n'.join(lines)
+
+    def dump_json(self, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
@@ -0,0 +1,118 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+# Active tracer, or None when tracing is off. Instrumented code reads this
+# once and skips all trace work when it is None.
+tracer: Optional['Tracer'] = None
+
+# (name, category, start_ns, end_ns or None for an instant, thread id, args);
+# timestamps come from time.monotonic_ns()
+TraceEvent = Tuple[str, str, int, Optional[int], int, Optional[Dict[str, Any]]]
+
+
+class Tracer:
+    """Collects spans into a ring buffer and streams them as Chrome trace-event JSON.
+
+    Recording appends a tuple to a bounded deque; a background thread turns
+    the tuples into JSON and writes them out, so the traced threads never
+    serialize or touch the file. If the writer falls behind, the oldest
+    events are dropped rather than blocking. The output loads in
+    chrome://tracing and Perfetto, one track per thread.
+    """
+
+    def __init__(self, path: str, capacity: int = 65536, flush_interval: float = 0.25):
+        self.path = path
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self._events: Deque[TraceEvent] = deque(maxlen=capacity)
+        self._threads: Dict[int, str] = {}
+        self._pid = os.getpid()
+        self._origin = time.monotonic_ns()
+        self._stop = threading.Event()
+        self._file = open(path, 'w', encoding='utf-8')
+        self._file.write('[\n')
+        self._first = True
+        self.recorded = 0
+        self.written = 0
+        self._writer = threading.Thread(target=self._run, name='trace-writer', daemon=True)
+        self._writer.start()
+
+    def complete(self, name: str, category: str, start_ns: int, end_ns: Optional[int],
+                 args: Optional[Dict[str, Any]] = None):
+        tid = threading.get_ident()
+        if tid not in self._threads:
+            self._threads[tid] = threading.current_thread().name
+        self._events.append((name, category, start_ns, end_ns, tid, args))
+        self.recorded += 1
+
+    def instant(self, name: str, category: str, args: Optional[Dict[str, Any]] = None):
+        self.complete(name, category, time.monotonic_ns(), None, args)
+
+    @property
+    def dropped(self) -> int:
+        return self.recorded - self.written - len(self._events)
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            self._flush()
+
+    def _flush(self):
+        events = self._events
+        chunks = []
+        while events:
+            try:
+                name, category, start_ns, end_ns, tid, args = events.popleft()
+            except IndexError:
+                break
+            event = {
+                'name': name, 'cat': category, 'pid': self._pid, 'tid': tid,
+                'ts': (start_ns - self._origin) / 1e3
+            }
+            if end_ns is None:
+                event['ph'] = 'i'
+                event['s'] = 't'
+            else:
+                event['ph'] = 'X'
+                event['dur'] = (end_ns - start_ns) / 1e3
+            if args:
+                event['args'] = args
+            chunks.append(json.dumps(event, ensure_ascii=False))
+        if chunks:
+            self._write(chunks)
+            self.written += len(chunks)
+
+    def _write(self, chunks):
+        separator = '' if self._first else ',\n'
+        self._first = False
+        self._file.write(separator + ',\n'.join(chunks))
+        self._file.flush()
+
+    def close(self):
+        self._stop.set()
+        self._writer.join()
+        self._flush()
+        metadata = [json.dumps({'name': 'thread_name', 'ph': 'M', 'pid': self._pid, 'tid': tid,
+                                'args': {'name': name}})
+                    for tid, name in list(self._threads.items())]
+        if metadata:
+            self._write(metadata)
+        self._file.write('\n]\n')
+        self._file.close()
+
+
+def start_tracing(path: str, capacity: int = 65536) -> Tracer:
+    global tracer
+    tracer = Tracer(path, capacity)
+    return tracer
+
+
+def stop_tracing() -> Optional[Tracer]:
+    global tracer
+    active, tracer = tracer, None
+    if active is not None:
+        active.close()
+    return active
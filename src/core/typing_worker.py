@@ -0,0 +1,141 @@
+import threading
+from collections import deque
+from typing import Callable, Deque, List, Optional
+
+
+class TypingJob:
+    __slots__ = ('count', 'cancel', 'done', 'started', '_callbacks', '_lock')
+
+    def __init__(self, count: int = 1):
+        self.count = count
+        self.cancel = threading.Event()
+        self.done = threading.Event()
+        self.started = False
+        self._callbacks: List[Callable[[], None]] = []
+        # Keeps a callback added while the job finishes from being lost
+        self._lock = threading.Lock()
+
+    def add_done_callback(self, callback: Callable[[], None]):
+        """Call `callback` (on the worker thread) once the job is typed or dropped"""
+        with self._lock:
+            if not self.done.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def finish(self):
+        with self._lock:
+            self.done.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback()
+
+
+class TypingWorker:
+    """Producer/consumer queue that moves typing off the key listener thread.
+
+    submit() only appends to a deque and returns. Repeated type requests
+    that arrive while a job is still waiting are coalesced into that job,
+    and at most `max_pending` numbers may be outstanding (queued or being
+    typed); further requests are rejected so a held key cannot build an
+    unbounded backlog.
+    """
+
+    def __init__(self, type_fn: Callable[[threading.Event], None], max_pending: int = 5):
+        self._type_fn = type_fn
+        self.max_pending = max(1, max_pending)
+        self._jobs: Deque[TypingJob] = deque()
+        self._current: Optional[TypingJob] = None
+        self._current_remaining = 0
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self.coalesced = 0
+        self.rejected = 0
+
+    def start(self):
+        with self._condition:
+            if self._running:
+                return
+            previous = self._thread
+        # A worker stopped from its own thread may still be finishing its job
+        self._join(previous)
+        with self._condition:
+            if self._running:
+                return
+            self._running = True
+            self._thread = threading.Thread(target=self._run, name='typing-worker', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Cancel everything and wait for the worker to let go of the job in progress"""
+        self.cancel()
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+            thread = self._thread
+        self._join(thread)
+
+    @staticmethod
+    def _join(thread: Optional[threading.Thread]):
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def pending(self) -> int:
+        return self._current_remaining + sum(job.count for job in self._jobs)
+
+    def submit(self, count: int = 1) -> Optional[TypingJob]:
+        with self._condition:
+            if not self._running:
+                return None
+            if self.pending() + count > self.max_pending:
+                self.rejected += 1
+                return None
+            if self._jobs:
+                # A job is still waiting: fold this request into it
+                job = self._jobs[-1]
+                job.count += count
+                self.coalesced += 1
+                return job
+            job = TypingJob(count)
+            self._jobs.append(job)
+            self._condition.notify()
+            return job
+
+    def cancel(self):
+        """Abort the job being typed and drop everything queued"""
+        with self._condition:
+            dropped = list(self._jobs)
+            self._jobs.clear()
+            if self._current is not None:
+                self._current.cancel.set()
+        for job in dropped:
+            job.cancel.set()
+            job.finish()
+
+    def is_busy(self) -> bool:
+        return self._current is not None or bool(self._jobs)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._running and not self._jobs:
+                    self._condition.wait()
+                if not self._running:
+                    return
+                job = self._jobs.popleft()
+                job.started = True
+                self._current = job
+                self._current_remaining = job.count
+
+            try:
+                while self._current_remaining > 0 and not job.cancel.is_set():
+                    self._type_fn(job.cancel)
+                    self._current_remaining -= 1
+            except Exception as e:
+                print(f"Error while typing: {e}")
+            finally:
+                with self._condition:
+                    self._current = None
+                    self._current_remaining = 0
+                job.finish()
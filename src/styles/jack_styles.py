@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from array import array
+from typing import List, Dict, Any, Callable, Hashable, Iterable, Optional, Tuple
 
 
 class JackStyle(ABC):
@@ -85,6 +86,50 @@ class GJsStyle(JackStyle):
         return [formatted + ending]
 
 
+class FormattedTable:
+    """Pre-rendered style output for a range of numbers.
+    
+    All lines live in one joined buffer; entry i is
+    buffer[offsets[i]:offsets[i + 1]] with its lines separated by newlines.
+    Its line count is kept alongside, since no lines and one empty line
+    join to the same text, so the table costs one string plus 8 bytes per
+    entry.
+    """
+    __slots__ = ('key', 'buffer', 'offsets', 'line_counts')
+    
+    def __init__(self, key: Hashable, buffer: str, offsets: array, line_counts: array):
+        self.key = key
+        self.buffer = buffer
+        self.offsets = offsets
+        self.line_counts = line_counts
+    
+    @classmethod
+    def build(cls, key: Hashable, numbers: Iterable[str],
+              format_fn: Callable[[str], List[str]]) -> 'FormattedTable':
+        parts = []
+        offsets = array('I', [0])
+        line_counts = array('I')
+        position = 0
+        for number in numbers:
+            lines = format_fn(number)
+            entry = '\n'.join(lines)
+            parts.append(entry)
+            position += len(entry)
+            offsets.append(position)
+            line_counts.append(len(lines))
+        return cls(key, ''.join(parts), offsets, line_counts)
+    
+    def __len__(self) -> int:
+        return len(self.line_counts)
+    
+    def get(self, index: int) -> Optional[List[str]]:
+        if not 0 <= index < len(self.line_counts):
+            return None
+        if not self.line_counts[index]:
+            return []
+        return self.buffer[self.offsets[index]:self.offsets[index + 1]].split('\n')
+
+
 class StyleManager:
     def __init__(self):
         self.styles = {
@@ -92,12 +137,31 @@ class StyleManager:
             'HJs': HJsStyle,
             'GJs': GJsStyle
         }
+        # Styles are stateless, so one instance per (style, config) is reused
+        self._instances: Dict[Tuple[str, Hashable], JackStyle] = {}
     
     def get_style(self, style_name: str, config: Dict[str, Any]) -> JackStyle:
         if style_name not in self.styles:
             raise ValueError(f"Unknown style: {style_name}")
         
-        return self.styles[style_name](config)
+        key = (style_name, self._config_key(config))
+        style = self._instances.get(key)
+        if style is None:
+            style = self._instances[key] = self.styles[style_name](dict(config))
+        return style
+    
+    @staticmethod
+    def _config_key(config: Dict[str, Any]) -> Hashable:
+        try:
+            key = tuple(sorted(config.items()))
+            hash(key)
+            return key
+        except TypeError:
+            # Nested or unhashable values: fall back to a stable text form
+            return repr(sorted(config.items(), key=lambda item: item[0]))
+    
+    def clear_cache(self):
+        self._instances.clear()
     
     def get_available_styles(self) -> List[str]:
         return list(self.styles.keys())
@@ -106,4 +170,5 @@ class StyleManager:
         if not issubclass(style_class, JackStyle):
             raise ValueError("Style class must inherit from JackStyle")
         
-        self.styles[name] = style_class
\ No newline at end of file
+        self.styles[name] = style_class
+        self.clear_cache()
\ No newline at end of file
@@ -0,0 +1,75 @@
+"""Shift-run coalescing and SYN_REPORT framing must not change what gets typed."""
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.recording_device import fake_keys
+from src.core.keyboard import compile_keymap
+from src.core.keystroke_plan import compile_plan
+
+LINES = [
+    "ONE HUNDRED TWENTY-TWO.",
+    "One Hundred Twenty-Two.",
+    "O!", "N!", "E!", "ONE!",
+    "NOVECENTOS E NOVENTA E NOVE.",
+    "três mil e quarenta!",
+    "aA Bb CC dd?",
+]
+TYPING_CONFIG = {'prefix_key': '/', 'prefix_delay': 0.0, 'char_delay': 0.0, 'enter_delay': 0.1}
+
+
+@pytest.fixture(scope='module')
+def keys():
+    return fake_keys()
+
+
+@pytest.fixture(scope='module')
+def keymap(keys):
+    return compile_keymap(keys)
+
+
+def typed_output(plan, shift_key):
+    """Each non-shift key press with the shift state at that moment"""
+    shift_down = False
+    output = []
+    for index in range(len(plan)):
+        key = plan.keys[plan.codes[index]]
+        if key == shift_key:
+            shift_down = bool(plan.values[index])
+        elif plan.values[index]:
+            output.append((key, shift_down))
+    return output, shift_down
+
+
+def frames(plan):
+    frame = []
+    for index in range(len(plan)):
+        frame.append((plan.codes[index], plan.values[index]))
+        if plan.syncs[index]:
+            yield frame
+            frame = []
+    assert not frame, "events after the last SYN_REPORT"
+
+
+@pytest.mark.parametrize('char_delay', [0.0, 0.01])
+def test_coalescing_types_the_same_keys(keys, keymap, char_delay):
+    config = dict(TYPING_CONFIG, char_delay=char_delay)
+    per_char = compile_plan(LINES, keymap, keys, config, coalesce_modifiers=False)
+    coalesced = compile_plan(LINES, keymap, keys, config)
+
+    assert typed_output(coalesced, keys.KEY_LEFTSHIFT) == typed_output(per_char, keys.KEY_LEFTSHIFT)
+    assert len(coalesced) < len(per_char)
+
+
+@pytest.mark.parametrize('coalesce', [False, True])
+def test_no_frame_holds_a_press_and_its_release(keys, keymap, coalesce):
+    plan = compile_plan(LINES, keymap, keys, TYPING_CONFIG, coalesce_modifiers=coalesce)
+    for frame in frames(plan):
+        pressed = set()
+        for code, value in frame:
+            assert value or code not in pressed, f"press and release of {plan.keys[code]} in one frame"
+            if value:
+                pressed.add(code)